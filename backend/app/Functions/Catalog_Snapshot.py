@@ -0,0 +1,237 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import uuid
+from functools import cached_property
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Models.Class_Model import Class_Model
+from Models.Class_Detail_Model import Class_Detail
+from Functions.Prereq_Graph import build_prereq_graph
+
+# The catalog only changes once a semester, so the whole thing is kept in memory
+# and only reloaded when the version stamp in Mongo changes.
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "true").lower() not in ("0", "false", "no")
+CATALOG_RELOAD_INTERVAL = float(os.getenv("CATALOG_RELOAD_INTERVAL", "30"))
+CATALOG_VERSION_COLLECTION = "Catalog_Version"
+CATALOG_VERSION_ID = "catalog"
+
+_snapshots = {}  # Mapping: (uri, db_name) -> CatalogSnapshot
+_snapshots_lock = threading.Lock()
+
+
+class CatalogSnapshot:
+    def __init__(self, version, class_docs=None, class_detail_docs=None, major_req_docs=None, rmp_docs=None):
+        """
+        In-memory copy of the catalog collections, indexed for O(1) lookups.
+
+        :param version: Version stamp the snapshot was loaded at (None if the catalog is unstamped).
+        :param class_docs: Documents of the "Class" collection.
+        :param class_detail_docs: Documents of the "Class_Detail" collection (one per section).
+        :param major_req_docs: Documents of the "Major_Req" collection.
+        :param rmp_docs: Documents of the "rmp_ratings" collection.
+        """
+        self.version = version
+        self.checked_at = time.monotonic()
+        # Installed with install_catalog_snapshot: served as is, never re-checked against Mongo
+        self.pinned = False
+
+        # Every Class document, in catalog order
+        self.class_docs = list(class_docs or [])
+        # Mapping: course_code -> Class document (first match wins, like find_one)
+        self.classes = {}
+        # Mapping: class_id -> Class document
+        self.classes_by_class_id = {}
+        for doc in self.class_docs:
+            if doc.get("course_code") is not None:
+                self.classes.setdefault(doc["course_code"], doc)
+            if doc.get("class_id") is not None:
+                self.classes_by_class_id.setdefault(doc["class_id"], doc)
+
+        # Mapping: course_code -> list of Class_Detail documents (all sections)
+        self.class_details = {}
+        for doc in class_detail_docs or []:
+            self.class_details.setdefault(doc.get("course_code"), []).append(doc)
+        # Mapping: course_code -> tuple of Class_Detail objects, built on first use
+        self._sections = {}
+
+        # Mapping: major_name -> Major_Req document
+        self.major_reqs = {}
+        for doc in major_req_docs or []:
+            self.major_reqs.setdefault(doc.get("major_name"), doc)
+
+        # Mapping: professor name -> rmp_ratings document
+        self.rmp_ratings = {}
+        for doc in rmp_docs or []:
+            self.rmp_ratings.setdefault(doc.get("name"), doc)
+
+    @staticmethod
+    def load(db, version=None):
+        """
+        Reads every catalog collection from the given database into a new snapshot.
+        """
+        return CatalogSnapshot(
+            version=version,
+            class_docs=list(db["Class"].find()),
+            class_detail_docs=list(db["Class_Detail"].find()),
+            major_req_docs=list(db["Major_Req"].find()),
+            rmp_docs=list(db["rmp_ratings"].find())
+        )
+
+    @cached_property
+    def professor_ratings(self):
+        """
+        ProfessorRatingIndex of the rmp_ratings documents, built on first use.
+        """
+        from Functions.Professor_Ratings import ProfessorRatingIndex
+        return ProfessorRatingIndex(self.rmp_ratings.values())
+
+    @cached_property
+    def ger_buckets(self):
+        """
+        GER area -> candidate classes (see GER_Buckets.build_ger_buckets), built on first use.
+        """
+        from Functions.GER_Buckets import build_ger_buckets
+        return build_ger_buckets(self.class_docs)
+
+    @cached_property
+    def course_number_index(self):
+        """
+        CourseNumberIndex of the Class documents (for wildcard electives), built on first use.
+        """
+        from Functions.Course_Number_Index import CourseNumberIndex
+        return CourseNumberIndex(self.class_docs)
+
+    @cached_property
+    def prereq_graph(self):
+        """
+        Prerequisite graph of every class in the snapshot, built on first use.
+        """
+        return build_prereq_graph(self.classes_by_class_id.values())
+
+    def get_class(self, course_code):
+        """
+        Returns a new Class_Model for the given course code, or None if it is not in the catalog.
+        """
+        doc = self.classes.get(course_code)
+        return Class_Model.from_dict(doc) if doc else None
+
+    def get_class_detail(self, course_code):
+        """
+        Returns the first section of the given course as a Class_Detail, or None.
+        """
+        docs = self.class_details.get(course_code)
+        return Class_Detail.from_dict(docs[0]) if docs else None
+
+    def get_sections(self, course_code):
+        """
+        Returns every section of the given course as Class_Detail objects (an empty tuple if
+        it has none). The objects are built once per snapshot and shared between requests,
+        so callers must not modify them.
+        """
+        sections = self._sections.get(course_code)
+        if sections is None:
+            sections = tuple(Class_Detail.from_dict(doc) for doc in self.class_details.get(course_code, []))
+            self._sections[course_code] = sections
+        return sections
+
+    def get_major_req_doc(self, major_name):
+        """
+        Returns a shallow copy of the Major_Req document (callers rewrite its fields), or None.
+        """
+        doc = self.major_reqs.get(major_name)
+        return dict(doc) if doc else None
+
+    def __repr__(self):
+        return (
+            f"CatalogSnapshot(version={self.version}, classes={len(self.classes)}, "
+            f"class_details={len(self.class_details)}, major_reqs={len(self.major_reqs)}, "
+            f"rmp_ratings={len(self.rmp_ratings)})"
+        )
+
+
+def get_catalog_version(db):
+    """
+    Reads the catalog version stamp, or None if the catalog has never been stamped.
+    """
+    doc = db[CATALOG_VERSION_COLLECTION].find_one({"_id": CATALOG_VERSION_ID})
+    return doc.get("version") if doc else None
+
+
+def bump_catalog_version(uri=None, db_name=None):
+    """
+    Stamps the catalog with a new version so every API process reloads its snapshot.
+    Call this after re-importing any of the catalog collections.
+
+    :return: The new version stamp.
+    """
+    version = uuid.uuid4().hex
+    db = get_mongo_db(uri, db_name)
+    db[CATALOG_VERSION_COLLECTION].update_one(
+        {"_id": CATALOG_VERSION_ID}, {"$set": {"version": version}}, upsert=True
+    )
+    return version
+
+
+def get_catalog_snapshot(uri=None, db_name=None):
+    """
+    Returns the current catalog snapshot for the database, loading it on first use.
+    The version stamp is re-checked at most every CATALOG_RELOAD_INTERVAL seconds and
+    a new snapshot is swapped in when it changed. Requests that already hold the old
+    snapshot keep using it until they finish.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    :return: A CatalogSnapshot, or None if snapshots are disabled (and none was installed).
+    """
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and snapshot.pinned:
+        return snapshot
+    if not CATALOG_SNAPSHOT_ENABLED:
+        return None
+    if snapshot is not None and time.monotonic() - snapshot.checked_at < CATALOG_RELOAD_INTERVAL:
+        return snapshot
+
+    # Only one thread checks/reloads; everybody else keeps serving the old snapshot.
+    if not _snapshots_lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        current = _snapshots.get(key)
+        if current is not None and current is not snapshot:
+            return current
+        db = get_mongo_db(*key)
+        version = get_catalog_version(db)
+        if current is not None and current.version == version:
+            current.checked_at = time.monotonic()
+            return current
+        new_snapshot = CatalogSnapshot.load(db, version)
+        _snapshots[key] = new_snapshot
+        return new_snapshot
+    finally:
+        _snapshots_lock.release()
+
+
+def reload_catalog_snapshot(uri=None, db_name=None):
+    """
+    Drops the cached snapshot so the next lookup reloads it from Mongo.
+    """
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    with _snapshots_lock:
+        _snapshots.pop(key, None)
+
+
+def install_catalog_snapshot(snapshot, uri=None, db_name=None):
+    """
+    Serves the given snapshot for the database from now on, without ever reading Mongo
+    (even if snapshots are disabled), until reload_catalog_snapshot drops it. Lets the
+    schedulers run offline against a catalog built in memory, e.g. by the benchmarks.
+
+    :return: The installed snapshot.
+    """
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    snapshot.pinned = True
+    with _snapshots_lock:
+        _snapshots[key] = snapshot
+    return snapshot
@@ -0,0 +1,82 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import threading
+from bisect import bisect_left
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Functions.Catalog_Snapshot import get_catalog_snapshot, get_catalog_version
+
+# Class IDs of the form SUBJECT + NUMBER (e.g., "CS170", "Math111")
+CLASS_ID_PATTERN = re.compile(r'^([A-Za-z]+)(\d+)$')
+
+_indexes = {}  # Mapping: (uri, db_name) -> (catalog version, CourseNumberIndex), used without snapshots
+_indexes_lock = threading.Lock()
+
+
+class CourseNumberIndex:
+    def __init__(self, class_docs):
+        """
+        Course numbers of every subject as sorted arrays, so a wildcard elective such as
+        "CS200*" (every CS course numbered 200 or above) is a bisect and a slice.
+
+        :param class_docs: Documents of the "Class" collection, in catalog order.
+        """
+        entries = {}  # Mapping: SUBJECT -> list of (number, catalog position, class_id)
+        for position, doc in enumerate(class_docs):
+            class_id = doc.get("class_id")
+            if not isinstance(class_id, str):
+                continue
+            match = CLASS_ID_PATTERN.match(class_id)
+            if match:
+                entries.setdefault(match.group(1).upper(), []).append((int(match.group(2)), position, class_id))
+
+        # Mapping: SUBJECT -> (sorted numbers, matching (catalog position, class_id) entries)
+        self.subjects = {}
+        for subject, subject_entries in entries.items():
+            subject_entries.sort()
+            self.subjects[subject] = (
+                [number for number, _, _ in subject_entries],
+                [(position, class_id) for _, position, class_id in subject_entries]
+            )
+        # Mapping: (SUBJECT, threshold) -> tuple of class IDs
+        self._expansions = {}
+        self._lock = threading.Lock()
+
+    def expand(self, subject, threshold):
+        """
+        Returns the class IDs of the subject (any case) numbered threshold or above, in
+        catalog order like the regex query it replaces. Results are memoized.
+        """
+        key = (subject.upper(), threshold)
+        expansion = self._expansions.get(key)
+        if expansion is None:
+            numbers, subject_entries = self.subjects.get(key[0], ([], []))
+            matching = sorted(subject_entries[bisect_left(numbers, threshold):])
+            expansion = tuple(class_id for _, class_id in matching)
+            with self._lock:
+                self._expansions[key] = expansion
+        return expansion
+
+
+def get_course_number_index(uri=None, db_name=None):
+    """
+    Returns the course number index of the current catalog version: the catalog
+    snapshot's, or (when snapshots are disabled) one cached until the version stamp changes.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.course_number_index
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    db = get_mongo_db(*key)
+    version = get_catalog_version(db)
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] is not None and cached[0] == version:
+        return cached[1]
+    with _indexes_lock:
+        index = CourseNumberIndex(db["Class"].find({}, {"class_id": 1}))
+        _indexes[key] = (version, index)
+    return index
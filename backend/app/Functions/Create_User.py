@@ -1,8 +1,8 @@
 import sys, os, re
 
-from pymongo import MongoClient
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from mongo_database import get_mongo_db
 from Models.User_Logins_Model import User_Logins
 from cryptography.fernet import Fernet
 import bcrypt
@@ -27,8 +27,7 @@ def generate_User_Test(email, password):
     
     
 def generate_User (email, password, username):
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["my_database"]
+    db = get_mongo_db()
     collection = db["Users"]
     if("@" not in email):
         return "Wrong email format"
@@ -60,8 +59,7 @@ def check_password(stored_hash, user_input):
     return bcrypt.checkpw(user_input.encode('utf-8'), stored_hash)
 
 def login(account, password):
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["my_database"]
+    db = get_mongo_db()
     collection = db["Users"]
     user = collection.find_one({"email": account})
     if not user:
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+import numpy as np
+from bson import Binary
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+# Descriptions encoded per model call when (re-)embedding the catalog
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+# Load the model in the background at startup instead of on the first encode()
+EMBEDDING_PRELOAD = os.getenv("EMBEDDING_PRELOAD", "0") == "1"
+
+
+def vector_to_binary(vector):
+    """
+    Packs an embedding into compact little-endian float32 bytes for storing in Mongo
+    (4 bytes per dimension instead of a BSON double array).
+    """
+    return Binary(np.asarray(vector, dtype="<f4").tobytes())
+
+
+def binary_to_vector(value):
+    """
+    Unpacks a stored embedding into a float32 array. Accepts both the packed form and
+    the plain float lists older versions stored; None stays None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        return np.frombuffer(value, dtype="<f4")
+    return np.asarray(value, dtype=np.float32)
+
+
+class EmbeddingService:
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
+        """
+        Loads the SentenceTransformer model the first time it is needed (or in a background
+        thread, see start_background_load) instead of when the module is imported, so
+        processes that never rank courses never pay for torch and the model.
+
+        :param model_name: Name of the SentenceTransformer model.
+        """
+        self.model_name = model_name
+        self.device = None
+        self.error = None
+        self.load_seconds = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self):
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            print("Loading model...")
+            started = time.perf_counter()
+            try:
+                from sentence_transformers import SentenceTransformer
+                from torch.cuda import is_available as cuda_available
+                from torch.mps import is_available as mps_available
+                device = "cuda" if cuda_available() else "cpu"
+                device = "mps" if device == "cpu" and mps_available() else device
+                model = SentenceTransformer(self.model_name).to(device)
+            except Exception as e:
+                self.error = str(e)
+                raise
+            self.device = device
+            self.error = None
+            self.load_seconds = time.perf_counter() - started
+            self._model = model
+            print("Model loaded on:", device)
+            return model
+
+    @property
+    def model(self):
+        """
+        The loaded model; blocks until it is loaded.
+        """
+        if self._model is None:
+            return self._load()
+        return self._model
+
+    def start_background_load(self):
+        """
+        Starts loading the model in a daemon thread and returns immediately.
+        """
+        if self._model is not None or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        def load():
+            try:
+                self._load()
+            except Exception as e:
+                # Not fatal: the next encode() tries again and raises the error to its caller.
+                print(f"Could not load the embedding model: {e}")
+
+        self._thread = threading.Thread(target=load, name="embedding-model-loader", daemon=True)
+        self._thread.start()
+
+    def is_ready(self):
+        return self._model is not None
+
+    def status(self):
+        """
+        Readiness probe: {"ready", "lazy", "loading", "model", "device", "load_seconds", "error"}.
+        "lazy" means the model is not loaded yet and is not being preloaded: the first
+        encode() loads it.
+        """
+        loading = self._model is None and self._thread is not None and self._thread.is_alive()
+        return {
+            "ready": self.is_ready(),
+            "lazy": self._model is None and not loading and not EMBEDDING_PRELOAD,
+            "loading": loading,
+            "model": self.model_name,
+            "device": self.device,
+            "load_seconds": self.load_seconds,
+            "error": self.error
+        }
+
+    def encode(self, sentences, **kwargs):
+        """
+        Same as SentenceTransformer.encode; loads the model first if needed.
+        """
+        return self.model.encode(sentences, **kwargs)
+
+
+# Shared by everything in this process that needs sentence embeddings.
+embedding_service = EmbeddingService()
@@ -0,0 +1,145 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import threading
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Models.Class_Model import Class_Model
+from Functions.Catalog_Snapshot import get_catalog_snapshot, get_catalog_version
+
+# How add_GER_course finds the candidates of each GER area in the Class collection.
+# "designation" matches a requirement_designation exactly; "pattern" (and "class_id_pattern")
+# match case-insensitively anywhere in it, like the {"$regex": ..., "$options": "i"} queries.
+GER_AREAS = {
+    "first_year_seminar": {"designation": "First Year Seminar with Race  Ethnicity"},
+    "first_year_writing": {"designation": "FirstYear Writing"},
+    "writing": {"pattern": "writing"},
+    "quantitative_reasoning": {"pattern": "Quantitative Reasoning"},
+    "science_lab": {"pattern": "lab"},
+    "science_nature": {"pattern": "Science Nature"},
+    "history_society_cultures": {"pattern": "History Society Cultures"},
+    "intercultural_communication": {"pattern": "Intercultural Communication", "class_id_pattern": "ITAL"},
+    "humanities_arts_performance": {"pattern": "Humanities Arts Performance"},
+    "physical_education": {"pattern": "Physical Education"},
+}
+
+_buckets = {}  # Mapping: (uri, db_name) -> (catalog version, buckets), used without snapshots
+_buckets_lock = threading.Lock()
+
+
+class GERCandidate:
+    def __init__(self, doc):
+        """
+        A class that counts toward a GER area, with the metadata add_GER_course filters on.
+
+        :param doc: The Class document.
+        """
+        class_obj = Class_Model.from_dict(doc)
+        self.doc = doc
+        self.class_id = class_obj.class_id
+        self.credit_hours = class_obj.credit_hours
+        self.has_prereqs = class_obj.prereqs != []
+
+    def to_class(self):
+        """
+        Returns a new Class_Model of the candidate (schedules modify their classes).
+        """
+        return Class_Model.from_dict(self.doc)
+
+
+def _designations(doc):
+    designation = doc.get("requirement_designation")
+    if designation is None:
+        return []
+    if isinstance(designation, list):
+        return [value for value in designation if isinstance(value, str)]
+    return [designation] if isinstance(designation, str) else []
+
+
+def _area_matcher(area):
+    if "designation" in area:
+        designation = area["designation"]
+        matches_designation = lambda values: designation in values
+    else:
+        pattern = re.compile(area["pattern"], re.IGNORECASE)
+        matches_designation = lambda values: any(pattern.search(value) for value in values)
+    class_id_pattern = re.compile(area["class_id_pattern"], re.IGNORECASE) if "class_id_pattern" in area else None
+
+    def matches(doc):
+        if not matches_designation(_designations(doc)):
+            return False
+        if class_id_pattern is not None:
+            class_id = doc.get("class_id")
+            return isinstance(class_id, str) and class_id_pattern.search(class_id) is not None
+        return True
+    return matches
+
+
+def build_ger_buckets(class_docs, areas=GER_AREAS):
+    """
+    Sorts the catalog into GER areas once, so adding GER classes to a schedule needs no
+    queries.
+
+    :param class_docs: Documents of the "Class" collection, in catalog order.
+    :param areas: Area definitions (see GER_AREAS).
+    :return: Mapping: area name -> tuple of GERCandidate, in catalog order (the order
+             the per-area queries returned them).
+    """
+    matchers = {name: _area_matcher(area) for name, area in areas.items()}
+    buckets = {name: [] for name in areas}
+    for doc in class_docs:
+        if not _designations(doc):
+            continue
+        candidate = None
+        for name, matches in matchers.items():
+            if matches(doc):
+                candidate = candidate or GERCandidate(doc)
+                buckets[name].append(candidate)
+    return {name: tuple(candidates) for name, candidates in buckets.items()}
+
+
+def get_ger_buckets(uri=None, db_name=None):
+    """
+    Returns the GER buckets of the current catalog version: the catalog snapshot's, or
+    (when snapshots are disabled) ones cached until the version stamp changes.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.ger_buckets
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    db = get_mongo_db(*key)
+    version = get_catalog_version(db)
+    cached = _buckets.get(key)
+    if cached is not None and cached[0] is not None and cached[0] == version:
+        return cached[1]
+    with _buckets_lock:
+        buckets = build_ger_buckets(db["Class"].find({"requirement_designation": {"$exists": True}}))
+        _buckets[key] = (version, buckets)
+    return buckets
+
+
+def pick_GER_classes(candidates, count, excluded_ids, GER_class_obj, GER_class_id, skip_with_prereqs=False):
+    """
+    Appends up to count candidates that are not scheduled, taken or already picked to
+    GER_class_obj / GER_class_id.
+
+    :param candidates: GERCandidate tuple of one area (see build_ger_buckets).
+    :param count: Number of classes the area still needs.
+    :param excluded_ids: Class IDs already in the schedule or taken.
+    :param skip_with_prereqs: Skip classes that have prerequisites.
+    :return: The number of classes the area still needs afterwards.
+    """
+    for candidate in candidates:
+        if count <= 0:
+            break
+        if skip_with_prereqs and candidate.has_prereqs:
+            continue
+        if candidate.class_id in excluded_ids or candidate.class_id in GER_class_id:
+            continue
+        GER_class_obj.append(candidate.to_class())
+        GER_class_id.append(candidate.class_id)
+        count -= 1
+    return count
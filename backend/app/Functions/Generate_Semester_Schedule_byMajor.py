@@ -1,17 +1,22 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pymongo import MongoClient
+from mongo_database import get_mongo_db
 #from Models.Major_Req_Model import MajorRequirement  # Your MajorRequirement model with from_dict() method
 from Models.Semester_Schedule_Model import Semester_Schedule  # Your simplified Semester_Schedule_Model class
 from Models.Class_Model import Class_Model
 from Models.Class_Detail_Model import Class_Detail
 from Functions.Get_Major_Req_byName import get_major_requirements_by_name
-from Functions.Get_Class_byID import get_class_by_id
+from Functions.Get_Class_byID import get_class_by_id, get_classes_by_ids, get_class_details_by_ids
+from Functions.Catalog_Snapshot import get_catalog_snapshot
+from Functions.Prereq_Graph import parse_prereq_groups
+from Functions.Section_Optimizer import optimize_sections, first_fit_sections, get_professor_ratings, SECTION_SEARCH_MAX_NODES
+from Functions.Schedule_Solver import backtrack_assignment, propagation_assignment, SearchBudget
+from Functions.GER_Buckets import get_ger_buckets, pick_GER_classes
 from pprint import pprint
 
 def generate_dummy_semester_schedule(major_name, year=2025, semester="Fall", elective_count=1,
-                               uri="mongodb://localhost:27017/", db_name="my_database"):
+                               uri=None, db_name=None):
     """
     Generates a semester schedule for the given major. It retrieves the major requirements,
     then for each required course (and electives), it fetches the corresponding Course object
@@ -73,7 +78,8 @@ def generate_dummy_semester_schedule(major_name, year=2025, semester="Fall", ele
 
 
 def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credits=19,
-                            uri="mongodb://localhost:27017/", db_name="my_database", startingSemester = "Fall"):
+                            uri=None, db_name=None, startingSemester = "Fall",
+                            solver="backtrack", max_nodes=None, time_limit_ms=None, return_details=False):
     """
     Generates a full multi-semester schedule that satisfies the major requirements, including electives.
     
@@ -90,6 +96,16 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
     :param elective_count: Number of elective classes to include from the major requirements.
     :param uri: MongoDB connection URI.
     :param db_name: MongoDB database name.
+    :param startingSemester: "Fall" or "Spring", the semester the schedule starts in.
+    :param solver: "backtrack" (plain backtracking in a fixed class order, see Schedule_Solver.backtrack_assignment)
+                   or "propagation" (domain propagation with forward checking, see Schedule_Solver.propagation_assignment).
+    :param max_nodes: Maximum number of search nodes to expand (None for no limit).
+    :param time_limit_ms: Maximum search time in milliseconds (None for no limit).
+    :param return_details: If True, return a dict instead of the bare schedule:
+                           {"schedule": the full schedule, or the best partial one found,
+                            "unplaced": class IDs left out of the schedule,
+                            "complete": True if every class was placed,
+                            "stats": {"nodes", "backtracks", "elapsed_ms", "budget_exhausted"}}
     :return: A list of lists, where each sublist corresponds to a semester’s scheduled classes, or None if no schedule found.
     """
     # Retrieve major requirements.
@@ -98,17 +114,16 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
         print(f"Major requirements not found for {major_name}")
         return None
 
+    # Collect every class ID the major can use, then fetch them in one round trip.
+    fetched = get_classes_by_ids(
+        collect_required_ids(major_req) + collect_elective_ids(major_req), uri, db_name
+    )
+
     # Build list of required class objects.
     required_classes_id = []
     required_classes = []
-    for class_item in major_req.required_classes:
-        # If alternatives are provided, choose the first alternative.
-        if isinstance(class_item, list):
-            class_id = class_item[0]
-        else:
-            class_id = class_item
-
-        class_obj = get_class_by_id(class_id, uri, db_name)
+    for class_id in collect_required_ids(major_req):
+        class_obj = fetched.get(class_id)
         if class_obj:
             required_classes.append(class_obj)
             required_classes_id.append(class_id)
@@ -126,7 +141,7 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
                         elective_id = elective[0]
                     else:
                         elective_id = elective
-                    if get_class_by_id(elective_id, uri, db_name):
+                    if elective_id in fetched:
                         if elective_id not in elective_classes_id:
                             if elective_id not in required_classes_id:
                                 if elective_id == 'MATH275' or elective_id == 'MATH276':
@@ -136,13 +151,7 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
                     else:
                         print(f"Warning: Elective class {elective} not found in the database.")
                     
-    elective_classes = []
-    for elective_id in elective_classes_id:
-        elective_obj = get_class_by_id(elective_id, uri, db_name)
-        if elective_obj:
-            elective_classes.append(elective_obj)
-        else:
-            print(f"Warning: Class {elective_obj} not found in the database.")
+    elective_classes = [fetched[elective_id] for elective_id in elective_classes_id]
     
     
     # Combine required and elective classes.
@@ -153,59 +162,7 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
     # --- Augment the class set with any missing prerequisites ---
     # We'll use a dictionary mapping class_id -> class_obj.
     all_classes_dict = {cls.class_id: cls for cls in all_classes}
-    
-    def add_missing_prereqs(cls_obj, all_dict):
-        groups = []
-        prereqs = getattr(cls, "prereqs", [])
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    alternatives = [p.strip() for p in part.split(" or ") if p.strip()]
-                    if not any(item in all_dict for item in alternatives) :
-                        pre = alternatives[0]
-                        pre_obj = get_class_by_id(pre, uri, db_name)
-                        if pre_obj:
-                            all_dict[pre_obj.class_id] = pre_obj
-                            add_missing_prereqs(pre_obj, all_dict)
-                        else:
-                            print(f"Warning: Prerequisite class {pre} not found in the database.")
-                else:
-                    pre = part
-                    if pre not in all_dict:
-                        pre_obj = get_class_by_id(pre, uri, db_name)
-                        if pre_obj:
-                            all_dict[pre_obj.class_id] = pre_obj
-                            add_missing_prereqs(pre_obj, all_dict)
-                        else:
-                            print(f"Warning: Prerequisite class {pre} not found in the database.")
-                
-
-                
-                    
-                    
-        # for pre in getattr(cls_obj, "prereqs", []):
-        #     # Process prerequisite: if it contains " or ", choose the first alternative.
-        #     if " or " in pre:
-        #         pre = pre.split(" or ")[0].strip()
-        #     else:
-        #         pre = pre.strip()
-        #     if pre and pre not in all_dict:
-        #         pre_obj = get_class_by_id(pre, uri, db_name)
-        #         if pre_obj:
-        #             all_dict[pre_obj.class_id] = pre_obj
-        #             add_missing_prereqs(pre_obj, all_dict)
-        #         else:
-        #             print(f"Warning: Prerequisite class {pre} not found in the database.")
-
-    for cls in list(all_classes_dict.values()):
-        add_missing_prereqs(cls, all_classes_dict)
+    add_missing_prereqs(all_classes_dict, uri, db_name, first_alternative_only=True)
     # Rebuild our full list.
     all_classes = list(all_classes_dict.values())
                     
@@ -215,108 +172,42 @@ def generate_full_schedule(major_name, num_semesters, min_credits=12, max_credit
     # Build a mapping from class_id to class object.
     class_dict = {cls.class_id: cls for cls in all_classes}
     
-    # Build prerequisite groups.
-    # For each class, assume cls.prereqs is a list of strings like:
-    # ["Math210 or Math211", "Math221", "CS170 or Math170"]
-    direct_prereqs = {}
-    for cls in all_classes:
-        direct = set()
-        prereqs = getattr(cls, "prereqs", [])
-        # Ensure prereqs is a list (if it's a string, make it a single-element list)
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    candidate = [p.strip() for p in part.split(" or ") if p.strip()]
-                    for item in candidate:
-                        if item in class_dict:
-                            direct.add(item)
-                else:
-                    candidate = part
-                    if candidate in class_dict:
-                        direct.add(candidate)
-        direct_prereqs[cls.class_id] = direct
-        
-        
-    # --- Compute transitive prerequisites using DFS ---
-    memo = {}
-    def compute_transitive(cid):
-        if cid in memo:
-            return memo[cid]
-        trans = set(direct_prereqs.get(cid, []))
-        for pre in direct_prereqs.get(cid, []):
-            trans |= compute_transitive(pre)
-        memo[cid] = trans
-        return trans
-
-    transitive_prereqs = {cid: compute_transitive(cid) for cid in class_dict}
+    # Transitive prerequisites within this class set, from the precompiled catalog graph.
+    transitive_prereqs = get_transitive_prereqs(all_classes, uri, db_name)
         
         
     # Sort classes by number of prerequisite groups (fewer groups first)
     sorted_classes = sorted(all_classes, key=lambda cls: len(transitive_prereqs.get(cls.class_id, [])))
     
-    # Backtracking algorithm.
-    assignment = {}  # Mapping: class_id -> semester (1-indexed)
-    semester_credits = [0] * num_semesters
-    result = None
-
-    def prerequisites_satisfied(cls, candidate_sem):
-        # All transitive prerequisites must be scheduled in a semester before candidate_sem.
-        for pre in transitive_prereqs.get(cls.class_id, set()):
-            if pre not in assignment or assignment[pre] >= candidate_sem:
-                return False
-        return True
-
-    def backtrack(i):
-        nonlocal result
-        if i == len(sorted_classes):
-            if all(semester_credits[s] >= min_credits for s in range(num_semesters)):
-                result = assignment.copy()
-                return True
-            return False
-        
-        cls = sorted_classes[i]
-        if startingSemester == "Fall":
-            isFall = True
+    budget = SearchBudget(max_nodes, time_limit_ms)
+    if solver == "propagation":
+        result = propagation_assignment(sorted_classes, transitive_prereqs, num_semesters,
+                                        min_credits, max_credits, startingSemester, budget)
+    else:
+        result = backtrack_assignment(sorted_classes, transitive_prereqs, num_semesters,
+                                      min_credits, max_credits, startingSemester, budget)
+    found = result is not None
+    if not found:
+        if budget.exhausted:
+            print(f"Schedule search stopped after {budget.nodes} nodes ({budget.elapsed_ms():.0f} ms).")
         else:
-            isFall = False
-        # cls_rec = get_class_by_id(cls.class_id, uri, db_name).recurring
-        for sem in range(1, num_semesters + 1):
-            if not prerequisites_satisfied(cls, sem):
-                isFall = not isFall
-                continue
-            if semester_credits[sem - 1] + cls.credit_hours > max_credits:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "fall" ) and not isFall:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "spring" ) and isFall:
-                isFall = not isFall
-                continue            
-            assignment[cls.class_id] = sem
-            semester_credits[sem - 1] += cls.credit_hours
-            if backtrack(i + 1):
-                return True
-            del assignment[cls.class_id]
-            semester_credits[sem - 1] -= cls.credit_hours
-        return False
-
-    if not backtrack(0):
-        print("No valid schedule found!")
-        return None
+            print("No valid schedule found!")
+        if not return_details:
+            return None
+        # Fall back to the best partial assignment seen during the search.
+        result = budget.best
 
     # Build final schedule: list of semesters (each a list of class objects)
     schedule = [[] for _ in range(num_semesters)]
+    unplaced = []
     for cls in sorted_classes:
-        sem = result[cls.class_id]
+        sem = result.get(cls.class_id)
+        if sem is None:
+            unplaced.append(cls.class_id)
+            continue
         schedule[sem - 1].append(cls)
+    if return_details:
+        return {"schedule": schedule, "unplaced": unplaced, "complete": found, "stats": budget.stats()}
     return schedule
 
 def convert_schedule_to_obj(schedule, startYear, startsFall):
@@ -346,13 +237,15 @@ def convert_schedule_to_obj(schedule, startYear, startsFall):
     return semester_schedule_objects
         
 
-def add_GER_course(schedule, isBulePlan = False, isEM = True, takenClass = None):
+def add_GER_course(schedule, isBulePlan = False, isEM = True, takenClass = None, uri=None, db_name=None):
     """
     Add GER classes into exsiting schedule 
     
     :param schedule: List of semesters, where each semester is a list of class objects.
     :param isBluePlan: To identify if the student is taking Blue plan (default is False, taking Gold plan).
     :param isEM: To identify if the student is taking all courses in EM, False if if OX continuess.
+    :param uri: MongoDB connection URI.
+    :param db_name: Name of the MongoDB database.
     :return: List of semesters, where each semester is a list of class objects.
     """
     
@@ -379,12 +272,8 @@ def add_GER_course(schedule, isBulePlan = False, isEM = True, takenClass = None)
     end of college: Continuing Commnuication(CC)(2 courses), Experience and Application(XA)(1 course)
     """
     if (isBulePlan):
-        # Connect to MongoDB
-        uri="mongodb://localhost:27017/", 
-        db_name="my_database"
-        client = MongoClient(uri)
-        db = client[db_name]
-        classes_collection = db["Class"]
+        # GER candidates of every area, sorted out once per catalog version
+        buckets = get_ger_buckets(uri, db_name)
         
         
         # Create List for GER classes
@@ -402,12 +291,8 @@ def add_GER_course(schedule, isBulePlan = False, isEM = True, takenClass = None)
 
         
     else:
-        # Connect to MongoDB
-        uri="mongodb://localhost:27017/", 
-        db_name="my_database"
-        client = MongoClient(uri)
-        db = client[db_name]
-        classes_collection = db["Class"]
+        # GER candidates of every area, sorted out once per catalog version
+        buckets = get_ger_buckets(uri, db_name)
         
         
         # Create List for GER classes
@@ -460,147 +345,39 @@ def add_GER_course(schedule, isBulePlan = False, isEM = True, takenClass = None)
             elif "Physical Education" in cls.requirement_designation:
                 area9 = area9-1
         
+        # Classes that are already scheduled or taken are never picked again
+        excluded_ids = set(allclasses_id)
+
         # Area 1 and Area 10
-        # Retrieve the document to find requirement_designation:
-        doc = classes_collection.find({"requirement_designation": "First Year Seminar with Race  Ethnicity"})
-        while(area1>0):
-            cls_doc = next(doc)
-            if cls_doc:
-                # doc = next(doc, None)
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (allclasses_id and GER_class_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area1-=1    
-                
+        area1 = pick_GER_classes(buckets["first_year_seminar"], area1, excluded_ids, GER_class_obj, GER_class_id)
+
         # Area 2
-        # Retrieve the document to find requirement_designation:
-        doc = classes_collection.find({"requirement_designation": "FirstYear Writing"})
-        while(area2>0):
-            cls_doc = next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area2-=1
-                    
-        # Area 3:
-        doc = classes_collection.find({"requirement_designation": {"$regex": "writing", "$options": "i"}})
-        while(area3>0):
-            cls_doc=next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_obj.prereqs != []:
-                    continue
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area3-=1
-                 
+        area2 = pick_GER_classes(buckets["first_year_writing"], area2, excluded_ids, GER_class_obj, GER_class_id)
+
+        # Area 3: (only classes without prerequisites)
+        area3 = pick_GER_classes(buckets["writing"], area3, excluded_ids, GER_class_obj, GER_class_id, skip_with_prereqs=True)
+
         # Area 4:
-        doc = classes_collection.find({"requirement_designation": {"$regex": "Quantitative Reasoning", "$options": "i"}})
-        while(area4>0):
-            cls_doc=next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area4-=1
+        area4 = pick_GER_classes(buckets["quantitative_reasoning"], area4, excluded_ids, GER_class_obj, GER_class_id)
 
-                    
         # Area 5:
+        area5_1 = pick_GER_classes(buckets["science_lab"], area5_1, excluded_ids, GER_class_obj, GER_class_id)
+        area5_2 = pick_GER_classes(buckets["science_nature"], area5_2, excluded_ids, GER_class_obj, GER_class_id)
 
-        doc = classes_collection.find({"requirement_designation": {"$regex": "lab", "$options": "i"}})
-        while(area5_1):
-            cls_doc = next(doc)
-            if doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area5_1-=1
-
-        doc = classes_collection.find({"requirement_designation": {"$regex": "Science Nature", "$options": "i"}})
-        while(area5_2):
-            cls_doc = next(doc) 
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area5_2-=1
-                    
-                    
         # Area 6:
-        doc = classes_collection.find({"requirement_designation": {"$regex": "History Society Cultures", "$options": "i"}})
-        while(area6>0):
-            cls_doc = next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area6-=1
-                    
-                    
+        area6 = pick_GER_classes(buckets["history_society_cultures"], area6, excluded_ids, GER_class_obj, GER_class_id)
+
         # Area 7:
-        doc = classes_collection.find({"requirement_designation": {"$regex": "Intercultural Communication", "$options": "i"}, "class_id": {"$regex": "ITAL", "$options": "i"}})
-        while(area7_1>0):
-            cls_doc = next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area7_1-=1
-        doc = classes_collection.find({"requirement_designation": {"$regex": "Humanities Arts Performance", "$options": "i"}})
-        while(area7_2>0):
-            cls_doc = next(doc)
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area7_2-=1
-                    
-                    
+        area7_1 = pick_GER_classes(buckets["intercultural_communication"], area7_1, excluded_ids, GER_class_obj, GER_class_id)
+        area7_2 = pick_GER_classes(buckets["humanities_arts_performance"], area7_2, excluded_ids, GER_class_obj, GER_class_id)
+
         # Area 9:
-        doc = classes_collection.find({"requirement_designation": {"$regex": "Physical Education", "$options": "i"}})
-        while(area9>0):
-            cls_doc
-            if cls_doc:
-                # Convert the document into a Course object using the model's from_dict method
-                class_obj = Class_Model.from_dict(cls_doc)
-                class_id = class_obj.class_id
-                if class_id not in (GER_class_id and allclasses_id):
-                    GER_class_obj.append(class_obj)
-                    GER_class_id.append(class_id)
-                    area9-=1
-                    
+        area9 = pick_GER_classes(buckets["physical_education"], area9, excluded_ids, GER_class_obj, GER_class_id)
+
     # First, ensure that missing prerequisites are inserted.
     for ger_class in GER_class_obj:
         if ger_class.prereqs:
-            groups = parse_prereq_string(ger_class.prereqs)
+            groups = get_prereq_groups(ger_class, uri, db_name)
             for group in groups:
                 # Check if any alternative from the group is already scheduled.
                 if not any(is_course_in_schedule(schedule, candidate) for candidate in group):
@@ -644,16 +421,145 @@ def parse_prereq_string(prereq_str):
     E.g., "CS101 or MATH101; PHYS101" becomes:
          [["CS101", "MATH101"], ["PHYS101"]]
     """
-    groups = []
-    for group in prereq_str.split(';'):
-        group = group.strip()
-        if group:
-            if " or " in group:
-                candidates = [p.strip() for p in group.split(" or ") if p.strip()]
-                groups.append(candidates)
-            else:
-                groups.append([group])
-    return groups
+    return parse_prereq_groups(prereq_str)
+
+def collect_required_ids(major_req):
+    """
+    Returns the required class IDs of a major, choosing the first alternative
+    whenever alternatives are provided.
+    """
+    required_ids = []
+    for class_item in major_req.required_classes:
+        if isinstance(class_item, list):
+            required_ids.append(class_item[0])
+        else:
+            required_ids.append(class_item)
+    return required_ids
+
+def collect_elective_ids(major_req):
+    """
+    Returns every elective class ID the elective selection loops may look at,
+    so they can be fetched together before the selection starts.
+    """
+    elective_ids = []
+    for key in major_req.to_dict():
+        if key.startswith("elective"):
+            for elective_field in getattr(major_req, key):
+                for elective in elective_field:
+                    elective_ids.append(elective[0] if isinstance(elective, list) else elective)
+    return elective_ids
+
+def get_prereq_groups(cls_obj, uri=None, db_name=None):
+    """
+    Returns the prerequisite groups of a class as a list of alternatives lists,
+    e.g. ["Math111 or Math115; Math112"] -> [["Math111", "Math115"], ["Math112"]].
+    Catalog classes are read from the precompiled prerequisite graph instead of re-parsed.
+    """
+    prereqs = getattr(cls_obj, "prereqs", [])
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None and snapshot.prereq_graph.covers([cls_obj]):
+        return snapshot.prereq_graph.get_groups(cls_obj.class_id)
+    return parse_prereq_groups(prereqs)
+
+def compute_transitive_prereqs(all_classes):
+    """
+    Computes, for every class, the set of its transitive prerequisites within all_classes
+    by parsing the prerequisite strings and running a DFS. Only used for classes that are
+    not in the precompiled catalog graph.
+    """
+    class_dict = {cls.class_id: cls for cls in all_classes}
+
+    # Build prerequisite groups.
+    # For each class, assume cls.prereqs is a list of strings like:
+    # ["Math210 or Math211", "Math221", "CS170 or Math170"]
+    direct_prereqs = {}
+    for cls in all_classes:
+        direct = set()
+        for group in parse_prereq_groups(getattr(cls, "prereqs", [])):
+            for item in group:
+                if item in class_dict:
+                    direct.add(item)
+        direct_prereqs[cls.class_id] = direct
+
+    # --- Compute transitive prerequisites using DFS ---
+    memo = {}
+    def compute_transitive(cid):
+        if cid in memo:
+            return memo[cid]
+        trans = set(direct_prereqs.get(cid, []))
+        for pre in direct_prereqs.get(cid, []):
+            trans |= compute_transitive(pre)
+        memo[cid] = trans
+        return trans
+
+    return {cid: compute_transitive(cid) for cid in class_dict}
+
+def get_transitive_prereqs(all_classes, uri=None, db_name=None):
+    """
+    Returns class_id -> set of transitive prerequisites within all_classes. Uses the
+    catalog prerequisite graph (parsed once, closure over bitsets, memoized per class
+    set) when it covers every class.
+    """
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None and snapshot.prereq_graph.covers(all_classes):
+        return snapshot.prereq_graph.transitive_prereqs([cls.class_id for cls in all_classes])
+    return compute_transitive_prereqs(all_classes)
+
+def add_missing_prereqs(all_dict, uri, db_name, takenClasses=None, first_alternative_only=False):
+    """
+    Augments all_dict (class_id -> class object) with every missing prerequisite,
+    level by level, fetching each level's candidates in a single round trip.
+
+    For a group of alternatives nothing is added if one of them is already present;
+    otherwise the first alternative found in the database is added (only the very
+    first alternative is tried when first_alternative_only is True). Classes in
+    takenClasses are never added.
+    """
+    if takenClasses is None:
+        takenClasses = []
+    frontier = list(all_dict.values())
+    while frontier:
+        frontier_groups = [get_prereq_groups(cls_obj, uri, db_name) for cls_obj in frontier]
+
+        # Everything this level may need, fetched together.
+        wanted = []
+        for groups in frontier_groups:
+            for group in groups:
+                if len(group) > 1:
+                    if not any(item in all_dict for item in group):
+                        wanted.extend(group[:1] if first_alternative_only else group)
+                elif group[0] not in all_dict:
+                    wanted.append(group[0])
+        fetched = get_classes_by_ids(wanted, uri, db_name)
+
+        next_frontier = []
+        for groups in frontier_groups:
+            for group in groups:
+                if len(group) > 1:
+                    if any(item in all_dict for item in group):
+                        continue
+                    for pre in (group[:1] if first_alternative_only else group):
+                        pre_obj = fetched.get(pre)
+                        if pre_obj:
+                            if pre_obj.class_id in takenClasses:
+                                break
+                            all_dict[pre_obj.class_id] = pre_obj
+                            next_frontier.append(pre_obj)
+                            break
+                        else:
+                            print(f"Warning: Prerequisite class {pre} not found in the database.")
+                else:
+                    pre = group[0]
+                    if pre in all_dict or pre in takenClasses:
+                        continue
+                    pre_obj = fetched.get(pre)
+                    if pre_obj:
+                        all_dict[pre_obj.class_id] = pre_obj
+                        next_frontier.append(pre_obj)
+                    else:
+                        print(f"Warning: Prerequisite class {pre} not found in the database.")
+        frontier = next_frontier
+    return all_dict
 
 def is_course_in_schedule(schedule, course_id):
     """
@@ -680,11 +586,11 @@ def insert_course_into_earliest_possible_semester(schedule, course, max_credits=
 def prerequisites_satisfied(ger_class, sem_index, schedule):
     """
     Checks whether the prerequisites for ger_class are satisfied in all semesters before sem_index.
-    It uses parse_prereq_string to handle both ";" and "or" within the prerequisite string.
+    It uses get_prereq_groups to handle both ";" and "or" within the prerequisite string.
     """
     if not ger_class.prereqs:
         return True
-    groups = parse_prereq_string(ger_class.prereqs)
+    groups = get_prereq_groups(ger_class)
     scheduled_ids = set()
     for i in range(sem_index):
         for cls in schedule[i].classes:
@@ -696,26 +602,38 @@ def prerequisites_satisfied(ger_class, sem_index, schedule):
     return True
 
 
-def Generate_Schedule_withTime(takenClasses, major_name):
-    uri="mongodb://localhost:27017/"
-    db_name="my_database"
+def Generate_Schedule_withTime(takenClasses, major_name, top_n=1, time_window=None, weights=None, uri=None, db_name=None):
+    """
+    Builds the next semester's schedule with concrete sections: the major plan and GER
+    courses are generated first, then one section per course is chosen so that no two
+    sections overlap and prerequisites are met (see Section_Optimizer).
+
+    :param takenClasses: Class IDs the student has already taken.
+    :param major_name: Name of the major (string).
+    :param top_n: Number of alternative schedules to return. With top_n=1 and no time_window or
+                  weights, the sections come from the cheap Section_Optimizer.first_fit_sections.
+    :param time_window: Optional (earliest, latest) 24-hour HHMM times classes should fall in.
+    :param weights: Overrides for Section_Optimizer.DEFAULT_SECTION_WEIGHTS.
+    :param uri: MongoDB connection URI.
+    :param db_name: Name of the MongoDB database.
+    :return: [best Semester_Schedule, class IDs left for later, list of the top_n best Semester_Schedules].
+    """
     major_req = get_major_requirements_by_name(major_name, uri, db_name)
     if not major_req:
         print(f"Major requirements not found for {major_name}")
         return None
     if takenClasses == None:
         takenClasses = []
+    # Collect every class ID the major can use, then fetch them in one round trip.
+    fetched = get_classes_by_ids(
+        collect_required_ids(major_req) + collect_elective_ids(major_req), uri, db_name
+    )
+
     # Build list of required class objects.
     required_classes_id = []
     required_classes = []
-    for class_item in major_req.required_classes:
-        # If alternatives are provided, choose the first alternative.
-        if isinstance(class_item, list):
-            class_id = class_item[0]
-        else:
-            class_id = class_item
-
-        class_obj = get_class_by_id(class_id, uri, db_name)
+    for class_id in collect_required_ids(major_req):
+        class_obj = fetched.get(class_id)
         if class_obj:
             if class_obj.class_id in takenClasses:
                 continue
@@ -735,7 +653,7 @@ def Generate_Schedule_withTime(takenClasses, major_name):
                         elective_id = elective[0]
                     else:
                         elective_id = elective
-                    if get_class_by_id(elective_id, uri, db_name):
+                    if elective_id in fetched:
                         if elective_id not in elective_classes_id:
                             if elective_id not in required_classes_id:
                                 if elective_id == 'MATH275' or elective_id == 'MATH276':
@@ -747,13 +665,7 @@ def Generate_Schedule_withTime(takenClasses, major_name):
                     else:
                         print(f"Warning: Elective class {elective} not found in the database.")
                     
-    elective_classes = []
-    for elective_id in elective_classes_id:
-        elective_obj = get_class_by_id(elective_id, uri, db_name)
-        if elective_obj:
-            elective_classes.append(elective_obj)
-        else:
-            print(f"Warning: Class {elective_obj} not found in the database.")
+    elective_classes = [fetched[elective_id] for elective_id in elective_classes_id]
     
     
     # Combine required and elective classes.
@@ -764,154 +676,28 @@ def Generate_Schedule_withTime(takenClasses, major_name):
     # --- Augment the class set with any missing prerequisites ---
     # We'll use a dictionary mapping class_id -> class_obj.
     all_classes_dict = {cls.class_id: cls for cls in all_classes}
-    
-    def add_missing_prereqs(cls_obj, all_dict):
-        groups = []
-        prereqs = getattr(cls_obj, "prereqs", [])
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    alternatives = [p.strip() for p in part.split(" or ") if p.strip()]
-                    if not any(item in all_dict for item in alternatives):
-                        for pre in alternatives:
-                            pre_obj = get_class_by_id(pre, uri, db_name)
-                            if pre_obj:
-                                if pre_obj.class_id in takenClasses:
-                                    break
-                                all_dict[pre_obj.class_id] = pre_obj
-                                add_missing_prereqs(pre_obj, all_dict)
-                                break
-                            else:
-                                print(f"Warning: Prerequisite class {pre} not found in the database.")
-                else:
-                    pre = part
-                    if pre not in (all_dict and takenClasses):
-                        pre_obj = get_class_by_id(pre, uri, db_name)
-                        if pre_obj:
-                            all_dict[pre_obj.class_id] = pre_obj
-                            add_missing_prereqs(pre_obj, all_dict)
-                        else:
-                            print(f"Warning: Prerequisite class {pre} not found in the database.")
-                
-
-    for cls in list(all_classes_dict.values()):
-        add_missing_prereqs(cls, all_classes_dict)
+    add_missing_prereqs(all_classes_dict, uri, db_name, takenClasses=takenClasses)
     # Rebuild our full list.
     all_classes = list(all_classes_dict.values())
 
     # Build a mapping from class_id to class object.
     class_dict = {cls.class_id: cls for cls in all_classes}
     
-    # Build prerequisite groups.
-    # For each class, assume cls.prereqs is a list of strings like:
-    # ["Math210 or Math211", "Math221", "CS170 or Math170"]
-    direct_prereqs = {}
-    for cls in all_classes:
-        direct = set()
-        prereqs = getattr(cls, "prereqs", [])
-        # Ensure prereqs is a list (if it's a string, make it a single-element list)
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    candidate = [p.strip() for p in part.split(" or ") if p.strip()]
-                    for item in candidate:
-                        if item in class_dict:
-                            direct.add(item)
-                else:
-                    candidate = part
-                    if candidate in class_dict:
-                        direct.add(candidate)
-        direct_prereqs[cls.class_id] = direct
-        
-        
-    # --- Compute transitive prerequisites using DFS ---
-    memo = {}
-    def compute_transitive(cid):
-        if cid in memo:
-            return memo[cid]
-        trans = set(direct_prereqs.get(cid, []))
-        for pre in direct_prereqs.get(cid, []):
-            trans |= compute_transitive(pre)
-        memo[cid] = trans
-        return trans
-
-    transitive_prereqs = {cid: compute_transitive(cid) for cid in class_dict}
+    # Transitive prerequisites within this class set, from the precompiled catalog graph.
+    transitive_prereqs = get_transitive_prereqs(all_classes, uri, db_name)
         
         
     # Sort classes by number of prerequisite groups (fewer groups first)
     sorted_classes = sorted(all_classes, key=lambda cls: len(transitive_prereqs.get(cls.class_id, [])))
     
-    # Backtracking algorithm.
-    assignment = {}  # Mapping: class_id -> semester (1-indexed)
-    semester_credits = [0]
-    result = None
-
-    def prerequisites_satisfied(cls, candidate_sem):
-        # All transitive prerequisites must be scheduled in a semester before candidate_sem.
-        for pre in transitive_prereqs.get(cls.class_id, set()):
-            if pre not in assignment or assignment[pre] >= candidate_sem:
-                return False
-        return True
-    all_class_id = []
-    for cls in all_classes:
-        all_class_id.append(cls.class_id)
-
     min_credits = 0
     num_semesters = 8
     startingSemester = "Fall"
-    semester_credits = [0] * num_semesters
     max_credits = 19
-    
-    def backtrack(i):
-        nonlocal result
-        if i == len(sorted_classes):
-            if all(semester_credits[s] >= min_credits for s in range(num_semesters)):
-                result = assignment.copy()
-                return True
-            return False
-        
-        cls = sorted_classes[i]
-        if startingSemester == "Fall":
-            isFall = True
-        else:
-            isFall = False
-        # cls_rec = get_class_by_id(cls.class_id, uri, db_name).recurring
-        for sem in range(1, num_semesters + 1):
-            if not prerequisites_satisfied(cls, sem):
-                isFall = not isFall
-                continue
-            if semester_credits[sem - 1] + cls.credit_hours > max_credits:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "fall" ) and not isFall:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "spring" ) and isFall:
-                isFall = not isFall
-                continue            
-            assignment[cls.class_id] = sem
-            semester_credits[sem - 1] += cls.credit_hours
-            if backtrack(i + 1):
-                return True
-            del assignment[cls.class_id]
-            semester_credits[sem - 1] -= cls.credit_hours
-        return False
 
-    if not backtrack(0):
+    result = backtrack_assignment(sorted_classes, transitive_prereqs, num_semesters,
+                                  min_credits, max_credits, startingSemester)
+    if result is None:
         print("No valid schedule found!")
         return None
 
@@ -921,7 +707,7 @@ def Generate_Schedule_withTime(takenClasses, major_name):
         sem = result[cls.class_id]
         schedule[sem - 1].append(cls)
     schedule = convert_schedule_to_obj(schedule, startYear=0, startsFall=True)
-    schedule_GER = add_GER_course(schedule = schedule, takenClass=takenClasses)
+    schedule_GER = add_GER_course(schedule = schedule, takenClass=takenClasses, uri=uri, db_name=db_name)
     all_classes_id = []
     for sem in schedule_GER:
         for cls in sem.classes:
@@ -937,81 +723,37 @@ def Generate_Schedule_withTime(takenClasses, major_name):
                 return False
         return True
     
-    def backtrack(i, current_schedule, current_credits):
-        nonlocal best_schedule
-        # If exact match, we return immediately.
-        if current_credits == max_credits:
-            best_schedule = current_schedule
-            best_credits = current_credits
-            return True  # perfect schedule found
-        
-        if i == len(all_classes_id):
-            # End of list; update best if better.
-            if current_credits > best_schedule._total_credit_hours:
-                best_schedule = current_schedule
-                best_credits = current_credits
-            return False
-        client = MongoClient(uri)
-        db = client[db_name]
-        classes_detail_collection = db["Class_Detail"]
-        # Option 1: Try to add a section for course_ids[i]
-        found_solution = False
-        course_id = all_classes_id[i]
-        all_section = []
-        doc = list(classes_detail_collection.find({"course_code": course_id}))
-        j=0
-        while (j < len(doc)):
-            sec_doc = doc[j]
-            if(sec_doc):
-                sec_obj = Class_Detail.from_dict(sec_doc)
-                all_section.append(sec_obj)
-                j+=1
-            else:
-                break
-        for section in all_section:
-            # Check if prerequisites are met.
-            if not prerequisites_satisfied(section):
-                continue
-            # Check if adding this section would exceed max_credit_hours.
-            if current_credits + section.credit_hours > max_credits:
-                continue
-            # Check for time conflicts with already scheduled sections.
-            conflict = False
-            for scheduled in current_schedule.classes:
-                if section.meeting_time == scheduled.meeting_time:
-                    conflict = True
-                    break
-            if conflict:
-                continue
-            # Try adding this section.
-            current_schedule.classes.append(section)
-            current_schedule._total_credit_hours += section.credit_hours
-            if backtrack(i + 1, current_schedule, current_credits + section.credit_hours):
-                return True  # exit early if perfect schedule found
-            # Backtrack.
-            popped = current_schedule.classes.pop()
-            current_schedule._total_credit_hours -= popped.credit_hours
-
-        # Option 2: Skip this course (if no section fits or if you want to allow a subset selection)
-        if backtrack(i + 1, current_schedule, current_credits):
-            return True
-        
-        return found_solution
+    # Fetch the sections of every candidate course once, before the search.
+    sections_by_course = get_class_details_by_ids(all_classes_id, uri, db_name)
 
-    best_schedule = Semester_Schedule(year=0, semester="Fall", classes=[])
-    best_credits = 0
-    
-    backtrack(0, best_schedule, 0)
+    if top_n <= 1 and time_window is None and weights is None:
+        # A single schedule without preferences: the first combination that fills the credits.
+        sections = first_fit_sections(sections_by_course, max_credits, is_allowed=prerequisites_satisfied,
+                                      max_nodes=SECTION_SEARCH_MAX_NODES)
+        best_schedule = Semester_Schedule(year=0, semester="Fall", classes=sections)
+        alternatives = [best_schedule] if sections else []
+    else:
+        ratings = get_professor_ratings(
+            [section.instructor_name for sections in sections_by_course.values() for section in sections], uri, db_name
+        )
+        # Branch and bound over section combinations; the best one is the schedule, the rest are alternatives.
+        stats = {}
+        options = optimize_sections(sections_by_course, max_credits, top_n=max(top_n, 1), is_allowed=prerequisites_satisfied,
+                                    ratings=ratings, time_window=time_window, weights=weights,
+                                    max_nodes=SECTION_SEARCH_MAX_NODES, stats=stats)
+        if stats["truncated"]:
+            print(f"Warning: section search for {major_name} stopped after {SECTION_SEARCH_MAX_NODES} nodes; schedules may not be the best.")
+        alternatives = [Semester_Schedule(year=0, semester="Fall", classes=sections) for score, sections in options]
+        best_schedule = alternatives[0] if alternatives else Semester_Schedule(year=0, semester="Fall", classes=[])
 
     for cls in best_schedule.classes:
         all_classes_id.remove(cls.course_code)
     print(best_schedule)
     print(all_classes_id)
-    return [best_schedule, all_classes_id]
+    return [best_schedule, all_classes_id, alternatives[:top_n]]
 
-def generate_future_schedule(major_name, num_semesters, takenClasses = None, futureClasses = None, min_credits=12, max_credits=19, startingSemester = "Fall"):
-    uri="mongodb://localhost:27017/"
-    db_name="my_database"
+def generate_future_schedule(major_name, num_semesters, takenClasses = None, futureClasses = None, min_credits=12, max_credits=19, startingSemester = "Fall",
+                             uri=None, db_name=None):
     major_req = get_major_requirements_by_name(major_name, uri, db_name)
     if not major_req:
         print(f"Major requirements not found for {major_name}")
@@ -1020,18 +762,17 @@ def generate_future_schedule(major_name, num_semesters, takenClasses = None, fut
         takenClasses = []
     if futureClasses == None:
         futureClasses = []
+    # Collect every class ID the major can use, then fetch them in one round trip.
+    fetched = get_classes_by_ids(
+        collect_required_ids(major_req) + collect_elective_ids(major_req) + list(futureClasses), uri, db_name
+    )
+
     # Build list of required class objects.
     required_classes_id = []
     required_classes_id += futureClasses
     required_classes = []
-    for class_item in major_req.required_classes:
-        # If alternatives are provided, choose the first alternative.
-        if isinstance(class_item, list):
-            class_id = class_item[0]
-        else:
-            class_id = class_item
-
-        class_obj = get_class_by_id(class_id, uri, db_name)
+    for class_id in collect_required_ids(major_req):
+        class_obj = fetched.get(class_id)
         if class_obj:
             if class_obj.class_id in (takenClasses or futureClasses):
                 continue
@@ -1051,7 +792,7 @@ def generate_future_schedule(major_name, num_semesters, takenClasses = None, fut
                         elective_id = elective[0]
                     else:
                         elective_id = elective
-                    if get_class_by_id(elective_id, uri, db_name):
+                    if elective_id in fetched:
                         if elective_id not in elective_classes_id:
                             if elective_id not in required_classes_id:
                                 if elective_id == 'MATH275' or elective_id == 'MATH276':
@@ -1063,24 +804,18 @@ def generate_future_schedule(major_name, num_semesters, takenClasses = None, fut
                     else:
                         print(f"Warning: Elective class {elective} not found in the database.")
                     
-    elective_classes = []
-    for elective_id in elective_classes_id:
-        elective_obj = get_class_by_id(elective_id, uri, db_name)
-        if elective_obj:
-            elective_classes.append(elective_obj)
-        else:
-            print(f"Warning: Class {elective_obj} not found in the database.")
+    elective_classes = [fetched[elective_id] for elective_id in elective_classes_id]
     
     
     # Combine required and elective classes.
     all_classes = []
     if futureClasses:
         for cls_id in futureClasses:
-            cls = get_class_by_id(cls_id)
+            cls = fetched.get(cls_id)
             if cls:          
-                all_classes.append(get_class_by_id(cls))
+                all_classes.append(cls)
             else: 
-                print(f"Warning: Class {elective_obj} not found in the database.")
+                print(f"Warning: Class {cls_id} not found in the database.")
     for cls in (required_classes and elective_classes):
         if cls in all_classes: continue
         all_classes.append(cls)
@@ -1092,154 +827,28 @@ def generate_future_schedule(major_name, num_semesters, takenClasses = None, fut
     # --- Augment the class set with any missing prerequisites ---
     # We'll use a dictionary mapping class_id -> class_obj.
     all_classes_dict = {cls.class_id: cls for cls in all_classes}
-    
-    def add_missing_prereqs(cls_obj, all_dict):
-        groups = []
-        prereqs = getattr(cls_obj, "prereqs", [])
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    alternatives = [p.strip() for p in part.split(" or ") if p.strip()]
-                    if not any(item in all_dict for item in alternatives):
-                        for pre in alternatives:
-                            pre_obj = get_class_by_id(pre, uri, db_name)
-                            if pre_obj:
-                                if pre_obj.class_id in takenClasses:
-                                    break
-                                all_dict[pre_obj.class_id] = pre_obj
-                                add_missing_prereqs(pre_obj, all_dict)
-                                break
-                            else:
-                                print(f"Warning: Prerequisite class {pre} not found in the database.")
-                else:
-                    pre = part
-                    if pre not in (all_dict and takenClasses):
-                        pre_obj = get_class_by_id(pre, uri, db_name)
-                        if pre_obj:
-                            all_dict[pre_obj.class_id] = pre_obj
-                            add_missing_prereqs(pre_obj, all_dict)
-                        else:
-                            print(f"Warning: Prerequisite class {pre} not found in the database.")
-                
-
-    for cls in list(all_classes_dict.values()):
-        add_missing_prereqs(cls, all_classes_dict)
+    add_missing_prereqs(all_classes_dict, uri, db_name, takenClasses=takenClasses)
     # Rebuild our full list.
     all_classes = list(all_classes_dict.values())
 
     # Build a mapping from class_id to class object.
     class_dict = {cls.class_id: cls for cls in all_classes}
     
-    # Build prerequisite groups.
-    # For each class, assume cls.prereqs is a list of strings like:
-    # ["Math210 or Math211", "Math221", "CS170 or Math170"]
-    direct_prereqs = {}
-    for cls in all_classes:
-        direct = set()
-        prereqs = getattr(cls, "prereqs", [])
-        # Ensure prereqs is a list (if it's a string, make it a single-element list)
-        if isinstance(prereqs, str):
-            prereqs = [prereqs]
-        for group_str in prereqs:
-            # Now group_str is the full string, not a single character.
-            if ";" in group_str:
-                parts = [p.strip() for p in group_str.split(";") if p.strip()]
-            else:
-                parts = [group_str.strip()]
-            for part in parts:
-                if " or " in part:
-                    candidate = [p.strip() for p in part.split(" or ") if p.strip()]
-                    for item in candidate:
-                        if item in class_dict:
-                            direct.add(item)
-                else:
-                    candidate = part
-                    if candidate in class_dict:
-                        direct.add(candidate)
-        direct_prereqs[cls.class_id] = direct
-        
-        
-    # --- Compute transitive prerequisites using DFS ---
-    memo = {}
-    def compute_transitive(cid):
-        if cid in memo:
-            return memo[cid]
-        trans = set(direct_prereqs.get(cid, []))
-        for pre in direct_prereqs.get(cid, []):
-            trans |= compute_transitive(pre)
-        memo[cid] = trans
-        return trans
-
-    transitive_prereqs = {cid: compute_transitive(cid) for cid in class_dict}
+    # Transitive prerequisites within this class set, from the precompiled catalog graph.
+    transitive_prereqs = get_transitive_prereqs(all_classes, uri, db_name)
         
         
     # Sort classes by number of prerequisite groups (fewer groups first)
     sorted_classes = sorted(all_classes, key=lambda cls: len(transitive_prereqs.get(cls.class_id, [])))
     
-    # Backtracking algorithm.
-    assignment = {}  # Mapping: class_id -> semester (1-indexed)
-    semester_credits = [0]
-    result = None
-
-    def prerequisites_satisfied(cls, candidate_sem):
-        # All transitive prerequisites must be scheduled in a semester before candidate_sem.
-        for pre in transitive_prereqs.get(cls.class_id, set()):
-            if pre not in assignment or assignment[pre] >= candidate_sem:
-                return False
-        return True
-    all_class_id = []
-    for cls in all_classes:
-        all_class_id.append(cls.class_id)
-
     min_credits = 0
     num_semesters = 8
     startingSemester = "Fall"
-    semester_credits = [0] * num_semesters
     max_credits = 19
-    
-    def backtrack(i):
-        nonlocal result
-        if i == len(sorted_classes):
-            if all(semester_credits[s] >= min_credits for s in range(num_semesters)):
-                result = assignment.copy()
-                return True
-            return False
-        
-        cls = sorted_classes[i]
-        if startingSemester == "Fall":
-            isFall = True
-        else:
-            isFall = False
-        # cls_rec = get_class_by_id(cls.class_id, uri, db_name).recurring
-        for sem in range(1, num_semesters + 1):
-            if not prerequisites_satisfied(cls, sem):
-                isFall = not isFall
-                continue
-            if semester_credits[sem - 1] + cls.credit_hours > max_credits:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "fall" ) and not isFall:
-                isFall = not isFall
-                continue
-            if (cls.recurring == "spring" ) and isFall:
-                isFall = not isFall
-                continue            
-            assignment[cls.class_id] = sem
-            semester_credits[sem - 1] += cls.credit_hours
-            if backtrack(i + 1):
-                return True
-            del assignment[cls.class_id]
-            semester_credits[sem - 1] -= cls.credit_hours
-        return False
 
-    if not backtrack(0):
+    result = backtrack_assignment(sorted_classes, transitive_prereqs, num_semesters,
+                                  min_credits, max_credits, startingSemester)
+    if result is None:
         print("No valid schedule found!")
         return None
 
@@ -1249,7 +858,7 @@ def generate_future_schedule(major_name, num_semesters, takenClasses = None, fut
         sem = result[cls.class_id]
         schedule[sem - 1].append(cls)
     schedule = convert_schedule_to_obj(schedule, startYear=0, startsFall=True)
-    schedule_GER = add_GER_course(schedule = schedule, takenClass=takenClasses)
+    schedule_GER = add_GER_course(schedule = schedule, takenClass=takenClasses, uri=uri, db_name=db_name)
     
     all_classes_id = []
     for sem in schedule_GER:
@@ -1,23 +1,28 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pymongo import MongoClient
+from mongo_database import get_mongo_db
+from Functions.Catalog_Snapshot import get_catalog_snapshot
 from Models.Class_Model import Class_Model
 from Models.Class_Detail_Model import Class_Detail
 
-def get_class_by_id(class_id, uri="mongodb://localhost:27017/", db_name="my_database"):
+def get_class_by_id(class_id, uri=None, db_name=None):
     """
     Connects to MongoDB, retrieves a course document based on course_id,
     and returns it as a Course object.
 
     :param course_id: The identifier of the course (e.g., "Math111")
-    :param uri: MongoDB connection URI (default is local instance)
-    :param db_name: The name of the database containing the courses collection
+    :param uri: MongoDB connection URI (default is MONGO_URI)
+    :param db_name: The name of the database containing the courses collection (default is MONGO_DB_NAME)
     :return: A Course object if found, or None otherwise.
     """
-    # Connect to MongoDB
-    client = MongoClient(uri)
-    db = client[db_name]
+    # Serve from the in-memory catalog when it is available
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.get_class(class_id)
+
+    # Use the shared, pooled MongoDB client
+    db = get_mongo_db(uri, db_name)
     
     # Assume that the collection is called "courses"
     classes_collection = db["Class"]
@@ -25,18 +30,18 @@ def get_class_by_id(class_id, uri="mongodb://localhost:27017/", db_name="my_data
     # Retrieve the document where "course_id" matches the given course_id
     doc = classes_collection.find_one({"course_code": class_id})
     
-    # Close the MongoDB connection
-    client.close()
-    
     if doc:
         # Convert the document into a Course object using the model's from_dict method
         return Class_Model.from_dict(doc)
     else:
         return None
     
-def get_class_detail_by_id(class_id, uri="mongodb://localhost:27017/", db_name="my_database"):
-    client = MongoClient(uri)
-    db = client[db_name]
+def get_class_detail_by_id(class_id, uri=None, db_name=None):
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.get_class_detail(class_id)
+
+    db = get_mongo_db(uri, db_name)
     
     # Assume that the collection is called "courses"
     classes_collection = db["Class_Detail"]
@@ -44,15 +49,71 @@ def get_class_detail_by_id(class_id, uri="mongodb://localhost:27017/", db_name="
     # Retrieve the document where "course_id" matches the given course_id
     doc = classes_collection.find_one({"course_code": class_id})
     
-    # Close the MongoDB connection
-    client.close()
-    
     if doc:
         # Convert the document into a Course object using the model's from_dict method
         return Class_Detail.from_dict(doc)
     else:
         return None
 
+def get_classes_by_ids(class_ids, uri=None, db_name=None):
+    """
+    Retrieves many courses at once instead of calling get_class_by_id in a loop.
+
+    :param class_ids: Iterable of course identifiers (e.g., {"MATH111", "CS170"}).
+    :param uri: MongoDB connection URI (default is MONGO_URI)
+    :param db_name: The name of the database containing the courses collection (default is MONGO_DB_NAME)
+    :return: A dict mapping each course identifier that was found to its Class_Model.
+    """
+    class_ids = [class_id for class_id in dict.fromkeys(class_ids) if class_id]
+    if not class_ids:
+        return {}
+
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        found = {}
+        for class_id in class_ids:
+            class_obj = snapshot.get_class(class_id)
+            if class_obj:
+                found[class_id] = class_obj
+        return found
+
+    # One round trip for the whole set
+    db = get_mongo_db(uri, db_name)
+    found = {}
+    for doc in db["Class"].find({"course_code": {"$in": class_ids}}):
+        # Keep the first match per course, like find_one would
+        if doc["course_code"] not in found:
+            found[doc["course_code"]] = Class_Model.from_dict(doc)
+    return found
+
+def get_class_details_by_ids(course_codes, uri=None, db_name=None):
+    """
+    Retrieves every section of many courses at once.
+
+    :param course_codes: Iterable of course identifiers (e.g., {"MATH111", "CS170"}).
+    :param uri: MongoDB connection URI (default is MONGO_URI)
+    :param db_name: The name of the database containing the courses collection (default is MONGO_DB_NAME)
+    :return: A dict mapping each course identifier to a list of its Class_Detail sections
+             (an empty list if the course has none).
+    """
+    course_codes = [course_code for course_code in dict.fromkeys(course_codes) if course_code]
+    sections = {course_code: [] for course_code in course_codes}
+    if not course_codes:
+        return sections
+
+    # The snapshot builds the Class_Detail objects once and reuses them across requests
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        for course_code in course_codes:
+            sections[course_code] = list(snapshot.get_sections(course_code))
+        return sections
+
+    # One round trip for the whole set
+    db = get_mongo_db(uri, db_name)
+    for doc in db["Class_Detail"].find({"course_code": {"$in": course_codes}}):
+        sections[doc["course_code"]].append(Class_Detail.from_dict(doc))
+    return sections
+
 # Example usage:
 if __name__ == "__main__":
     # Let's try to fetch the course "Math111"
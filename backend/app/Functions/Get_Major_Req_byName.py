@@ -1,23 +1,28 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pymongo import MongoClient
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Functions.Catalog_Snapshot import get_catalog_snapshot, get_catalog_version
+from Functions.Course_Number_Index import get_course_number_index
 from Models.Major_Req_Model import MajorRequirement
 from pprint import pprint
 import re
+import threading
 
-def get_major_requirements_by_name_aa(major_name, uri="mongodb://localhost:27017/", db_name="my_database"):
+_major_requirements = {}  # Mapping: (uri, db_name) -> (snapshot or version stamp, compiled requirements)
+_major_requirements_lock = threading.Lock()
+
+def get_major_requirements_by_name_aa(major_name, uri=None, db_name=None):
     """
     Retrieves the major requirements document from MongoDB based on the provided major name.
     
     :param major_name: Name of the major to search for.
-    :param uri: MongoDB connection URI (default is localhost).
-    :param db_name: Name of the database where major requirements are stored.
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database where major requirements are stored (default is MONGO_DB_NAME).
     :return: A MajorRequirement object if found, otherwise None.
     """
-    # Connect to MongoDB
-    client = MongoClient(uri)
-    db = client[db_name]
+    # Use the shared, pooled MongoDB client
+    db = get_mongo_db(uri, db_name)
     
     # Access the collection that stores major requirements
     major_req_collection = db["Major_Req"]
@@ -28,9 +33,6 @@ def get_major_requirements_by_name_aa(major_name, uri="mongodb://localhost:27017
     # Find the document matching the major name (case sensitive; adjust query if needed)
     doc = major_req_collection.find_one({"major_name": major_name})
     
-    # Close the client connection
-    client.close()
-    
     if doc:
         # Process 'required_classes': if it's a string, split into a list.
         if "required_classes" in doc and isinstance(doc["required_classes"], str):
@@ -66,24 +68,56 @@ def get_major_requirements_by_name_aa(major_name, uri="mongodb://localhost:27017
     else:
         return None
     
-def get_major_requirements_by_name(major_name, uri="mongodb://localhost:27017/", db_name="my_database"):
+def get_major_requirements_by_name(major_name, uri=None, db_name=None):
     """
     Retrieves the major requirements document from MongoDB based on the provided major name.
     If a required (or elective) class is specified as "Math200*", it is replaced by a list of all 
     Math courses (from the Class_Model collection) whose numeric part is >= 200.
     
+    Requirements are compiled once per catalog version for every major (see
+    get_major_requirement_cache) and matched by normalized name; the returned object is
+    shared, so callers must not modify it.
+    
     :param major_name: Name of the major to search for.
-    :param uri: MongoDB connection URI (default is localhost).
-    :param db_name: Name of the database where major requirements are stored.
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database where major requirements are stored (default is MONGO_DB_NAME).
     :return: A MajorRequirement object if found, otherwise None.
     """
-    client = MongoClient(uri)
-    db = client[db_name]
-    
-    # Access the collection that stores major requirements.
+    compiled = get_major_requirement_cache(uri, db_name)
+    if compiled is not None:
+        return compiled.get(normalize_major_name(major_name))
+
+    # Unversioned catalog without a snapshot: compile just this major.
+    db = get_mongo_db(uri, db_name)
     major_req_collection = db["Major_Req"]
     doc = major_req_collection.find_one({"major_name": major_name})
-    
+    if doc is None:
+        key = normalize_major_name(major_name)
+        doc = next((d for d in major_req_collection.find() if normalize_major_name(d.get("major_name")) == key), None)
+    if doc:
+        number_index = get_course_number_index(uri, db_name) if has_wildcard_electives(doc) else None
+        return compile_major_requirement(doc, db, number_index)
+    else:
+        return None
+
+
+def has_wildcard_electives(doc):
+    """
+    Whether any elective field of a Major_Req document holds a wildcard such as "CS200*".
+    """
+    return any(key.startswith("elective") and isinstance(doc[key], str) and "*" in doc[key] for key in doc)
+
+
+def compile_major_requirement(doc, db, number_index=None):
+    """
+    Turns a Major_Req document into a MajorRequirement: required classes are split into a
+    list (alternatives into sub-lists) and every elective field into a list of class IDs,
+    with wildcards such as "Math200*" expanded.
+
+    :param doc: The Major_Req document (its fields are rewritten).
+    :param db: Database used to expand wildcards when no number_index is given.
+    :param number_index: Optional CourseNumberIndex to expand wildcards from.
+    """
     if doc:
         # Process 'required_classes': if it's a string, split into a list.
         if "required_classes" in doc and isinstance(doc["required_classes"], str):
@@ -147,13 +181,13 @@ def get_major_requirements_by_name(major_name, uri="mongodb://localhost:27017/",
                         raw_items = [item.strip() for item in value.split(';') if item.strip()]
                         for item in raw_items:
                             if "*" in item:
-                                electives = process_elective_item(item, db)
+                                electives = process_elective_item(item, db, number_index)
                                 for elc in electives:
                                     processed_items.append(elc)
                             else: processed_items.append(item)
                     else:
                         if "*" in value:
-                                electives = process_elective_item(value, db)
+                                electives = process_elective_item(value, db, number_index)
                                 for elc in electives:
                                     processed_items.append(elc)
                         else: processed_items.append(value)
@@ -168,26 +202,103 @@ def get_major_requirements_by_name(major_name, uri="mongodb://localhost:27017/",
         # Remove individual elective keys.
 
         
-        client.close()
         return MajorRequirement.from_dict(doc)
     else:
-        client.close()
         return None
+
+
+def normalize_major_name(major_name):
+    """
+    Case- and whitespace-insensitive form of a major name, used as the cache key.
+    """
+    return " ".join(str(major_name).split()).casefold() if major_name else ""
+
+
+def compile_major_requirements(uri=None, db_name=None):
+    """
+    Compiles every Major_Req document of the catalog.
+
+    :return: Mapping: normalized major name -> MajorRequirement.
+    """
+    db = get_mongo_db(uri, db_name)
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        docs = [snapshot.get_major_req_doc(major_name) for major_name in snapshot.major_reqs]
+    else:
+        docs = list(db["Major_Req"].find())
+    number_index = get_course_number_index(uri, db_name)
+    compiled = {}
+    for doc in docs:
+        key = normalize_major_name(doc.get("major_name"))
+        if key and key not in compiled:
+            compiled[key] = compile_major_requirement(doc, db, number_index)
+    return compiled
+
+
+def get_major_requirement_cache(uri=None, db_name=None):
+    """
+    Returns the compiled requirements of every major (normalized name -> MajorRequirement)
+    for the catalog being served, compiling them on first use and again whenever the
+    catalog snapshot is reloaded or the version stamp changes.
+
+    :return: The mapping, or None when the catalog can not be versioned (no snapshot and
+             no version stamp), in which case nothing is cached.
+    """
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME)
+    snapshot = get_catalog_snapshot(uri, db_name)
+    source = snapshot if snapshot is not None else get_catalog_version(get_mongo_db(uri, db_name))
+    if source is None:
+        return None
+    cached = _major_requirements.get(key)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+    with _major_requirements_lock:
+        cached = _major_requirements.get(key)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        compiled = compile_major_requirements(uri, db_name)
+        _major_requirements[key] = (source, compiled)
+        return compiled
+
+
+def invalidate_major_requirements(uri=None, db_name=None):
+    """
+    Drops the compiled requirements so the next lookup compiles them again (e.g., after
+    editing Major_Req without bumping the catalog version).
+    """
+    with _major_requirements_lock:
+        _major_requirements.pop((uri or MONGO_URI, db_name or MONGO_DB_NAME), None)
+
+
+def list_major_requirements(uri=None, db_name=None):
+    """
+    Returns the MajorRequirement of every major, sorted by major name.
+    """
+    compiled = get_major_requirement_cache(uri, db_name)
+    if compiled is None:
+        compiled = compile_major_requirements(uri, db_name)
+    return sorted(compiled.values(), key=lambda major_req: str(major_req.major_name))
     
     
-def process_elective_item(item, db):
+def process_elective_item(item, db, number_index=None):
     """
     Process a single elective item.
     - If it matches a pattern like SUBJECT+NUMBER+asterisk (e.g., CS200*),
       it returns a list of all matching course IDs (numeric part >= threshold).
     - If it contains " or ", it splits into alternatives.
     - Otherwise, returns the item unchanged.
+
+    :param number_index: Optional CourseNumberIndex; wildcards are then expanded from it
+                         instead of a regex query over the Class collection.
     """
     pattern = re.compile(r'^([A-Z]+)(\d+)\*$', re.IGNORECASE)
     match_pattern = pattern.match(item)
     if match_pattern:
         subject_code = match_pattern.group(1).upper()
         threshold = int(match_pattern.group(2))
+        if number_index is not None:
+            matching = list(number_index.expand(subject_code, threshold))
+            return matching if matching else item
         classes_collection = db["Class"]
         # Build a regex to match the subject code followed by digits.
         regex = re.compile(r'^' + re.escape(subject_code) + r'(\d+)$', re.IGNORECASE)
@@ -0,0 +1,221 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from array import array
+from collections import OrderedDict
+
+# Closures memoized per prerequisite graph: requests for the same major use the same
+# class set, so its closure is computed once per catalog version.
+PREREQ_CLOSURE_CACHE_SIZE = int(os.getenv("PREREQ_CLOSURE_CACHE_SIZE", "512"))
+
+
+def parse_prereq_groups(prereqs):
+    """
+    Parses a prerequisites value (a string or a list of strings) into AND-of-OR groups.
+    ";" separates groups that are all required, " or " separates alternatives.
+
+    E.g., "MATH111 or MATH115; MATH112" becomes [["MATH111", "MATH115"], ["MATH112"]]
+    """
+    if not prereqs:
+        return []
+    if isinstance(prereqs, str):
+        prereqs = [prereqs]
+    groups = []
+    for prereq_str in prereqs:
+        for group in prereq_str.split(';'):
+            group = group.strip()
+            if group:
+                if " or " in group:
+                    groups.append([p.strip() for p in group.split(" or ") if p.strip()])
+                else:
+                    groups.append([group])
+    return groups
+
+
+def iter_bits(mask):
+    """
+    Yields the index of every set bit in mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PrereqGraph:
+    def __init__(self, prereqs_by_class):
+        """
+        Prerequisite graph of the whole catalog, parsed once.
+
+        Every course (and every course only mentioned as a prerequisite) gets an integer
+        index. Prerequisites are stored as AND-of-OR groups in flat integer arrays:
+        the groups of course i are group_start[course_start[i]:course_start[i + 1]],
+        and the members of group g are members[group_start[g]:group_start[g + 1]].
+
+        direct[i] is a bitset (Python int) of the direct prerequisites of course i. The
+        transitive ones depend on which classes a request uses, so they are computed per
+        class set (see transitive_masks) and memoized on the graph, keyed by that set.
+
+        :param prereqs_by_class: Mapping: class_id -> raw prerequisites (string or list of strings).
+        """
+        self.class_ids = []  # Mapping: index -> class_id
+        self.index = {}      # Mapping: class_id -> index
+        self.raw_prereqs = {}
+
+        parsed = {}
+        for class_id, prereqs in prereqs_by_class.items():
+            self._add_node(class_id)
+            self.raw_prereqs[class_id] = prereqs
+            parsed[class_id] = parse_prereq_groups(prereqs)
+        for groups in parsed.values():
+            for group in groups:
+                for member in group:
+                    self._add_node(member)
+
+        n = len(self.class_ids)
+        self.course_start = array('i', [0])
+        self.group_start = array('i', [0])
+        self.members = array('i')
+        self.direct = [0] * n
+        for i, class_id in enumerate(self.class_ids):
+            for group in parsed.get(class_id, []):
+                for member in group:
+                    j = self.index[member]
+                    self.members.append(j)
+                    self.direct[i] |= 1 << j
+                self.group_start.append(len(self.members))
+            self.course_start.append(len(self.group_start) - 1)
+
+        self._closures = OrderedDict()  # Mapping: frozenset of indexes -> closure masks
+        self._closures_lock = threading.Lock()
+
+        self.topo_order = self._topological_order()
+        self.topo_position = array('i', [0] * n)
+        for position, i in enumerate(self.topo_order):
+            self.topo_position[i] = position
+
+    def _add_node(self, class_id):
+        if class_id not in self.index:
+            self.index[class_id] = len(self.class_ids)
+            self.class_ids.append(class_id)
+
+    def _topological_order(self):
+        """
+        Orders courses so prerequisites come first. Courses on a prerequisite cycle
+        (bad data) are appended at the end.
+        """
+        n = len(self.class_ids)
+        dependents = [[] for _ in range(n)]
+        remaining = [0] * n
+        for i in range(n):
+            for j in iter_bits(self.direct[i]):
+                dependents[j].append(i)
+                remaining[i] += 1
+        order = [i for i in range(n) if remaining[i] == 0]
+        head = 0
+        while head < len(order):
+            j = order[head]
+            head += 1
+            for i in dependents[j]:
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    order.append(i)
+        if len(order) < n:
+            placed = set(order)
+            order.extend(i for i in range(n) if i not in placed)
+        return array('i', order)
+
+    def _transitive_closure(self, direct, nodes):
+        """
+        Computes transitive prerequisites of the nodes as bitsets, visiting them in
+        topological order so each closure is final after one pass (cycles are iterated
+        to a fixpoint).
+        """
+        closure = dict.fromkeys(nodes, 0)
+        order = sorted(nodes, key=self.topo_position.__getitem__)
+        changed = True
+        while changed:
+            changed = False
+            for i in order:
+                mask = direct[i]
+                for j in iter_bits(direct[i]):
+                    mask |= closure[j]
+                if mask != closure[i]:
+                    closure[i] = mask
+                    changed = True
+        return closure
+
+    def covers(self, classes):
+        """
+        True if every class object is in the graph with the same prerequisites it was built from.
+        """
+        for cls in classes:
+            if self.raw_prereqs.get(cls.class_id, None) != getattr(cls, "prereqs", None):
+                return False
+        return True
+
+    def get_groups(self, class_id):
+        """
+        Returns the AND-of-OR prerequisite groups of a course as lists of class IDs.
+        """
+        i = self.index.get(class_id)
+        if i is None:
+            return []
+        groups = []
+        for g in range(self.course_start[i], self.course_start[i + 1]):
+            groups.append([self.class_ids[j] for j in self.members[self.group_start[g]:self.group_start[g + 1]]])
+        return groups
+
+    def transitive_masks(self, class_ids):
+        """
+        Transitive prerequisites restricted to the given set of classes, as bitsets over
+        catalog indexes. Only edges between classes of the set are followed, exactly
+        like the per-request DFS the schedulers used to run. The closure of a class set
+        is computed on its first request and then served from memory (the last
+        PREREQ_CLOSURE_CACHE_SIZE sets are kept).
+
+        :return: Mapping: index -> bitset of the prerequisites of that class within the set.
+        """
+        nodes = frozenset(self.index[class_id] for class_id in class_ids)
+        with self._closures_lock:
+            closure = self._closures.get(nodes)
+            if closure is not None:
+                self._closures.move_to_end(nodes)
+                return dict(closure)
+        selected = 0
+        for i in nodes:
+            selected |= 1 << i
+        direct = {i: self.direct[i] & selected for i in nodes}
+        closure = self._transitive_closure(direct, nodes)
+        with self._closures_lock:
+            self._closures[nodes] = closure
+            while len(self._closures) > PREREQ_CLOSURE_CACHE_SIZE:
+                self._closures.popitem(last=False)
+        return dict(closure)
+
+    def transitive_prereqs(self, class_ids):
+        """
+        Same as transitive_masks, decoded to the class_id -> set of class IDs shape the
+        schedulers use.
+        """
+        masks = self.transitive_masks(class_ids)
+        return {
+            self.class_ids[i]: {self.class_ids[j] for j in iter_bits(mask)}
+            for i, mask in masks.items()
+        }
+
+    def __repr__(self):
+        return f"PrereqGraph(courses={len(self.class_ids)}, groups={len(self.group_start) - 1}, edges={len(self.members)})"
+
+
+def build_prereq_graph(class_docs):
+    """
+    Builds the prerequisite graph from Class documents (first document per class wins).
+    """
+    prereqs_by_class = {}
+    for doc in class_docs:
+        class_id = doc.get("class_id")
+        if class_id is not None and class_id not in prereqs_by_class:
+            prereqs_by_class[class_id] = doc.get("prereqs") or []
+    return PrereqGraph(prereqs_by_class)
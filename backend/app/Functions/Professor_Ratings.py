@@ -0,0 +1,83 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import unicodedata
+from mongo_database import get_mongo_db
+from Functions.Catalog_Snapshot import get_catalog_snapshot
+
+# Rating used for instructors that are not on RateMyProfessor.
+RMP_DEFAULT_RATING = float(os.getenv("RMP_DEFAULT_RATING", "2.5"))
+
+
+def normalize_professor_name(name):
+    """
+    Normalizes an instructor name for matching against rmp_ratings, so that
+    "Megan F. Cole", "megan cole" and "Megan  Cole" are the same professor: accents and
+    punctuation are dropped, case is folded and middle initials are removed.
+    """
+    if not name:
+        return ""
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    tokens = re.sub(r"[^\w\s]", " ", name.casefold()).split()
+    return " ".join(token for token in tokens if len(token) > 1)
+
+
+class ProfessorRatingIndex:
+    def __init__(self, docs):
+        """
+        Ratings of every professor in rmp_ratings, looked up by exact or normalized name.
+
+        :param docs: Documents of the "rmp_ratings" collection ({"name", "rating"}).
+        """
+        # Mapping: name -> rating, and normalized name -> rating (first match wins, like find_one)
+        self.by_name = {}
+        self.by_normalized_name = {}
+        for doc in docs:
+            try:
+                rating = float(doc.get("rating"))
+            except (TypeError, ValueError):
+                continue
+            name = doc.get("name")
+            if not name:
+                continue
+            self.by_name.setdefault(name, rating)
+            self.by_normalized_name.setdefault(normalize_professor_name(name), rating)
+
+    def lookup(self, name):
+        """
+        Returns the rating of the instructor, or None if they have none.
+        """
+        if not name:
+            return None
+        rating = self.by_name.get(name)
+        if rating is None:
+            rating = self.by_normalized_name.get(normalize_professor_name(name))
+        return rating
+
+    def get(self, name, default=None):
+        """
+        Returns the rating of the instructor, or default (RMP_DEFAULT_RATING if not given).
+        """
+        rating = self.lookup(name)
+        if rating is not None:
+            return rating
+        return RMP_DEFAULT_RATING if default is None else default
+
+    def __len__(self):
+        return len(self.by_name)
+
+
+def get_professor_rating_index(uri=None, db_name=None):
+    """
+    Returns the rating index of the database: the catalog snapshot's (built once per
+    snapshot), or one loaded with a single query when snapshots are disabled.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.professor_ratings
+    return ProfessorRatingIndex(get_mongo_db(uri, db_name)["rmp_ratings"].find({}, {"name": 1, "rating": 1}))
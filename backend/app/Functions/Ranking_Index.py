@@ -0,0 +1,328 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import threading
+import time
+import uuid
+import numpy as np
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Functions.Catalog_Snapshot import get_catalog_version, CATALOG_RELOAD_INTERVAL, CATALOG_VERSION_COLLECTION
+
+# Day order of the meeting-day columns (the days parse_course_time returns)
+TIME_DAYS = ["M", "T", "W", "Th", "F"]
+
+# get_top_k_courses ranks every document of a course collection. The collection only
+# changes when the catalog is re-imported or re-embedded, so it is loaded once per
+# process and rebuilt when the catalog version, its embeddings version or its document
+# count changes.
+RANKING_RELOAD_INTERVAL = float(os.getenv("RANKING_RELOAD_INTERVAL", str(CATALOG_RELOAD_INTERVAL)))
+# Embedding stamps live next to the catalog stamp, one document per collection
+EMBEDDINGS_VERSION_PREFIX = "embeddings:"
+
+_indexes = {}  # Mapping: (uri, db_name, collection_name) -> RankingIndex
+_indexes_lock = threading.Lock()
+
+
+class RankingIndex:
+    def __init__(self, courses, fingerprint=None):
+        """
+        Course objects of one collection plus column arrays for ranking them. The courses
+        are shared between requests, so callers must not modify them.
+
+        :param courses: List of Course objects (see generate_personalized_schedule.data_loader).
+        :param fingerprint: (catalog version, embeddings version, document count) the index was built at.
+        """
+        self.courses = courses
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+
+        self.course_ids = [course.course_id for course in courses]
+        # Parsed (days, start, end) meeting times, or None
+        self.times = [course.time for course in courses]
+        self.campus = np.array([course.campus for course in courses], dtype=object)
+        self.requirement_designations = [course.requirement_designation or [] for course in courses]
+        self.rmp = np.array([course.professor.rmp_rating if course.professor is not None else 0 for course in courses], dtype=np.float64)
+
+        # Requirement designations as a (course x designation) count matrix
+        self.designations = {}
+        designation_cells = []
+        for i, designations in enumerate(self.requirement_designations):
+            for designation in designations:
+                designation_cells.append((i, self.designations.setdefault(designation, len(self.designations))))
+        self.designation_counts = np.zeros((len(courses), len(self.designations)), dtype=np.int32)
+        for i, j in designation_cells:
+            self.designation_counts[i, j] += 1
+
+        # Prerequisites, split the same way calculate_suitability splits them: a
+        # (course x prerequisite course) matrix of the courses that satisfy one of them, the
+        # number of prerequisites, and the average number of alternatives per prerequisite.
+        self.has_prereqs = np.array([bool(course.prereqs) for course in courses], dtype=bool)
+        self.prereq_count = np.array([len(course.prereqs) if course.prereqs else 0 for course in courses], dtype=np.float64)
+        self.prereq_alternatives = np.array([
+            sum(len(req.split("or")) for req in course.prereqs) / len(course.prereqs) if course.prereqs else 0
+            for course in courses
+        ], dtype=np.float64)
+        self.prereq_courses = {}
+        prereq_cells = []
+        for i, course in enumerate(courses):
+            for course_req in course.prereqs or []:
+                for req in course_req.split("or"):
+                    prereq_cells.append((i, self.prereq_courses.setdefault(req.strip(), len(self.prereq_courses))))
+        self.prereq_matrix = np.zeros((len(courses), len(self.prereq_courses)), dtype=bool)
+        for i, j in prereq_cells:
+            self.prereq_matrix[i, j] = True
+
+        # Meeting times: (course x day) meeting days and the start/end as HHMM numbers
+        self.has_time = np.array([course.time is not None for course in courses], dtype=bool)
+        self.meeting_days = np.zeros((len(courses), len(TIME_DAYS)), dtype=bool)
+        self.start = np.zeros(len(courses), dtype=np.int32)
+        self.end = np.zeros(len(courses), dtype=np.int32)
+        for i, course_time in enumerate(self.times):
+            if course_time is None:
+                continue
+            days, self.start[i], self.end[i] = course_time
+            for day in days:
+                self.meeting_days[i, TIME_DAYS.index(day)] = True
+
+        # Description embeddings as one float32 matrix of unit rows, so cosine similarity
+        # with every course is a single matrix-vector product. Rows of courses without a
+        # usable description vector are zero and has_vector is False for them.
+        vectors = [getattr(course, "desc_vector", None) for course in courses]
+        dimension = next((len(vector) for vector in vectors if vector is not None and len(vector)), 0)
+        self.embeddings = np.zeros((len(courses), dimension), dtype=np.float32)
+        self.has_vector = np.zeros(len(courses), dtype=bool)
+        for i, (course, vector) in enumerate(zip(courses, vectors)):
+            if vector is None or len(vector) != dimension or dimension == 0:
+                continue
+            if course.description == "undef" or "Failed To Retrieve" in course.description:
+                continue
+            self.embeddings[i] = np.asarray(vector, dtype=np.float32)
+            self.has_vector[i] = True
+        norms = np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        np.divide(self.embeddings, norms, out=self.embeddings, where=norms > 0)
+
+        # Undergraduate courses: the first digit of the course ID is below 5
+        self.undergraduate = np.zeros(len(courses), dtype=bool)
+        for i, course_id in enumerate(self.course_ids):
+            digit = next((char for char in course_id or "" if char.isdigit()), None)
+            self.undergraduate[i] = digit is not None and int(digit) < 5
+
+    def time_conflicts(self, times):
+        """
+        Whether each course meets during any of the given busy times (see check_time_conflict).
+
+        :param times: List of parsed (days, start, end) times, or None.
+        :return: Boolean array, one entry per course.
+        """
+        conflict = np.zeros(len(self.courses), dtype=bool)
+        for days, busy_start, busy_end in times or []:
+            columns = [TIME_DAYS.index(day) for day in days if day in TIME_DAYS]
+            if not columns:
+                continue
+            overlaps = (self.start < busy_end) & (busy_start < self.end)
+            conflict |= self.meeting_days[:, columns].any(axis=1) & overlaps
+        return conflict & self.has_time
+
+    def suitability(self, preferences):
+        """
+        Scores every course against the preferences at once. Gives the same numbers as
+        calculate_suitability(course, preferences, return_details=True) for each course.
+
+        :param preferences: A Preferences object.
+        :return: Dict with "suitability_score", "rmp_rating", "ger_score", "prereq_score",
+                 "campus_score" and "time_conflict" arrays (one entry per course); a
+                 component is None when the preferences do not use it.
+        """
+        time_conflict = self.time_conflicts(preferences.times).astype(np.int64)
+
+        if preferences.rmp_rating:
+            rmp_rating = self.rmp.copy()
+            if isinstance(preferences.rmp_rating, str):
+                if preferences.rmp_rating == "high":
+                    rmp_rating /= 5
+                elif preferences.rmp_rating == "low":
+                    rmp_rating = 1 - (rmp_rating / 5)
+            else:
+                # Ratings below the minimum are kept as they are, like calculate_suitability does.
+                # math.exp per distinct rating keeps the results identical to the scalar scorer.
+                above = self.rmp >= preferences.rmp_rating
+                for rating in np.unique(self.rmp[above]):
+                    rmp_rating[above & (self.rmp == rating)] = 1 / (1 + math.exp(-5 * (rating - preferences.rmp_rating)))
+        else:
+            rmp_rating = None
+
+        if preferences.taken:
+            if isinstance(preferences.taken, str):
+                if preferences.taken == "low":
+                    prereq_score = (10 - self.prereq_alternatives) / 10
+                else:
+                    prereq_score = np.zeros(len(self.courses), dtype=np.float64)
+            else:
+                # Every taken course counts once per course it is a prerequisite alternative of.
+                columns = [self.prereq_courses[taken] for taken in preferences.taken if taken in self.prereq_courses]
+                satisfied = self.prereq_matrix[:, columns].sum(axis=1)
+                prereq_score = np.ones(len(self.courses), dtype=np.float64)
+                prereq_score[self.has_prereqs] = satisfied[self.has_prereqs] / self.prereq_count[self.has_prereqs]
+        else:
+            prereq_score = None
+
+        if preferences.campus:
+            campus_score = np.where(self.campus == preferences.campus, 1.0, -10.0)
+        else:
+            campus_score = None
+
+        if preferences.ger:
+            columns = [self.designations[ger] for ger in set(preferences.ger) if ger in self.designations]
+            ger_score = self.designation_counts[:, columns].sum(axis=1) / len(preferences.ger)
+        else:
+            ger_score = None
+
+        # Averaged in the same order as calculate_suitability so the sums match exactly
+        scores = [score for score in (rmp_rating, ger_score, prereq_score, campus_score) if score is not None]
+        if scores:
+            total = np.zeros(len(self.courses), dtype=np.float64)
+            for score in scores:
+                total = total + score
+            suitability_score = total / len(scores)
+        else:
+            suitability_score = np.zeros(len(self.courses), dtype=np.float64)
+        suitability_score = suitability_score - time_conflict
+
+        return {
+            "suitability_score": suitability_score,
+            "rmp_rating": rmp_rating,
+            "ger_score": ger_score,
+            "prereq_score": prereq_score,
+            "campus_score": campus_score,
+            "time_conflict": time_conflict
+        }
+
+    def description_scores(self, preference_vector):
+        """
+        Cosine similarity between the preference embedding and every course description
+        (0 for courses without a description vector).
+
+        :param preference_vector: Embedding of the preference description (array-like).
+        :return: float32 array, one entry per course.
+        """
+        query = np.asarray(preference_vector, dtype=np.float32).reshape(-1)
+        if self.embeddings.shape[1] == 0 or query.shape[0] != self.embeddings.shape[1]:
+            return np.zeros(len(self.courses), dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        return self.embeddings @ query
+
+    def top_k(self, suitability_score, description_score, k, undergraduate_only=True):
+        """
+        Combines suitability and description similarity into the final ranking score, as
+        incorporate_desc_similarity_scores does, and returns the k best courses without
+        sorting the whole catalog. Ties are broken the same way as the two stable sorts of
+        the per-course ranking: by suitability score, then by catalog order.
+
+        :param suitability_score: Array from suitability().
+        :param description_score: Array from description_scores().
+        :param k: Number of courses to return.
+        :param undergraduate_only: Only rank undergraduate courses.
+        :return: (indices of the top k courses best first, array of final scores)
+        """
+        final_score = np.where(
+            self.has_vector,
+            (suitability_score + description_score.astype(np.float64) * 2) / 2,
+            suitability_score / 2
+        )
+        candidates = np.flatnonzero(self.undergraduate) if undergraduate_only else np.arange(len(self.courses))
+        if k <= 0 or len(candidates) == 0:
+            return [], final_score
+        if k < len(candidates):
+            # Keep everything tied with the k-th best score so the tie-break below is exact.
+            kth_best = -np.partition(-final_score[candidates], k - 1)[k - 1]
+            candidates = candidates[final_score[candidates] >= kth_best]
+        order = np.lexsort((candidates, -suitability_score[candidates], -final_score[candidates]))
+        return candidates[order[:k]].tolist(), final_score
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __repr__(self):
+        return f"RankingIndex(courses={len(self.courses)}, vectors={int(self.has_vector.sum())}, fingerprint={self.fingerprint})"
+
+
+def get_embeddings_version(db, collection_name):
+    """
+    Reads the embeddings version stamp of a course collection, or None if it has never been stamped.
+    """
+    doc = db[CATALOG_VERSION_COLLECTION].find_one({"_id": EMBEDDINGS_VERSION_PREFIX + collection_name})
+    return doc.get("version") if doc else None
+
+
+def bump_embeddings_version(collection_name, uri=None, db_name=None):
+    """
+    Stamps the description vectors of a collection with a new version so every API process
+    rebuilds its ranking index. Unlike bump_catalog_version this leaves the catalog snapshot
+    and everything derived from it (cached plans, major requirements) alone.
+
+    :return: The new version stamp.
+    """
+    version = uuid.uuid4().hex
+    db = get_mongo_db(uri, db_name)
+    db[CATALOG_VERSION_COLLECTION].update_one(
+        {"_id": EMBEDDINGS_VERSION_PREFIX + collection_name}, {"$set": {"version": version}}, upsert=True
+    )
+    return version
+
+
+def collection_fingerprint(db, collection_name):
+    """
+    Cheap change marker of a course collection: the catalog and embeddings version stamps
+    and its document count.
+    """
+    return (get_catalog_version(db), get_embeddings_version(db, collection_name),
+            db[collection_name].estimated_document_count())
+
+
+def get_ranking_index(loader, collection_name, uri=None, db_name=None):
+    """
+    Returns the ranking index of the collection, building it on first use. The fingerprint
+    is re-checked at most every RANKING_RELOAD_INTERVAL seconds and the index is rebuilt
+    when it changed; requests already holding the old index keep using it.
+
+    :param loader: Function (uri, db_name, collection_name) -> list of Course objects.
+    :param collection_name: Name of the course collection, e.g. "all_courses".
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    key = (uri or MONGO_URI, db_name or MONGO_DB_NAME, collection_name)
+    index = _indexes.get(key)
+    if index is not None and time.monotonic() - index.checked_at < RANKING_RELOAD_INTERVAL:
+        return index
+
+    # Only one thread checks/rebuilds; everybody else keeps ranking with the old index.
+    if not _indexes_lock.acquire(blocking=index is None):
+        return index
+    try:
+        current = _indexes.get(key)
+        if current is not None and current is not index:
+            return current
+        fingerprint = collection_fingerprint(get_mongo_db(key[0], key[1]), collection_name)
+        if current is not None and current.fingerprint == fingerprint:
+            current.checked_at = time.monotonic()
+            return current
+        new_index = RankingIndex(loader(key[0], key[1], collection_name), fingerprint)
+        _indexes[key] = new_index
+        return new_index
+    finally:
+        _indexes_lock.release()
+
+
+def reload_ranking_index(collection_name=None, uri=None, db_name=None):
+    """
+    Drops the cached index of the collection (or of every collection) so the next ranking
+    request rebuilds it.
+    """
+    with _indexes_lock:
+        if collection_name is None:
+            _indexes.clear()
+        else:
+            _indexes.pop((uri or MONGO_URI, db_name or MONGO_DB_NAME, collection_name), None)
@@ -0,0 +1,159 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from mongo_database import get_mongo_db
+from Functions.Catalog_Snapshot import get_catalog_snapshot, get_catalog_version
+from Functions.Schedule_Solver import SCHEDULE_SOLVER
+
+# Generated degree plans only depend on the request parameters and the catalog, so the
+# same dozen majors are served from memory instead of re-running the solver every hit.
+SCHEDULE_CACHE_SIZE = int(os.getenv("SCHEDULE_CACHE_SIZE", "256"))
+SCHEDULE_CACHE_TTL = float(os.getenv("SCHEDULE_CACHE_TTL", "3600"))
+# Optional shelve file so warm plans survive restarts (only use with a single worker process).
+SCHEDULE_CACHE_PATH = os.getenv("SCHEDULE_CACHE_PATH")
+
+
+class ResultCache:
+    def __init__(self, max_size=SCHEDULE_CACHE_SIZE, ttl=SCHEDULE_CACHE_TTL, path=None):
+        """
+        Thread-safe LRU cache whose entries also expire after ttl seconds.
+
+        :param max_size: Maximum number of entries kept in memory.
+        :param ttl: Seconds an entry stays valid.
+        :param path: Optional shelve file backing the cache; entries are read from it on a
+                     memory miss and written to it on every set.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # Mapping: key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._store = shelve.open(path) if path else None
+        self._in_flight = {}  # Mapping: key -> task computing the value (event loop only)
+
+    @staticmethod
+    def _store_key(key):
+        return repr(key)
+
+    def get(self, key):
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._store is not None:
+                entry = self._store.get(self._store_key(key))
+                if entry is not None:
+                    self._entries[key] = entry
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._evict()
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        entry = (time.time() + self.ttl, value)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self._store is not None:
+                self._store[self._store_key(key)] = entry
+                self._store.sync()
+            self._evict()
+
+    async def get_or_compute(self, key, compute, should_cache=None):
+        """
+        Returns the cached value for key, or awaits compute(), caches and returns its value.
+        Concurrent misses for the same key share one compute (single-flight), so a burst
+        of requests for an uncached plan runs the solver once. Call from the event loop.
+
+        :param compute: Coroutine function with no arguments producing the value.
+        :param should_cache: Optional predicate; values it rejects are returned but not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute, should_cache))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # A cancelled waiter must not cancel the compute the others are waiting for.
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, compute, should_cache):
+        value = await compute()
+        if value is not None and (should_cache is None or should_cache(value)):
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._store is not None:
+                self._store.clear()
+                self._store.sync()
+
+    def close(self):
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "persistent": self._store is not None
+            }
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        if self._store is not None:
+            self._store.pop(self._store_key(key), None)
+
+    def _evict(self):
+        # Only the in-memory copy is evicted; the shelve keeps entries until they expire.
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def current_catalog_version(uri=None, db_name=None):
+    """
+    Returns the version stamp of the catalog currently being served.
+    """
+    snapshot = get_catalog_snapshot(uri, db_name)
+    if snapshot is not None:
+        return snapshot.version
+    return get_catalog_version(get_mongo_db(uri, db_name))
+
+
+def schedule_cache_key(kind, major_name, startingSem, startingYear, uri=None, db_name=None):
+    """
+    Cache key of a generated plan: the route kind, its parameters, the solver and the
+    catalog version, so plans computed against an older catalog (or by the other solver)
+    are never served.
+    """
+    return (kind, major_name, startingSem, startingYear, SCHEDULE_SOLVER, current_catalog_version(uri, db_name))
+
+
+# Shared by every schedule route.
+schedule_cache = ResultCache(SCHEDULE_CACHE_SIZE, SCHEDULE_CACHE_TTL, SCHEDULE_CACHE_PATH)
@@ -0,0 +1,316 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from array import array
+from Functions.Prereq_Graph import iter_bits
+
+# Default search budget for the API routes, so one pathological major cannot hold a worker.
+SCHEDULE_MAX_NODES = int(os.getenv("SCHEDULE_MAX_NODES", "200000"))
+SCHEDULE_TIME_LIMIT_MS = int(os.getenv("SCHEDULE_TIME_LIMIT_MS", "5000"))
+# Solver of the plan routes: "backtrack" (the plans the routes have always returned) or
+# "propagation" (opt-in; finds a schedule faster on hard majors, but may pick a different one).
+SCHEDULE_SOLVER = os.getenv("SCHEDULE_SOLVER", "backtrack")
+
+
+def allowed_semester_mask(cls, num_semesters, startingSemester="Fall"):
+    """
+    Returns the semesters (1-indexed) a class may be taken in as a bitset: bit s is set
+    if the class is offered in semester s, based on whether it is offered only in the
+    fall or only in the spring.
+    """
+    startsFall = startingSemester == "Fall"
+    mask = 0
+    for sem in range(1, num_semesters + 1):
+        isFall = startsFall if sem % 2 == 1 else not startsFall
+        if cls.recurring == "fall" and not isFall:
+            continue
+        if cls.recurring == "spring" and isFall:
+            continue
+        mask |= 1 << sem
+    return mask
+
+
+class ScheduleState:
+    def __init__(self, sorted_classes, transitive_prereqs, num_semesters, startingSemester="Fall"):
+        """
+        Search state of the semester schedulers, kept in flat arrays and bitsets.
+
+        Classes are numbered by their position in sorted_classes. prereq_mask[i] is the
+        bitset of the classes that must come before class i, allowed[i] the bitset of
+        semesters class i is offered in, and before[s] the bitset of the classes already
+        placed in a semester earlier than s, so a prerequisite check is a single AND.
+
+        :param sorted_classes: Class objects to schedule.
+        :param transitive_prereqs: Mapping: class_id -> set of transitive prerequisite class IDs.
+        :param num_semesters: Number of semesters to fill.
+        :param startingSemester: "Fall" or "Spring", the season of semester 1.
+        """
+        self.classes = list(sorted_classes)
+        self.class_ids = [cls.class_id for cls in self.classes]
+        self.index = {cid: i for i, cid in enumerate(self.class_ids)}
+        self.num_semesters = num_semesters
+
+        n = len(self.classes)
+        self.credits = array('h', [int(cls.credit_hours or 0) for cls in self.classes])
+        self.allowed = [allowed_semester_mask(cls, num_semesters, startingSemester) for cls in self.classes]
+        self.prereq_mask = [0] * n
+        for i, cid in enumerate(self.class_ids):
+            for pre in transitive_prereqs.get(cid, ()):
+                j = self.index.get(pre)
+                if j is not None and j != i:
+                    self.prereq_mask[i] |= 1 << j
+
+        self.semester_of = array('b', [0] * n)          # 0 while unplaced
+        self.semester_credits = array('h', [0] * (num_semesters + 1))
+        self.before = [0] * (num_semesters + 2)
+        self.placed = 0
+
+    def prerequisites_satisfied(self, i, sem):
+        return self.prereq_mask[i] & ~self.before[sem] == 0
+
+    def place(self, i, sem):
+        bit = 1 << i
+        self.semester_of[i] = sem
+        self.semester_credits[sem] += self.credits[i]
+        self.placed |= bit
+        for later in range(sem + 1, self.num_semesters + 2):
+            self.before[later] |= bit
+
+    def unplace(self, i):
+        bit = 1 << i
+        sem = self.semester_of[i]
+        self.semester_of[i] = 0
+        self.semester_credits[sem] -= self.credits[i]
+        self.placed ^= bit
+        for later in range(sem + 1, self.num_semesters + 2):
+            self.before[later] ^= bit
+
+    def meets_min_credits(self, min_credits):
+        return all(self.semester_credits[sem] >= min_credits for sem in range(1, self.num_semesters + 1))
+
+    def assignment(self):
+        """
+        Mapping: class_id -> semester (1-indexed) of every placed class.
+        """
+        return {self.class_ids[i]: self.semester_of[i] for i in iter_bits(self.placed)}
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class SearchBudget:
+    def __init__(self, max_nodes=None, time_limit_ms=None):
+        """
+        Node/time budget of one schedule search, plus its stats and the best partial
+        assignment seen so far (the one with the most classes placed).
+
+        :param max_nodes: Maximum number of search nodes to expand (None for no limit).
+        :param time_limit_ms: Maximum search time in milliseconds (None for no limit).
+        """
+        self.max_nodes = max_nodes
+        self.time_limit_ms = time_limit_ms
+        self.nodes = 0
+        self.backtracks = 0
+        self.exhausted = False
+        self.started = time.monotonic()
+        self.best = {}  # Mapping: class_id -> semester (1-indexed)
+        self.best_count = 0
+
+    def elapsed_ms(self):
+        return (time.monotonic() - self.started) * 1000
+
+    def expand(self, state):
+        """
+        Counts one search node and remembers the state if it is the best so far.
+        Raises BudgetExhausted once the node or time limit is hit.
+        """
+        self.nodes += 1
+        placed_count = bin(state.placed).count("1")
+        if placed_count > self.best_count:
+            self.best_count = placed_count
+            self.best = state.assignment()
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.exhausted = True
+        elif self.time_limit_ms is not None and self.elapsed_ms() > self.time_limit_ms:
+            self.exhausted = True
+        if self.exhausted:
+            raise BudgetExhausted()
+
+    def stats(self):
+        return {
+            "nodes": self.nodes,
+            "backtracks": self.backtracks,
+            "elapsed_ms": round(self.elapsed_ms(), 1),
+            "budget_exhausted": self.exhausted
+        }
+
+
+def backtrack_assignment(sorted_classes, transitive_prereqs, num_semesters, min_credits, max_credits,
+                         startingSemester="Fall", budget=None):
+    """
+    Assigns every class a semester by plain backtracking: classes are placed in the given
+    order, each in the earliest semester it is offered in, has its prerequisites done
+    and still has room for its credits.
+
+    :param sorted_classes: Class objects to schedule, in the order they are placed.
+    :param transitive_prereqs: Mapping: class_id -> set of transitive prerequisite class IDs.
+    :param budget: Optional SearchBudget; the search gives up once it is exhausted.
+    :return: Mapping: class_id -> semester (1-indexed), or None if no schedule exists
+             (or none was found within the budget).
+    """
+    budget = budget or SearchBudget()
+    state = ScheduleState(sorted_classes, transitive_prereqs, num_semesters, startingSemester)
+    credits = state.credits
+    allowed = state.allowed
+    semester_credits = state.semester_credits
+    n = len(state.classes)
+
+    def backtrack(i):
+        budget.expand(state)
+        if i == n:
+            return state.meets_min_credits(min_credits)
+        for sem in iter_bits(allowed[i]):
+            if not state.prerequisites_satisfied(i, sem):
+                continue
+            if semester_credits[sem] + credits[i] > max_credits:
+                continue
+            state.place(i, sem)
+            if backtrack(i + 1):
+                return True
+            state.unplace(i)
+            budget.backtracks += 1
+        return False
+
+    try:
+        if not backtrack(0):
+            return None
+    except BudgetExhausted:
+        return None
+    return state.assignment()
+
+
+def propagation_assignment(sorted_classes, transitive_prereqs, num_semesters, min_credits, max_credits,
+                           startingSemester="Fall", budget=None):
+    """
+    Assigns every class a semester with a constraint-propagation search instead of plain
+    backtracking. Each class keeps a domain of semesters it can still take (a bitset):
+      - Domains start from the fall/spring offering and the earliest/latest semester
+        allowed by the prerequisite chain below and above the class.
+      - Assigning a class removes semesters from the domains of its prerequisites
+        (must be earlier) and dependents (must be later), and from classes that no
+        longer fit in that semester's credits (forward checking).
+      - A branch is pruned as soon as the credits still unplaced cannot reach
+        min_credits in every semester.
+    The most constrained class (smallest domain) is assigned next.
+
+    :param sorted_classes: Class objects to schedule (ties are broken in this order).
+    :param transitive_prereqs: Mapping: class_id -> set of transitive prerequisite class IDs.
+    :param budget: Optional SearchBudget; the search gives up once it is exhausted.
+    :return: Mapping: class_id -> semester (1-indexed), or None if no schedule exists
+             (or none was found within the budget).
+    """
+    budget = budget or SearchBudget()
+    state = ScheduleState(sorted_classes, transitive_prereqs, num_semesters, startingSemester)
+    n = len(state.classes)
+    credits = state.credits
+    semester_credits = state.semester_credits
+    prereq_mask = state.prereq_mask
+
+    dependent_mask = [0] * n
+    for i in range(n):
+        for j in iter_bits(prereq_mask[i]):
+            dependent_mask[j] |= 1 << i
+    dependent_count = [bin(mask).count("1") for mask in dependent_mask]
+
+    # Earliest semester from the longest prerequisite chain below each class.
+    earliest = [1] * n
+    for i in sorted(range(n), key=lambda c: bin(prereq_mask[c]).count("1")):
+        earliest[i] = 1 + max((earliest[p] for p in iter_bits(prereq_mask[i])), default=0)
+    # Latest semester from the longest chain of dependents above each class.
+    latest = [num_semesters] * n
+    for i in sorted(range(n), key=lambda c: -bin(prereq_mask[c]).count("1")):
+        latest[i] = min((latest[d] for d in iter_bits(dependent_mask[i])), default=num_semesters + 1) - 1
+
+    domains = [0] * n
+    for i in range(n):
+        window = (1 << (latest[i] + 1)) - (1 << earliest[i]) if earliest[i] <= latest[i] else 0
+        domains[i] = state.allowed[i] & window if credits[i] <= max_credits else 0
+        if not domains[i]:
+            return None
+
+    all_classes = (1 << n) - 1
+    unplaced_credits = sum(credits)
+
+    def credits_reachable():
+        # Every semester still below min_credits must be fillable by classes that can go there.
+        needed = 0
+        unplaced = all_classes & ~state.placed
+        for sem in range(1, num_semesters + 1):
+            deficit = min_credits - semester_credits[sem]
+            if deficit <= 0:
+                continue
+            needed += deficit
+            fillable = sum(credits[i] for i in iter_bits(unplaced) if domains[i] >> sem & 1)
+            if fillable < deficit:
+                return False
+        return needed <= unplaced_credits
+
+    def prune(trail, i, keep):
+        # Narrow a domain to the semesters in keep, recording the old one; False if it became empty.
+        narrowed = domains[i] & keep
+        if narrowed != domains[i]:
+            trail.append((i, domains[i]))
+            domains[i] = narrowed
+        return narrowed != 0
+
+    def search():
+        nonlocal unplaced_credits
+        budget.expand(state)
+        unplaced = all_classes & ~state.placed
+        if not unplaced:
+            return state.meets_min_credits(min_credits)
+
+        # Most constrained first, then the class most others depend on.
+        i = min(iter_bits(unplaced), key=lambda c: (bin(domains[c]).count("1"), -dependent_count[c], c))
+        for sem in iter_bits(domains[i]):
+            if semester_credits[sem] + credits[i] > max_credits:
+                continue
+            state.place(i, sem)
+            unplaced_credits -= credits[i]
+            unplaced = all_classes & ~state.placed
+            sem_bit = 1 << sem
+            trail = []
+            consistent = True
+            for pre in iter_bits(prereq_mask[i] & unplaced):
+                if not prune(trail, pre, sem_bit - 1):
+                    consistent = False
+                    break
+            if consistent:
+                for dep in iter_bits(dependent_mask[i] & unplaced):
+                    if not prune(trail, dep, ~((sem_bit << 1) - 1)):
+                        consistent = False
+                        break
+            if consistent:
+                room = max_credits - semester_credits[sem]
+                for other in iter_bits(unplaced):
+                    if credits[other] > room and domains[other] & sem_bit:
+                        if not prune(trail, other, ~sem_bit):
+                            consistent = False
+                            break
+            if consistent and credits_reachable() and search():
+                return True
+            for changed, old_domain in reversed(trail):
+                domains[changed] = old_domain
+            state.unplace(i)
+            unplaced_credits += credits[i]
+            budget.backtracks += 1
+        return False
+
+    try:
+        if not credits_reachable() or not search():
+            return None
+    except BudgetExhausted:
+        return None
+    return state.assignment()
@@ -0,0 +1,86 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Functions.Generate_Semester_Schedule_byMajor import generate_full_schedule, convert_schedule_to_obj, add_GER_course, generate_future_schedule, Generate_Schedule_withTime
+from Functions.Schedule_Solver import SCHEDULE_MAX_NODES, SCHEDULE_TIME_LIMIT_MS, SCHEDULE_SOLVER
+
+# Entry points of the schedule routes. They only take and return plain data (str, int,
+# list, dict) so they can run in a solver worker process and be sent back to the API.
+
+
+def build_plan(major_name, startingSem, startingYear, with_GER):
+    """
+    Generates the degree plan returned by the schedule routes: the list of semester dicts,
+    or the best partial plan with the unplaced classes and solver stats. None if the major
+    is unknown.
+    """
+    result = generate_full_schedule(major_name=major_name, num_semesters=8, min_credits=0, max_credits=18, startingSemester=startingSem, solver=SCHEDULE_SOLVER,
+                                    max_nodes=SCHEDULE_MAX_NODES, time_limit_ms=SCHEDULE_TIME_LIMIT_MS, return_details=True)
+    if not result:
+        return None
+    semester_schedules = convert_schedule_to_obj(result["schedule"], startYear=startingYear, startsFall= True if startingSem == "Fall" else False)
+    # if there is a schedule
+    if result["complete"]:
+        if with_GER:
+            semester_schedules = add_GER_course(semester_schedules, isBulePlan=False, isEM=True)
+        outputDict = []
+        for sem in semester_schedules:
+            outputDict.append(sem.to_dict())
+        return outputDict
+    # Search ran out of budget or no full schedule exists: return the best partial one.
+    return {
+        "message": "Failed to generate a full schedule.",
+        "partial_schedule": [sem.to_dict() for sem in semester_schedules],
+        "unplaced": result["unplaced"],
+        "stats": result["stats"]
+    }
+
+
+def is_cacheable_plan(plan):
+    # A plan cut short by the time budget might complete on the next try, so it is not cached.
+    return isinstance(plan, list) or not plan["stats"]["budget_exhausted"]
+
+
+def build_user_plan(major_name, startingSem, startingYear):
+    """
+    Generates the plan (with GER courses) saved by /users/create_schedule.
+
+    :return: (solver summary {"complete", "unplaced", "stats"} or None if the major is unknown,
+              list of semester dicts or None if the plan is incomplete)
+    """
+    result = generate_full_schedule(major_name=major_name, num_semesters=8, min_credits=0, max_credits=18, startingSemester=startingSem, solver=SCHEDULE_SOLVER,
+                                    max_nodes=SCHEDULE_MAX_NODES, time_limit_ms=SCHEDULE_TIME_LIMIT_MS, return_details=True)
+    if not result:
+        return None, None
+    summary = {"complete": result["complete"], "unplaced": result["unplaced"], "stats": result["stats"]}
+    if not result["complete"]:
+        return summary, None
+    semester_schedules = convert_schedule_to_obj(result["schedule"], startYear=startingYear, startsFall= True if startingSem == "Fall" else False)
+    GER_schedule = add_GER_course(semester_schedules, isBulePlan=False, isEM=True)
+    outputDict = []
+
+    for sem in GER_schedule:
+        outputDict.append(sem.to_dict())
+    return summary, outputDict
+
+
+def build_detail_schedule(takenClasses, major_name, top_n=1, time_window=None):
+    """
+    Runs Generate_Schedule_withTime and serializes its result.
+
+    :return: {"schedule": the best semester as a dict, "remaining": class IDs left for later,
+              "alternatives": the top_n semesters as dicts}, or None if the major is unknown.
+    """
+    result = Generate_Schedule_withTime(takenClasses=takenClasses, major_name=major_name, top_n=top_n, time_window=time_window)
+    if not result:
+        return None
+    best_schedule, remaining, alternatives = result
+    return {
+        "schedule": best_schedule.to_dict() if best_schedule.classes else None,
+        "remaining": remaining,
+        "alternatives": [schedule.to_dict() for schedule in alternatives]
+    }
+
+
+def build_future_schedule(major_name, num_semesters, takenClasses):
+    return generate_future_schedule(major_name=major_name, num_semesters=num_semesters, takenClasses=takenClasses)
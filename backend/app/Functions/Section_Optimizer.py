@@ -0,0 +1,248 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import heapq
+from itertools import count
+from Functions.Time_Slots import section_time_mask, time_window_mask, slot_count, idle_mask, idle_minutes, SLOT_MINUTES
+from Functions.Professor_Ratings import get_professor_rating_index, RMP_DEFAULT_RATING
+
+DEFAULT_RMP_RATING = RMP_DEFAULT_RATING
+SECTION_SEARCH_MAX_NODES = int(os.getenv("SECTION_SEARCH_MAX_NODES", "200000"))
+# Credits dominate so a fuller schedule always wins; ratings, the preferred time window
+# and gaps between classes decide between schedules with the same credits.
+DEFAULT_SECTION_WEIGHTS = {
+    "credits": 10.0,  # per credit hour
+    "rating": 1.0,    # per RateMyProfessor point of the instructor
+    "window": 2.0,    # penalty per hour of class outside the preferred time window
+    "gap": 0.5        # penalty per hour of idle time between classes on the same day
+}
+
+
+def get_professor_ratings(names, uri=None, db_name=None):
+    """
+    Retrieves the RateMyProfessor rating of many instructors at once.
+
+    :param names: Iterable of instructor names (matched exactly or by normalized name).
+    :return: A dict mapping each instructor that was found to their rating (float).
+    """
+    index = get_professor_rating_index(uri, db_name)
+    ratings = {}
+    for name in dict.fromkeys(names):
+        rating = index.lookup(name)
+        if rating is not None:
+            ratings[name] = rating
+    return ratings
+
+
+def first_fit_sections(sections_by_course, max_credits, is_allowed=None, max_nodes=None, stats=None):
+    """
+    Picks at most one section per course, in the given course and section order, so that
+    no two sections overlap and the credits stay within max_credits. Returns the first
+    combination that reaches exactly max_credits, otherwise the one with the most credits.
+
+    Much cheaper than optimize_sections (it only looks at credits), so it serves the plain
+    next-semester schedule; optimize_sections serves the ranked alternatives.
+
+    :param sections_by_course: Mapping: course_code -> list of Class_Detail sections.
+    :param max_credits: Maximum credit hours of the schedule.
+    :param is_allowed: Optional predicate on a section (e.g., prerequisites are met).
+    :param max_nodes: Optional limit on search nodes; the best schedule found so far is returned.
+    :param stats: Optional dict the number of search nodes is added to (under "nodes").
+    :return: List of sections.
+    """
+    courses = []
+    for sections in sections_by_course.values():
+        options = [(section_time_mask(section), section.credit_hours, section) for section in sections
+                   if (is_allowed is None or is_allowed(section)) and section.credit_hours <= max_credits]
+        if options:
+            courses.append(options)
+
+    best = []
+    best_credits = -1
+    nodes = 0
+    chosen = []
+
+    def search(k, credits, occupied):
+        nonlocal best, best_credits, nodes
+        nodes += 1
+        if credits > best_credits:
+            best, best_credits = list(chosen), credits
+        if credits == max_credits or k == len(courses) or (max_nodes is not None and nodes > max_nodes):
+            return credits == max_credits
+        for mask, credit_hours, section in courses[k]:
+            if credits + credit_hours > max_credits or mask & occupied:
+                continue
+            chosen.append(section)
+            found = search(k + 1, credits + credit_hours, occupied | mask)
+            chosen.pop()
+            if found:
+                return True
+        # Skip this course.
+        return search(k + 1, credits, occupied)
+
+    search(0, 0, 0)
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + nodes
+    return best
+
+
+def optimize_sections(sections_by_course, max_credits, top_n=5, is_allowed=None, ratings=None,
+                      time_window=None, weights=None, max_nodes=None, stats=None):
+    """
+    Picks at most one section per course so that no two sections overlap and the credits
+    stay within max_credits, and returns the top_n best-scoring distinct weekly schedules.
+
+    A schedule's score is the sum of its section scores (credits, instructor rating,
+    penalty for time outside the preferred window) minus a penalty for idle time between
+    classes. Branch and bound, seeded with a greedy schedule: a branch is cut as soon as
+    its partial score plus an upper bound of what the remaining courses can add (see
+    upper_bound) cannot beat the worst of the current top_n.
+
+    :param sections_by_course: Mapping: course_code -> list of Class_Detail sections.
+    :param max_credits: Maximum credit hours of the schedule.
+    :param top_n: Number of schedules to return.
+    :param is_allowed: Optional predicate on a section (e.g., prerequisites are met).
+    :param ratings: Mapping: instructor name -> rating (missing instructors get DEFAULT_RMP_RATING).
+    :param time_window: Optional (earliest, latest) 24-hour HHMM times, e.g. (900, 1700).
+    :param weights: Overrides for DEFAULT_SECTION_WEIGHTS.
+    :param max_nodes: Optional limit on search nodes; the best schedules found so far are returned.
+    :param stats: Optional dict the number of search nodes is added to (under "nodes");
+                  "truncated" is set when max_nodes stopped the search before it proved the result.
+    :return: List of (score, [sections]) pairs, best first.
+    """
+    weights = {**DEFAULT_SECTION_WEIGHTS, **(weights or {})}
+    ratings = ratings or {}
+    window = time_window_mask(*time_window) if time_window else None
+
+    # Score every usable section once; best sections first so good schedules are found early.
+    courses = []
+    for course_code, sections in sections_by_course.items():
+        options = []
+        for section in sections:
+            if is_allowed is not None and not is_allowed(section):
+                continue
+            if section.credit_hours > max_credits:
+                continue
+            mask = section_time_mask(section)
+            score = weights["credits"] * section.credit_hours
+            score += weights["rating"] * ratings.get(section.instructor_name, DEFAULT_RMP_RATING)
+            if window is not None:
+                score -= weights["window"] * slot_count(mask & ~window) * SLOT_MINUTES / 60
+            options.append((score, mask, section.credit_hours, section))
+        if options:
+            # Sections at the same time with the same credits give the same weekly schedule;
+            # only the best-scoring one of them is worth trying.
+            options.sort(key=lambda option: -option[0])
+            seen = set()
+            distinct = []
+            for option in options:
+                if (option[1], option[2]) not in seen:
+                    seen.add((option[1], option[2]))
+                    distinct.append(option)
+            courses.append(distinct)
+    # Most valuable courses per credit first, so strong schedules (and tight cuts) come early.
+    courses.sort(key=lambda options: -options[0][0] / max(options[0][2], 1))
+
+    def upper_bound(k, credits, occupied):
+        # Most the courses from k on can still add: the LP relaxation of picking at most
+        # one fitting section per course within the free credits. Each course is reduced
+        # to the upper hull of its (credits, score) options, starting from its best
+        # zero-credit section (or skipping it), and the hull steps of all courses are
+        # taken in order of score per credit until the credits run out. Idle time between
+        # the classes so far that no fitting section can fill stays idle, so its gap
+        # penalty is certain.
+        room = max_credits - credits
+        total = 0.0
+        steps = []  # (score per credit, credits) of every hull step
+        coverable = 0
+        for options in courses[k:]:
+            base = 0.0
+            best_at = {}  # Mapping: credit hours -> best fitting score
+            for score, mask, credit_hours, _ in options:
+                if credit_hours > room or mask & occupied:
+                    continue
+                coverable |= mask
+                if score <= 0:
+                    continue
+                if credit_hours == 0:
+                    base = max(base, score)
+                elif score > best_at.get(credit_hours, 0.0):
+                    best_at[credit_hours] = score
+            total += base
+            at_credits, at_score = 0, base
+            while True:
+                step = None
+                for credit_hours, score in best_at.items():
+                    if credit_hours > at_credits and score > at_score:
+                        ratio = (score - at_score) / (credit_hours - at_credits)
+                        if step is None or ratio >= step[0]:
+                            step = (ratio, credit_hours, score)
+                if step is None:
+                    break
+                steps.append((step[0], step[1] - at_credits))
+                at_credits, at_score = step[1], step[2]
+        for ratio, credit_hours in sorted(steps, reverse=True):
+            if room <= 0:
+                break
+            total += ratio * min(room, credit_hours)
+            room -= credit_hours
+        return total - weights["gap"] * slot_count(idle_mask(occupied) & ~coverable) * SLOT_MINUTES / 60
+
+    top = []            # min-heap of (score, tiebreak, signature, sections)
+    signatures = {}     # Mapping: weekly schedule signature -> score kept in top
+    tiebreak = count()
+    nodes = 0
+    chosen = []
+
+    def record(score):
+        # Two schedules with the same courses at the same times are the same weekly schedule.
+        signature = frozenset((section.course_code, section.meeting_time) for section in chosen)
+        if signature in signatures:
+            if signatures[signature] >= score:
+                return
+            top[:] = [entry for entry in top if entry[2] != signature]
+            heapq.heapify(top)
+        elif len(top) == top_n:
+            if top[0][0] >= score:
+                return
+            del signatures[heapq.heappop(top)[2]]
+        signatures[signature] = score
+        heapq.heappush(top, (score, next(tiebreak), signature, list(chosen)))
+
+    def search(k, credits, occupied, partial_score):
+        nonlocal nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            return
+        if len(top) == top_n and partial_score + upper_bound(k, credits, occupied) <= top[0][0]:
+            return
+        if k == len(courses):
+            record(partial_score - weights["gap"] * idle_minutes(occupied) / 60)
+            return
+        for score, mask, credit_hours, section in courses[k]:
+            if credits + credit_hours > max_credits or mask & occupied:
+                continue
+            chosen.append(section)
+            search(k + 1, credits + credit_hours, occupied | mask, partial_score + score)
+            chosen.pop()
+        # Skip this course.
+        search(k + 1, credits, occupied, partial_score)
+
+    if top_n > 0:
+        # Seed the incumbent with a greedy first fit (best fitting section of every course
+        # in order), so the bound cuts from the first node on.
+        credits, occupied, partial_score = 0, 0, 0.0
+        for options in courses:
+            for score, mask, credit_hours, section in options:
+                if credits + credit_hours <= max_credits and not mask & occupied:
+                    chosen.append(section)
+                    credits, occupied, partial_score = credits + credit_hours, occupied | mask, partial_score + score
+                    break
+        record(partial_score - weights["gap"] * idle_minutes(occupied) / 60)
+        chosen.clear()
+        search(0, 0, 0, 0.0)
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + nodes
+        # The schedules are only proven the best when the search ran to the end.
+        stats["truncated"] = stats.get("truncated", False) or (max_nodes is not None and nodes > max_nodes)
+    return [(score, sections) for score, _, _, sections in sorted(top, reverse=True)]
@@ -0,0 +1,144 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functools import lru_cache
+
+# Weekly time grid used for section conflict checks: 5 weekdays of 5-minute slots.
+# A meeting time becomes one integer with a bit per occupied slot, so two sections
+# conflict exactly when the AND of their masks is non-zero.
+WEEK_DAYS = ["M", "T", "W", "Th", "F"]
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def convert_to_24_hour(time_str):
+        time_str = time_str.lower().replace(":", "") # 9:00am -> 900am or 2:00pm -> 200pm
+        if "am" in time_str:
+            time_str = time_str.replace("am", "")
+            time_num = int(time_str)
+            if time_num == 1200:  # handle 12:00am as 0
+                return 0
+            return time_num
+        else:
+            time_str = time_str.replace("pm", "")
+            time_num = int(time_str)
+            if time_num < 1200:  # add 12 hours for pm times except 12:XXpm
+                return time_num + 1200
+            return time_num
+
+def parse_course_time(course_time: str) -> tuple[list[str], str, str]:
+    course_time = course_time.split(" ")
+    course_days_str = course_time[0]
+    course_days = []
+    if course_days_str.__contains__("M"):
+        course_days.append("M")
+        course_days_str = course_days_str.replace("M", "")
+    if course_days_str.__contains__("W"):
+        course_days.append("W")
+        course_days_str = course_days_str.replace("W", "")
+    if course_days_str.__contains__("Th"):
+        course_days.append("Th")
+        course_days_str = course_days_str.replace("Th", "")
+    if course_days_str.__contains__("T"):
+        course_days.append("T")
+        course_days_str = course_days_str.replace("T", "")
+    if course_days_str.__contains__("F"):
+        course_days.append("F")
+        course_days_str = course_days_str.replace("F", "")
+    
+    course_hours = course_time[1].split("-")
+    course_start = course_hours[0]
+    if not course_start.__contains__(":"):
+        if course_start.__contains__("am"):
+            course_start = course_start.replace("am", ":00am")
+        else:
+            course_start = course_start.replace("pm", ":00pm")
+    course_end = course_hours[1]
+    if not course_end.__contains__(":"):
+        if course_end.__contains__("am"):
+            course_end = course_end.replace("am", ":00am")
+        else:
+            course_end = course_end.replace("pm", ":00pm")
+
+    course_start = convert_to_24_hour(course_start)
+    course_end = convert_to_24_hour(course_end)
+    return course_days, course_start, course_end
+
+
+def to_minutes(time_num):
+    """
+    Converts a 24-hour HHMM number (e.g., 1315) into minutes after midnight.
+    """
+    return time_num // 100 * 60 + time_num % 100
+
+
+@lru_cache(maxsize=None)
+def meeting_time_mask(meeting_time):
+    """
+    Returns the weekly slot bitmask of a meeting time string such as "TTh 10am-11:15am".
+    Slot s of day d is bit d * SLOTS_PER_DAY + s. Empty or unreadable meeting times
+    (e.g., asynchronous sections) occupy no slots and never conflict.
+    """
+    if not meeting_time:
+        return 0
+    try:
+        days, start, end = parse_course_time(meeting_time)
+    except (IndexError, ValueError):
+        return 0
+    first_slot = to_minutes(start) // SLOT_MINUTES
+    last_slot = -(-to_minutes(end) // SLOT_MINUTES)  # round the end up to a whole slot
+    if last_slot <= first_slot:
+        return 0
+    day_mask = (1 << last_slot) - (1 << first_slot)
+    mask = 0
+    for day in days:
+        mask |= day_mask << (WEEK_DAYS.index(day) * SLOTS_PER_DAY)
+    return mask
+
+
+def section_time_mask(section):
+    """
+    Returns the weekly slot bitmask of a Class_Detail section.
+    """
+    return meeting_time_mask(getattr(section, "meeting_time", None))
+
+
+def time_window_mask(earliest, latest):
+    """
+    Returns the bitmask of every slot between two 24-hour HHMM times (e.g., 900 and 1700)
+    on every weekday.
+    """
+    first_slot = to_minutes(earliest) // SLOT_MINUTES
+    last_slot = -(-to_minutes(latest) // SLOT_MINUTES)
+    if last_slot <= first_slot:
+        return 0
+    day_mask = (1 << last_slot) - (1 << first_slot)
+    mask = 0
+    for day in range(len(WEEK_DAYS)):
+        mask |= day_mask << (day * SLOTS_PER_DAY)
+    return mask
+
+
+def slot_count(mask):
+    return bin(mask).count("1")
+
+
+def idle_mask(mask):
+    """
+    Returns the bitmask of the free slots between the first and last occupied slot of each day.
+    """
+    full_day = (1 << SLOTS_PER_DAY) - 1
+    idle = 0
+    for day in range(len(WEEK_DAYS)):
+        day_bits = (mask >> (day * SLOTS_PER_DAY)) & full_day
+        if day_bits:
+            span = (1 << day_bits.bit_length()) - (day_bits & -day_bits)
+            idle |= (span & ~day_bits) << (day * SLOTS_PER_DAY)
+    return idle
+
+
+def idle_minutes(mask):
+    """
+    Returns the total free time between the first and last occupied slot of each day.
+    """
+    return slot_count(idle_mask(mask)) * SLOT_MINUTES
@@ -5,10 +5,11 @@ Add two functionalities to preference algo - return k classes based on needed cr
 """
 
 import pandas as pd
+import numpy as np
 import random
+import hashlib
 import json
 import math
-from pymongo import MongoClient
 from tqdm import tqdm
 
 import os, sys
@@ -19,71 +20,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"
 from backend.app.Models.Class_Detail_Model import Class_Detail
 from backend.app.Models.Class_Model import Class_Model
 from backend.app.Models.Semester_Schedule_Model import Semester_Schedule
-
-print("Loading model...")
-from sentence_transformers import SentenceTransformer, util
-from torch import Tensor
-from torch.cuda import is_available as cuda_available
-from torch.mps import is_available as mps_available
-device = "cuda" if cuda_available() else "cpu"
-device = "mps" if device == "cpu" and mps_available() else device
-model = SentenceTransformer('all-MiniLM-L6-v2').to(device)
-print("Model loaded on:", device)
+from pymongo import UpdateOne
+from mongo_database import get_mongo_db, MONGO_URI, MONGO_DB_NAME
+from Functions.Time_Slots import convert_to_24_hour, parse_course_time
+# The SentenceTransformer model (and torch) are loaded on first use, not on import
+from Functions.Embedding_Service import embedding_service, vector_to_binary, binary_to_vector, EMBEDDING_BATCH_SIZE
+from Functions.Ranking_Index import get_ranking_index, bump_embeddings_version
+from Functions.Professor_Ratings import get_professor_rating_index, RMP_DEFAULT_RATING
 
 all_requirements = ["First Year Seminar", "Humanities, Arts, Performance", "Humanities and Arts", "Natural Science", "Natural Sciences", "Quantitative Reasoning", "Mathematics and Quantitative Reasoning", "Social Science", "First Year Seminar", "First Year Writing", "Writing", "Continuing Communication", "Intercultural Communication", "Race and Ethnicity", "Experience and Application", "Physical Education", "Health"]
 
-def convert_to_24_hour(time_str):
-        time_str = time_str.lower().replace(":", "") # 9:00am -> 900am or 2:00pm -> 200pm
-        if "am" in time_str:
-            time_str = time_str.replace("am", "")
-            time_num = int(time_str)
-            if time_num == 1200:  # handle 12:00am as 0
-                return 0
-            return time_num
-        else:
-            time_str = time_str.replace("pm", "")
-            time_num = int(time_str)
-            if time_num < 1200:  # add 12 hours for pm times except 12:XXpm
-                return time_num + 1200
-            return time_num
-
-def parse_course_time(course_time: str) -> tuple[list[str], str, str]:
-    course_time = course_time.split(" ")
-    course_days_str = course_time[0]
-    course_days = []
-    if course_days_str.__contains__("M"):
-        course_days.append("M")
-        course_days_str = course_days_str.replace("M", "")
-    if course_days_str.__contains__("W"):
-        course_days.append("W")
-        course_days_str = course_days_str.replace("W", "")
-    if course_days_str.__contains__("Th"):
-        course_days.append("Th")
-        course_days_str = course_days_str.replace("Th", "")
-    if course_days_str.__contains__("T"):
-        course_days.append("T")
-        course_days_str = course_days_str.replace("T", "")
-    if course_days_str.__contains__("F"):
-        course_days.append("F")
-        course_days_str = course_days_str.replace("F", "")
-    
-    course_hours = course_time[1].split("-")
-    course_start = course_hours[0]
-    if not course_start.__contains__(":"):
-        if course_start.__contains__("am"):
-            course_start = course_start.replace("am", ":00am")
-        else:
-            course_start = course_start.replace("pm", ":00pm")
-    course_end = course_hours[1]
-    if not course_end.__contains__(":"):
-        if course_end.__contains__("am"):
-            course_end = course_end.replace("am", ":00am")
-        else:
-            course_end = course_end.replace("pm", ":00pm")
-
-    course_start = convert_to_24_hour(course_start)
-    course_end = convert_to_24_hour(course_end)
-    return course_days, course_start, course_end
 
 class Course:
     def __init__(self, course_id: str, section: int, crn: int, course_name: str, recurring: str, prereqs: list[str], requirement_designation: list[str], campus: str, description: str, professor: 'Professor', time: str = None, desc_vector=None):
@@ -174,11 +120,10 @@ NullCourseError = ValueError("Course object cannot be null.")
 NullPreferenceVectorError = ValueError("Preference vector cannot be null.")
 
 def get_rmp_score(uri: str, db_name: str, collection_name: str, instructor_name: str) -> float:
-    client = MongoClient(uri)
-    db = client[db_name]
+    db = get_mongo_db(uri, db_name)
     collection = db[collection_name]
     result = collection.find_one({"name": instructor_name})
-    return result.get("rating", 2.5) if result else 2.5
+    return result.get("rating", RMP_DEFAULT_RATING) if result else RMP_DEFAULT_RATING
 
 
 def data_loader(uri: str, db_name: str, collection_name: str) -> list[Course]:
@@ -190,11 +135,12 @@ def data_loader(uri: str, db_name: str, collection_name: str) -> list[Course]:
     :param collection_name: Name of the collection to load data from.
     :return: DataFrame containing the data from the specified collection.
     """
-    client = MongoClient(uri)
-    db = client[db_name]
+    db = get_mongo_db(uri, db_name)
     collection = db[collection_name]
 
     courses = list(collection.find())
+    # All professor ratings at once instead of one query per course
+    ratings = get_professor_rating_index(uri, db_name)
     course_objs = []
     for course in tqdm(courses):
         course = dict(course)
@@ -212,7 +158,7 @@ def data_loader(uri: str, db_name: str, collection_name: str) -> list[Course]:
                 course["course_description"] = course["course_title"] + "\n" + course["course_description"]
         rmp_score = 0
         if "instructor_name" in course.keys():
-            rmp_score = get_rmp_score(uri, db_name, "rmp_ratings", course["instructor_name"])
+            rmp_score = ratings.get(course["instructor_name"])
             
         course_obj = Course(
             course_id=course.get("course_code", "Failed To Retrieve"),
@@ -229,7 +175,7 @@ def data_loader(uri: str, db_name: str, collection_name: str) -> list[Course]:
                 email=course.get("instructor_email", "Failed To Retrieve"),
                 rmp_rating=rmp_score
             ),
-            desc_vector=course.get("desc_vector", None),
+            desc_vector=binary_to_vector(course.get("desc_vector", None)),
             time=course.get("time", None)
         )
         course_objs.append(course_obj)
@@ -316,7 +262,7 @@ def calculate_suitability(course: Course, preferences: Preferences, return_detai
         }
     
 
-def incorporate_desc_similarity_scores(score_details: dict, preference_vector: Tensor) -> dict:
+def incorporate_desc_similarity_scores(score_details: dict, preference_vector: "Tensor") -> dict:
     """
     Calculates a new suitability score by incorporating the description similarity score.
     This function takes the current suitability score and combines it with a 
@@ -336,7 +282,7 @@ def incorporate_desc_similarity_scores(score_details: dict, preference_vector: T
         raise NullCourseError
     if preference_vector is None:
         return 0
-    if not hasattr(course, "desc_vector") or not course.desc_vector:
+    if not hasattr(course, "desc_vector") or course.desc_vector is None or len(course.desc_vector) == 0:
         score_details["description_score"] = 0
         score_details["suitability_score"] = score_details["suitability_score"] / 2
         return score_details
@@ -345,10 +291,14 @@ def incorporate_desc_similarity_scores(score_details: dict, preference_vector: T
         score_details["suitability_score"] = score_details["suitability_score"] / 2
         return score_details
     
-    course.desc_vector = Tensor(course.desc_vector).to(device)
+    from sentence_transformers import util
+    from torch import Tensor
+    device = embedding_service.device
+    # Courses can be shared (see Ranking_Index), so the stored vector is left as it is
+    desc_vector = Tensor(course.desc_vector).to(device)
     preference_vector = preference_vector.to(device)
 
-    description_score = util.pytorch_cos_sim(course.desc_vector, preference_vector)
+    description_score = util.pytorch_cos_sim(desc_vector, preference_vector)
     description_score = float(description_score[0][0]) # extract score from tensor
     curr_score = score_details["suitability_score"]
     new_suitability_score = (curr_score + description_score*2) / 2
@@ -357,43 +307,73 @@ def incorporate_desc_similarity_scores(score_details: dict, preference_vector: T
     return score_details
 
 
-def generate_all_desc_vectors(uri: str, db_name: str, collection_name: str):
+def description_text(course: dict) -> str | None:
+    """
+    The text a course's description vector is computed from: title, course code and
+    description. None if the course has no description.
+    """
+    if "course_description" not in course.keys():
+        return None
+    text = course["course_description"]
+    if "course_code" in course.keys():
+        text = course["course_code"] + "\n" + text
+    if "course_title" in course.keys():
+        text = course["course_title"] + "\n" + text
+    return text
+
+
+def description_hash(text: str) -> str:
+    # Changes when the description or the embedding model changes
+    return hashlib.sha1(f"{embedding_service.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def generate_all_desc_vectors(uri: str, db_name: str, collection_name: str, batch_size: int = EMBEDDING_BATCH_SIZE, force: bool = False) -> int:
     """
-    Generates all course description vectors and saves them to the database.
+    Generates the description vectors of every course whose vector is missing or stale
+    and saves them to the database. A course's vector is stale when the hash of its
+    description text (see description_hash) differs from the "desc_hash" stored with it.
+    Descriptions are encoded batch_size at a time and each batch is saved with one
+    bulk_write; vectors are stored as packed float32 (see vector_to_binary).
+
+    :param uri: MongoDB connection URI.
+    :param db_name: Name of the database.
+    :param collection_name: Name of the collection to embed.
+    :param batch_size: Number of descriptions per encode call and bulk write.
+    :param force: Re-embed every course even if its vector is up to date.
+    :return: The number of courses whose vector was (re-)generated.
     """
-    # connect to the database
-    client = MongoClient(uri)
-    db = client[db_name]
+    # use the shared database connection
+    db = get_mongo_db(uri, db_name)
     collection = db[collection_name]
 
-    # load all courses from the database
-    courses = list(collection.find())
+    # only the fields the description text is built from (no vectors)
+    courses = collection.find(
+        {"course_description": {"$exists": True}},
+        {"course_description": 1, "course_code": 1, "course_title": 1, "desc_hash": 1}
+    )
+    pending = []
+    for course in courses:
+        text = description_text(course)
+        text_hash = description_hash(text)
+        if force or course.get("desc_hash") != text_hash:
+            pending.append((course["_id"], text, text_hash))
 
-    # check if desc_vector already exists for 10 random courses
-    random_courses = random.sample(courses, min(10, len(courses)))
-    counter = 0
-    for course in random_courses:
-        if "desc_vector" in course.keys() and "course_description" in course.keys() and course["desc_vector"] is not None:
-            counter += 1
-        elif "course_description" not in course.keys():
-            counter += 1
-        if counter == 10:
-            print("Description vectors already exist for 10 random courses. Skipping generation.")
-            return
-
-    print(f"Generating description vectors for {collection_name}...")
-    # generate description vectors for each course
-    for course in tqdm(courses, desc="Generating description vectors..."):
-        course = dict(course)
-        # add course_id and class_name to class_desc
-        if "course_description" in course.keys():
-            if "course_code" in course.keys():
-                course["course_description"] = course["course_code"] + "\n" + course["course_description"]
-            if "course_title" in course.keys():
-                course["course_description"] = course["course_title"] + "\n" + course["course_description"]
-            # generate and save the description vector
-            desc_vector = model.encode(course["course_description"], convert_to_tensor=True)
-            collection.update_one({"_id": course["_id"]}, {"$set": {"desc_vector": desc_vector.tolist()}})
+    if not pending:
+        print(f"Description vectors of {collection_name} are up to date. Skipping generation.")
+        return 0
+
+    print(f"Generating {len(pending)} description vectors for {collection_name}...")
+    for start in tqdm(range(0, len(pending), batch_size), desc="Generating description vectors..."):
+        batch = pending[start:start + batch_size]
+        vectors = embedding_service.encode([text for _, text, _ in batch], batch_size=batch_size, convert_to_numpy=True)
+        collection.bulk_write([
+            UpdateOne({"_id": course_id}, {"$set": {"desc_vector": vector_to_binary(vector), "desc_hash": text_hash}})
+            for (course_id, _, text_hash), vector in zip(batch, vectors)
+        ], ordered=False)
+
+    # Let every API process rebuild its ranking index with the new vectors
+    bump_embeddings_version(collection_name, uri, db_name)
+    return len(pending)
 
 
 
@@ -435,7 +415,7 @@ def convert_to_Course_obj(course: Class_Detail | Class_Model) -> Course:
             description=description,
             professor=None,
             time=time,
-            desc_vector=model.encode(description, convert_to_tensor=True) if description else None
+            desc_vector=embedding_service.encode(description, convert_to_tensor=True) if description else None
         )
     if isinstance(course, Class_Detail) and hasattr(course, "course_code"):
         course_id = course.course_code
@@ -466,7 +446,7 @@ def convert_to_Course_obj(course: Class_Detail | Class_Model) -> Course:
         description=description,
         professor=professor,
         time=time,
-        desc_vector=model.encode(description, convert_to_tensor=True) if description else None
+        desc_vector=embedding_service.encode(description, convert_to_tensor=True) if description else None
     )
 
 def list_to_Course(data: dict) -> Course:
@@ -538,46 +518,31 @@ def get_top_k_courses(all_schedules: list[dict], preferences: dict, k: int = 5,
             desc = preferences.description + "\n" + desc
     preferences.description = desc
     
-    preference_vector = model.encode(preferences.description, convert_to_tensor=True)
-
-    print("Loading course data...")
-    all_courses = data_loader(uri="mongodb://localhost:27017/", db_name="my_database", collection_name=collection_name)
-    print("Course data loaded.")
-
-    # Calculate suitability scores for all courses
-    score_objs = []
-    for course in all_courses:
-        score_obj = calculate_suitability(course=course, preferences=preferences, return_details=True)
-        score_objs.append(score_obj)
-    
-    # Get top 10 courses
-    score_objs.sort(key=lambda x: x["suitability_score"], reverse=True)
-    top_k = score_objs
-
-    # Update suitability scores with description similarity scores if needed
-    if preference_vector is not None:
-        for i, score_obj in enumerate(top_k):
-            top_k[i] = incorporate_desc_similarity_scores(score_obj, preference_vector)
-        top_k.sort(key=lambda x: x["suitability_score"], reverse=True)
-    # import json
-    # with open("score_objs.json", "w") as json_file:
-    #     json.dump(score_objs, json_file, default=lambda o: o.to_dict() if hasattr(o, "to_dict") else o, indent=4)
-
-    if undergraduate_only:
-        filtered_top_k = []
-        for i, score_obj in enumerate(top_k):
-            for char in score_obj["course"].course_id:
-                if char.isdigit():
-                    break
-            if char.isdigit() and not int(char) >= 5:
-                filtered_top_k.append(score_obj)
-        top_k = filtered_top_k
+    preference_vector = embedding_service.encode(preferences.description)
+
+    # Loaded once and kept in memory; rebuilt only when the collection changes
+    index = get_ranking_index(data_loader, collection_name, uri=MONGO_URI, db_name=MONGO_DB_NAME)
+
+    # Calculate suitability scores for all courses at once (same scores as calculate_suitability)
+    scores = index.suitability(preferences)
+    # Incorporate description similarity scores (one matrix-vector product) and pick the top k
+    description_scores = index.description_scores(preference_vector)
+    top_indices, final_scores = index.top_k(scores["suitability_score"], description_scores, k, undergraduate_only)
+
+    top_k = []
+    for i in top_indices:
+        score_obj = {"course": index.courses[i]}
+        for name, values in scores.items():
+            score_obj[name] = values[i].item() if values is not None else None
+        score_obj["suitability_score"] = final_scores[i].item()
+        score_obj["description_score"] = description_scores[i].item() if index.has_vector[i] else 0
+        top_k.append(score_obj)
 
     return top_k[:k]
 
 def main():
     print("Checking if course description vectors need to be created for all_courses...")
-    generate_all_desc_vectors(uri="mongodb://localhost:27017/", db_name="my_database", collection_name="all_courses")
+    generate_all_desc_vectors(uri=MONGO_URI, db_name=MONGO_DB_NAME, collection_name="all_courses")
 
     # sample schedule from backtracking algorithm
     all_schedules = [{"year":0,"semester":"Fall","classes":[{"class_id":"Math275","class_name":"Honors Linear Algebra","recurring":"fall","credit_hours":4,"prereqs":"AP Calculus BC","requirement_designation":[],"campus":"EM","class_desc":"This course is the first half of the advanced math introductory sequence. It covers the basics of linear algebra: vector spaces, linear transformations, determinants, and eigenvalues, with an emphasis on mathematical rigor. This class is for freshmen who scored a 5 on the Calculus AP BC exam.","timeslot":None},{"class_id":"Math111","class_name":"Calculus I","recurring":"fall/spring","credit_hours":3,"prereqs":[],"requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"Limits, continuity, derivatives, antiderivatives, the definite integral.","timeslot":None}],"total_credit_hours":7},{"year":1,"semester":"Spring","classes":[{"class_id":"Math210","class_name":"Advanced Calculus for Data Sciences","recurring":"fall/spring","credit_hours":4,"prereqs":"Math111 or Math115 or Math119","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"This course is a short treatment of?MATH 112?and?211?with a lab component. It is not appropriate for students who have taken?MATH 211. Topics include: advanced integration, Taylor series; and multivariable differentiation, optimization and integration; and applications to statistics and science.","timeslot":None},{"class_id":"Math112","class_name":"Calculus II","recurring":"fall/spring","credit_hours":3,"prereqs":"Math111 or Math115 or Math119","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"Techniques of integration, exponential and logarithm functions, sequences and series, polar coordinates.","timeslot":None}],"total_credit_hours":7},{"year":1,"semester":"Fall","classes":[{"class_id":"Math211","class_name":"Advanced Calculus (Multivariable)","recurring":"fall/spring","credit_hours":3,"prereqs":"Math112","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"Vectors; multivariable functions; partial derivatives; multiple integrals; vector and scalar fields; Green's and Stokes' theorems; divergence theorem.","timeslot":None},{"class_id":"Math212","class_name":"Differential Equations","recurring":"fall/spring","credit_hours":3,"prereqs":"Math112","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"This is a standard first semester Differential Equations course which covers first and second-order differential equations and systems of differential equations, with an emphasis placed on developing techniques for solving differential equations.","timeslot":None},{"class_id":"Math221","class_name":"Linear Algebra","recurring":"fall/spring","credit_hours":4,"prereqs":"Math111 or Math112","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"Systems of linear equations, matrices, determinants, linear transformations, eigenvalues and eigenvectors, least-squares.","timeslot":None},{"class_id":"Math250","class_name":"Foundations of Mathematics","recurring":"fall/spring","credit_hours":3,"prereqs":"Math111; Math112","requirement_designation":"Quantitative Reasoning","campus":"EM","class_desc":"An introduction to theoretical mathematics. Logic and proofs, operations on sets, induction, relations, functions.","timeslot":None}],"total_credit_hours":13},{"year":2,"semester":"Spring","classes":[],"total_credit_hours":0},{"year":2,"semester":"Fall","classes":[],"total_credit_hours":0},{"year":3,"semester":"Spring","classes":[],"total_credit_hours":0},{"year":3,"semester":"Fall","classes":[],"total_credit_hours":0},{"year":4,"semester":"Spring","classes":[],"total_credit_hours":0}]
@@ -612,7 +577,7 @@ def main():
     exit()
 
     print("Retrieving course data...")
-    courses = data_loader(uri="mongodb://localhost:27017/", db_name="my_database", collection_name="Class")
+    courses = data_loader(uri=MONGO_URI, db_name=MONGO_DB_NAME, collection_name="Class")
     print("Course data retrieved.")
 
     preferences = Preferences(
@@ -624,7 +589,7 @@ def main():
         description="I would like to learn about data structures and algorithms.",
         times = ["TTh 11:30am-12:45pm", "F 1pm-2:15pm", "MW 8:30am-9:45am"]
     )
-    preference_vector = model.encode(preferences.description, convert_to_tensor=True) if preferences.description else None
+    preference_vector = embedding_service.encode(preferences.description, convert_to_tensor=True) if preferences.description else None
     
     # Calculate suitability scores for all courses
     score_objs = []
@@ -0,0 +1,121 @@
+import os, sys
+# Go up 3 levels from this file to get to the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+import random
+import unittest
+import numpy as np
+from backend.app.Functions.generate_personalized_schedule import Course, Professor, Preferences, calculate_suitability
+from backend.app.Functions.Ranking_Index import RankingIndex
+
+SUBJECTS = ["CS", "MATH", "QTM"]
+DESIGNATIONS = ["Quantitative Reasoning", "Writing", "Natural Science", "Social Science"]
+TIMES = ["MW 10:00am-11:15am", "TTh 1:00pm-2:15pm", "MWF 9am-9:50am", "F 2:30pm-3:45pm"]
+
+
+def random_course_id(rng):
+    return f"{rng.choice(SUBJECTS)}{rng.choice([110, 170, 171, 253, 326, 524])}"
+
+
+def random_courses(rng, n):
+    courses = []
+    for _ in range(n):
+        prereqs = rng.choice([
+            [],
+            None,
+            [f"{random_course_id(rng)} or {random_course_id(rng)}"],
+            [random_course_id(rng), f"{random_course_id(rng)} or {random_course_id(rng)} or {random_course_id(rng)}"],
+            # Raw catalog prerequisites are a single string, which both scorers iterate per character
+            f"{random_course_id(rng)} or {random_course_id(rng)}",
+        ])
+        # Missing ratings load as 0; designations may repeat, like "Writing with Writing"
+        rating = rng.choice([0, 0, 2.5, 3.7, 4.0, 5])
+        designations = rng.choice([[], [rng.choice(DESIGNATIONS)], [rng.choice(DESIGNATIONS), rng.choice(DESIGNATIONS)]])
+        courses.append(Course(
+            # Few distinct IDs, so catalog entries share course codes
+            course_id=random_course_id(rng), section=1, crn=0, course_name="Course",
+            recurring="fall/spring", prereqs=prereqs, requirement_designation=designations,
+            campus=rng.choice(["Emory", "Oxford", None]), description="Course description",
+            professor=Professor(name="Instructor", email=None, rmp_rating=rating),
+            time=rng.choice([None] + TIMES)
+        ))
+    return courses
+
+
+def random_preferences(rng):
+    return Preferences(
+        rmp_rating=rng.choice([None, "high", 0, 2.5, 4.0]),
+        ger=rng.choice([[], [rng.choice(DESIGNATIONS)], [rng.choice(DESIGNATIONS) for _ in range(3)]]),
+        taken=rng.choice([None, "high", "low", [], [random_course_id(rng) for _ in range(rng.randint(1, 4))]]),
+        campus=rng.choice([None, "Emory", "Oxford"]),
+        semester=None,
+        description=None,
+        times=rng.choice([None, [], rng.sample(TIMES, 2)])
+    )
+
+
+class TestRankingIndexSuitability(unittest.TestCase):
+
+    def test_matches_calculate_suitability(self):
+        rng = random.Random(17)
+        for _ in range(200):
+            courses = random_courses(rng, rng.randint(1, 30))
+            preferences = random_preferences(rng)
+            scores = RankingIndex(courses).suitability(preferences)
+            for i, course in enumerate(courses):
+                expected = calculate_suitability(course, preferences, return_details=True)
+                for name, values in scores.items():
+                    if expected[name] is None:
+                        self.assertIsNone(values, name)
+                    else:
+                        self.assertEqual(values[i].item(), expected[name], name)
+
+
+
+def sort_based_top_k(index, suitability_score, description_score, k, undergraduate_only=True):
+    # The ranking get_top_k_courses did before RankingIndex.top_k: stable sort by suitability,
+    # add the description similarity, stable sort by the final score, then filter.
+    order = sorted(range(len(index.courses)), key=lambda i: suitability_score[i], reverse=True)
+    final_score = {}
+    for i in order:
+        if index.has_vector[i]:
+            final_score[i] = (suitability_score[i] + float(description_score[i]) * 2) / 2
+        else:
+            final_score[i] = suitability_score[i] / 2
+    order.sort(key=lambda i: final_score[i], reverse=True)
+    if undergraduate_only:
+        filtered = []
+        for i in order:
+            for char in index.courses[i].course_id:
+                if char.isdigit():
+                    break
+            if char.isdigit() and not int(char) >= 5:
+                filtered.append(i)
+        order = filtered
+    return order[:k]
+
+
+class TestRankingIndexTopK(unittest.TestCase):
+
+    def test_matches_sort_based_ranking(self):
+        rng = random.Random(18)
+        # A handful of distinct vectors and scores, so many courses tie
+        vectors = [np.array(vector, dtype=np.float32) for vector in ([1, 0, 0], [0, 1, 0], [1, 1, 0], [-1, 0, 1])]
+        for _ in range(300):
+            courses = random_courses(rng, rng.randint(1, 40))
+            for course in courses:
+                if rng.random() < 0.3:
+                    course.course_id = rng.choice(["CS", "CS524", "MATH"])  # graduate or no number
+                if rng.random() < 0.8:
+                    course.desc_vector = rng.choice(vectors)
+            index = RankingIndex(courses)
+            suitability_score = np.array([rng.choice([-10.0, -1.0, 0.0, 0.25, 0.5, 1.0]) for _ in courses])
+            description_score = index.description_scores(rng.choice(vectors))
+            undergraduate_only = rng.random() < 0.7
+            for k in (0, 1, 3, len(courses), len(courses) + 5):
+                top_indices, _ = index.top_k(suitability_score, description_score, k, undergraduate_only)
+                self.assertEqual(top_indices, sort_based_top_k(index, suitability_score.tolist(), description_score, k, undergraduate_only))
+
+
+if __name__ == "__main__":
+    unittest.main()
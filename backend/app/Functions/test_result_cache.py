@@ -0,0 +1,41 @@
+import os, sys
+# Go up 3 levels from this file to get to the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+import asyncio
+import unittest
+from backend.app.Functions.Result_Cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_concurrent_misses_share_one_compute(self):
+        cache = ResultCache(max_size=4, ttl=60)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"schedule": [["CS170"]]}
+
+        async def burst():
+            return await asyncio.gather(*(cache.get_or_compute("plan", compute) for _ in range(5)))
+
+        results = asyncio.run(burst())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {"schedule": [["CS170"]]} for result in results))
+        self.assertEqual(asyncio.run(cache.get_or_compute("plan", compute)), {"schedule": [["CS170"]]})
+        self.assertEqual(len(calls), 1)
+
+    def test_rejected_values_are_not_cached(self):
+        cache = ResultCache(max_size=4, ttl=60)
+
+        async def compute():
+            return {"schedule": []}
+
+        asyncio.run(cache.get_or_compute("plan", compute, should_cache=lambda value: bool(value["schedule"])))
+        self.assertIsNone(cache.get("plan"))
+
+
+if __name__ == "__main__":
+    unittest.main()
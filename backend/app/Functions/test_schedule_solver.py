@@ -0,0 +1,115 @@
+import os, sys
+# Go up 3 levels from this file to get to the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+import random
+import unittest
+from backend.app.Functions.Schedule_Solver import backtrack_assignment, propagation_assignment, SearchBudget
+from backend.app.Models.Class_Model import Class_Model
+
+
+class TestScheduleSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.classes = [
+            Class_Model(class_id="MATH111", class_name="Calculus I", recurring="fall/spring", credit_hours=3),
+            Class_Model(class_id="PHYS151", class_name="Physics I", recurring="fall", credit_hours=4),
+            Class_Model(class_id="MATH112", class_name="Calculus II", recurring="fall/spring", credit_hours=3),
+            Class_Model(class_id="PHYS152", class_name="Physics II", recurring="spring", credit_hours=4),
+        ]
+        self.transitive_prereqs = {
+            "MATH111": set(),
+            "PHYS151": set(),
+            "MATH112": {"MATH111"},
+            "PHYS152": {"PHYS151"},
+        }
+
+    def test_backtrack_respects_prereqs_and_seasons(self):
+        result = backtrack_assignment(self.classes, self.transitive_prereqs, 4, 0, 18, "Spring")
+        self.assertEqual(result, {"MATH111": 1, "PHYS151": 2, "MATH112": 2, "PHYS152": 3})
+
+    def test_propagation_matches_constraints(self):
+        result = propagation_assignment(self.classes, self.transitive_prereqs, 4, 3, 7, "Fall")
+        self.assertIsNotNone(result)
+        self.assertLess(result["MATH111"], result["MATH112"])
+        self.assertLess(result["PHYS151"], result["PHYS152"])
+        self.assertEqual(result["PHYS151"] % 2, 1)
+        self.assertEqual(result["PHYS152"] % 2, 0)
+
+    def test_infeasible_returns_none(self):
+        # Four semesters of at least 8 credits cannot be filled with 14 credits.
+        self.assertIsNone(backtrack_assignment(self.classes, self.transitive_prereqs, 4, 8, 18, "Fall"))
+        self.assertIsNone(propagation_assignment(self.classes, self.transitive_prereqs, 4, 8, 18, "Fall"))
+
+    def test_budget_keeps_best_partial_assignment(self):
+        budget = SearchBudget(max_nodes=3)
+        result = backtrack_assignment(self.classes, self.transitive_prereqs, 4, 8, 18, "Fall", budget)
+        self.assertIsNone(result)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(budget.best, {"MATH111": 1, "PHYS151": 1, "MATH112": 2})
+        self.assertEqual(budget.stats()["nodes"], 4)
+
+
+class TestSolverEquivalence(unittest.TestCase):
+    """
+    Propagation must find a schedule exactly when backtracking does, and every schedule
+    either returns must meet the same constraints.
+    """
+
+    def random_instance(self, rng):
+        n = rng.randint(3, 7)
+        classes = [
+            Class_Model(class_id=f"C{i}", class_name=f"Class {i}", recurring=rng.choice(["fall/spring", "fall", "spring"]),
+                        credit_hours=rng.choice([1, 3, 4]))
+            for i in range(n)
+        ]
+        transitive_prereqs = {}
+        for i, cls in enumerate(classes):
+            direct = {f"C{j}" for j in range(i) if rng.random() < 0.3}
+            transitive = set(direct)
+            for pre in direct:
+                transitive |= transitive_prereqs[pre]
+            transitive_prereqs[cls.class_id] = transitive
+        num_semesters = rng.randint(2, 5)
+        min_credits = rng.choice([0, 0, 3, 4])
+        max_credits = rng.choice([4, 7, 10])
+        starting_semester = rng.choice(["Fall", "Spring"])
+        return classes, transitive_prereqs, num_semesters, min_credits, max_credits, starting_semester
+
+    def assert_valid(self, result, classes, transitive_prereqs, num_semesters, min_credits, max_credits, starting_semester):
+        self.assertEqual(set(result), {cls.class_id for cls in classes})
+        semester_credits = [0] * (num_semesters + 1)
+        for cls in classes:
+            sem = result[cls.class_id]
+            self.assertTrue(1 <= sem <= num_semesters)
+            is_fall = (sem % 2 == 1) == (starting_semester == "Fall")
+            if cls.recurring == "fall":
+                self.assertTrue(is_fall)
+            if cls.recurring == "spring":
+                self.assertFalse(is_fall)
+            for pre in transitive_prereqs[cls.class_id]:
+                self.assertLess(result[pre], sem)
+            semester_credits[sem] += cls.credit_hours
+        for sem in range(1, num_semesters + 1):
+            self.assertLessEqual(semester_credits[sem], max_credits)
+            self.assertGreaterEqual(semester_credits[sem], min_credits)
+
+    def test_same_feasibility_on_random_instances(self):
+        rng = random.Random(7)
+        feasible = 0
+        for _ in range(300):
+            instance = self.random_instance(rng)
+            backtrack = backtrack_assignment(*instance)
+            propagation = propagation_assignment(*instance)
+            self.assertEqual(backtrack is None, propagation is None, instance)
+            if backtrack is not None:
+                feasible += 1
+                self.assert_valid(backtrack, *instance)
+                self.assert_valid(propagation, *instance)
+        # Both outcomes must actually be exercised.
+        self.assertGreater(feasible, 30)
+        self.assertLess(feasible, 270)
+
+
+if __name__ == '__main__':
+    unittest.main()
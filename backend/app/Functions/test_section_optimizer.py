@@ -0,0 +1,79 @@
+import os, sys
+# Go up 3 levels from this file to get to the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+import random
+import unittest
+from itertools import product
+from types import SimpleNamespace
+from backend.app.Functions.Section_Optimizer import optimize_sections, first_fit_sections, DEFAULT_SECTION_WEIGHTS, DEFAULT_RMP_RATING
+from backend.app.Functions.Time_Slots import section_time_mask, time_window_mask, slot_count, idle_minutes, SLOT_MINUTES
+
+DAYS = ["MW", "TTh", "MWF", "F"]
+TIMES = ["9am-9:50am", "10am-11:15am", "11:30am-12:45pm", "1pm-2:15pm", "2:30pm-3:45pm"]
+
+
+def random_sections(rng):
+    sections_by_course = {}
+    for i in range(rng.randint(3, 7)):
+        course_code = f"CS{100 + i}"
+        credit_hours = rng.choice([0, 1, 3, 3, 4])
+        sections_by_course[course_code] = [
+            SimpleNamespace(course_code=course_code, credit_hours=credit_hours,
+                            meeting_time=f"{rng.choice(DAYS)} {rng.choice(TIMES)}",
+                            instructor_name=rng.choice(["A", "B", "C", "D"]))
+            for _ in range(rng.randint(1, 3))
+        ]
+    return sections_by_course
+
+
+def brute_force_best(sections_by_course, max_credits, ratings, time_window):
+    weights = DEFAULT_SECTION_WEIGHTS
+    window = time_window_mask(*time_window) if time_window else None
+    best = 0.0
+    for picks in product(*[[None] + sections for sections in sections_by_course.values()]):
+        chosen = [section for section in picks if section is not None]
+        occupied, conflict = 0, False
+        for section in chosen:
+            mask = section_time_mask(section)
+            conflict = conflict or bool(mask & occupied)
+            occupied |= mask
+        if conflict or sum(section.credit_hours for section in chosen) > max_credits:
+            continue
+        score = -weights["gap"] * idle_minutes(occupied) / 60
+        for section in chosen:
+            mask = section_time_mask(section)
+            score += weights["credits"] * section.credit_hours
+            score += weights["rating"] * ratings.get(section.instructor_name, DEFAULT_RMP_RATING)
+            if window is not None:
+                score -= weights["window"] * slot_count(mask & ~window) * SLOT_MINUTES / 60
+        best = max(best, score)
+    return best
+
+
+class TestSectionOptimizer(unittest.TestCase):
+
+    def test_matches_brute_force_on_random_instances(self):
+        rng = random.Random(11)
+        for _ in range(150):
+            sections_by_course = random_sections(rng)
+            max_credits = rng.randint(3, 12)
+            ratings = {"A": 4.5, "B": 1.0, "C": 3.2}
+            time_window = rng.choice([None, (1000, 1500)])
+            options = optimize_sections(sections_by_course, max_credits, top_n=1, ratings=ratings, time_window=time_window)
+            self.assertAlmostEqual(options[0][0], brute_force_best(sections_by_course, max_credits, ratings, time_window))
+
+    def test_first_fit_fills_the_credits(self):
+        sections_by_course = {
+            "CS170": [SimpleNamespace(course_code="CS170", credit_hours=4, meeting_time="MW 10am-11:15am")],
+            "CS171": [SimpleNamespace(course_code="CS171", credit_hours=4, meeting_time="MW 10am-11:15am"),
+                      SimpleNamespace(course_code="CS171", credit_hours=4, meeting_time="TTh 10am-11:15am")],
+            "MATH111": [SimpleNamespace(course_code="MATH111", credit_hours=3, meeting_time="MWF 9am-9:50am")],
+        }
+        sections = first_fit_sections(sections_by_course, 8)
+        self.assertEqual([(section.course_code, section.meeting_time) for section in sections],
+                         [("CS170", "MW 10am-11:15am"), ("CS171", "TTh 10am-11:15am")])
+
+
+if __name__ == "__main__":
+    unittest.main()
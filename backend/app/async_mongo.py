@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from mongo_database import get_mongo_db
+
+# pymongo is blocking, so async routes hand every call to a thread pool instead of
+# running it on the event loop. Schedule solving gets its own, smaller pool so a burst
+# of solves cannot use up the threads cheap lookups like /get_class_by_class_id need.
+MONGO_IO_THREADS = int(os.getenv("MONGO_IO_THREADS", "32"))
+SOLVER_THREADS = int(os.getenv("SOLVER_THREADS", "4"))
+
+_io_executor = ThreadPoolExecutor(max_workers=MONGO_IO_THREADS, thread_name_prefix="mongo-io")
+_solver_executor = ThreadPoolExecutor(max_workers=SOLVER_THREADS, thread_name_prefix="solver")
+
+
+async def run_io(func, *args, **kwargs):
+    """
+    Runs a blocking data-access call (pymongo, catalog lookups) on the I/O thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_solver(func, *args, **kwargs):
+    """
+    Runs CPU-heavy work (schedule generation, ranking) on the solver thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_solver_executor, functools.partial(func, *args, **kwargs))
+
+
+class AsyncCollection:
+    def __init__(self, collection):
+        """
+        Awaitable wrapper around a pymongo collection; each call runs on the I/O thread pool.
+
+        :param collection: A pymongo Collection.
+        """
+        self.collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        return await run_io(self.collection.find_one, *args, **kwargs)
+
+    async def find(self, *args, **kwargs):
+        """
+        Runs the query and returns every matching document as a list.
+        """
+        return await run_io(lambda: list(self.collection.find(*args, **kwargs)))
+
+    async def insert_one(self, *args, **kwargs):
+        return await run_io(self.collection.insert_one, *args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return await run_io(self.collection.update_one, *args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return await run_io(self.collection.delete_one, *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs):
+        return await run_io(self.collection.count_documents, *args, **kwargs)
+
+
+class AsyncDatabase:
+    def __init__(self, db):
+        """
+        Awaitable wrapper around a pymongo database; db["name"] gives an AsyncCollection.
+        """
+        self.db = db
+
+    def __getitem__(self, name):
+        return AsyncCollection(self.db[name])
+
+
+def get_async_db(uri=None, db_name=None):
+    """
+    Returns an awaitable database handle backed by the shared, pooled client.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    return AsyncDatabase(get_mongo_db(uri, db_name))
+
+
+def shutdown_executors():
+    """
+    Stops both thread pools. Called once when the API shuts down.
+    """
+    _io_executor.shutdown(wait=False, cancel_futures=True)
+    _solver_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,231 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import math
+import random
+from Functions.Catalog_Snapshot import CatalogSnapshot
+from Functions.GER_Buckets import GER_AREAS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+
+# Which files of backend/app/Data seed which collection (same as the import steps in the
+# README). Earlier files win when a class or major appears twice, like find_one would.
+DATA_FILES = {
+    "Class": ["class.csv", "all_courses.csv"],
+    "Class_Detail": ["all_courses_detail.csv"],
+    "Major_Req": ["my_database.Major_Req.csv", "emory_all_majors_combined - emory_all_majors_combined.csv.csv"],
+    "rmp_ratings": ["rmp_ratings.csv"],
+}
+NUMERIC_FIELDS = {"credit_hours": int, "rating": float}
+
+# Shape of the synthetic catalog at scale 1.
+BASE_COURSES = 300
+BASE_SUBJECTS = 10
+BASE_PREREQ_DEPTH = 2
+BASE_PREREQ_BRANCHING = 1
+BASE_SECTIONS_PER_COURSE = 2
+REQUIRED_PER_MAJOR = 8
+ELECTIVES_PER_MAJOR = 6
+
+MEETING_DAYS = ["MW", "TTh", "MWF", "M", "W", "F"]
+
+
+def read_csv_docs(path):
+    """
+    Reads a Mongo export / import CSV into documents the way mongoimport does: empty
+    cells and unnamed columns are left out and the export's _id column is dropped.
+    Rows whose numeric fields are not numbers (e.g., credit_hours "n") are skipped.
+    """
+    docs = []
+    with open(path, encoding="utf-8", errors="ignore", newline="") as f:
+        for row in csv.DictReader(f):
+            doc = {key: value for key, value in row.items() if key and key != "_id" and value not in ("", None)}
+            try:
+                for field, convert in NUMERIC_FIELDS.items():
+                    if field in doc:
+                        doc[field] = convert(float(doc[field]))
+            except ValueError:
+                continue
+            docs.append(doc)
+    return docs
+
+
+def load_csv_catalog(data_dir=DATA_DIR, version="csv"):
+    """
+    Builds a catalog snapshot from the CSV files in backend/app/Data (see DATA_FILES),
+    without MongoDB.
+
+    :param data_dir: Directory holding the CSV files.
+    :param version: Version stamp of the snapshot.
+    :return: A CatalogSnapshot.
+    """
+    collections = {}
+    for collection, file_names in DATA_FILES.items():
+        docs = []
+        for file_name in file_names:
+            path = os.path.join(data_dir, file_name)
+            if os.path.exists(path):
+                docs.extend(read_csv_docs(path))
+        collections[collection] = docs
+
+    # Classes are looked up by course_code, the imported rows only carry class_id.
+    for doc in collections["Class"]:
+        doc.setdefault("course_code", doc.get("class_id"))
+    return CatalogSnapshot(
+        version=version,
+        class_docs=collections["Class"],
+        class_detail_docs=collections["Class_Detail"],
+        major_req_docs=collections["Major_Req"],
+        rmp_docs=collections["rmp_ratings"]
+    )
+
+
+def synthetic_catalog_shape(scale):
+    """
+    Sizes of a synthetic catalog scale times the base one.
+
+    The course count grows linearly. Prerequisite depth and branching and the number of
+    sections per course grow with log10(scale) instead: a 100 times deeper prerequisite
+    chain can not fit in an 8-semester plan (chains stay a few semesters short of it, so
+    fall-only and spring-only courses still fit), and 100 times the sections would only
+    measure how fast the generator can build them.
+
+    :return: {"courses", "subjects", "prereq_depth", "prereq_branching", "sections_per_course"}
+    """
+    steps = math.log10(max(scale, 1))
+    return {
+        "courses": int(BASE_COURSES * scale),
+        "subjects": max(1, round(BASE_SUBJECTS * math.sqrt(scale))),
+        "prereq_depth": BASE_PREREQ_DEPTH + round(1.5 * steps),
+        "prereq_branching": BASE_PREREQ_BRANCHING + round(steps),
+        "sections_per_course": round(BASE_SECTIONS_PER_COURSE * 2 ** steps),
+    }
+
+
+def _subject_name(index):
+    # Letters only, so class IDs look like real ones ("SYNB2003") to the wildcard parser.
+    name = ""
+    index += 1
+    while index:
+        index, letter = divmod(index - 1, 26)
+        name = chr(ord("A") + letter) + name
+    return "SYN" + name
+
+
+def _clock(minutes):
+    hour, minute = divmod(minutes, 60)
+    suffix = "am" if hour < 12 else "pm"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d}{suffix}" if minute else f"{hour}{suffix}"
+
+
+def generate_synthetic_catalog(scale=1, seed=0, version=None, **shape):
+    """
+    Generates a random but reproducible catalog with the structure the schedulers rely
+    on: subjects with leveled course numbers, prerequisite chains, GER designations,
+    sections with meeting times and instructors with ratings, and one major per subject.
+
+    Every course above the first level requires prereq_branching groups of courses one
+    level below. The first alternative of a group is always one of the prereq_branching
+    "core" courses of that level in the same subject, so the prerequisites a plan pulls
+    in stay bounded and the majors fit in 8 semesters.
+
+    :param scale: Size relative to the base catalog (see synthetic_catalog_shape).
+    :param seed: Random seed; the same seed and shape always give the same catalog.
+    :param version: Version stamp of the snapshot (default "synthetic-<scale>x").
+    :param shape: Overrides for synthetic_catalog_shape (e.g., prereq_depth=3).
+    :return: A CatalogSnapshot.
+    """
+    shape = {**synthetic_catalog_shape(scale), **shape}
+    rng = random.Random(seed)
+    depth = shape["prereq_depth"]
+    branching = shape["prereq_branching"]
+    subjects = [_subject_name(i) for i in range(shape["subjects"])]
+    per_subject = max(depth + 1, shape["courses"] // len(subjects))
+    per_level = math.ceil(per_subject / (depth + 1))
+    ger_designations = [area.get("designation") or area["pattern"] for area in GER_AREAS.values() if "class_id_pattern" not in area]
+
+    class_docs = []
+    levels = {}  # Mapping: (subject, level) -> class IDs, core courses first
+    for subject in subjects:
+        for i in range(per_subject):
+            level, number = divmod(i, per_level)
+            class_id = f"{subject}{(level + 1) * 1000 + number}"
+            levels.setdefault((subject, level), []).append(class_id)
+            core = number < branching
+            # A fall- or spring-only course can cost its chain a semester, so only
+            # courses that start or end a chain may be one.
+            single_season = not core and level in (0, depth)
+            groups = []
+            if level > 0:
+                below = levels[(subject, level - 1)]
+                for _ in range(branching):
+                    first = below[rng.randrange(min(branching, len(below)))]
+                    # The other alternatives come from the same subject or, sometimes, another one.
+                    source = subject if rng.random() < 0.8 else rng.choice(subjects)
+                    source_below = levels.get((source, level - 1)) or below
+                    others = rng.sample(source_below, min(rng.randint(0, branching), len(source_below)))
+                    group = [first] + [other for other in others if other != first]
+                    if group not in groups:
+                        groups.append(group)
+            doc = {
+                "class_id": class_id,
+                "course_code": class_id,
+                "class_name": f"{subject} Course {class_id[len(subject):]}",
+                "recurring": rng.choice(["fall/spring", "fall/spring", "fall", "spring"]) if single_season else "fall/spring",
+                "credit_hours": rng.choice([3, 3, 3, 4, 4, 1]),
+                "campus": "EM",
+                "class_desc": f"Synthetic course {class_id} at level {level + 1}.",
+            }
+            if groups:
+                doc["prereqs"] = "; ".join(" or ".join(group) for group in groups)
+            if level == 0 and rng.random() < 0.3:
+                doc["requirement_designation"] = rng.choice(ger_designations)
+            class_docs.append(doc)
+
+    instructors = [f"Instructor {i}" for i in range(max(10, shape["courses"] // 5))]
+    class_detail_docs = []
+    for doc in class_docs:
+        for section in range(shape["sections_per_course"]):
+            start = rng.randrange(8 * 60, 18 * 60, 30)
+            class_detail_docs.append({
+                "course_code": doc["class_id"],
+                "course_section": f"{section + 1}.0",
+                "course_crn": str(10000 + len(class_detail_docs)),
+                "course_title": doc["class_name"],
+                "credit_hours": doc["credit_hours"],
+                "semesters_offered": doc["recurring"],
+                "instructor_name": rng.choice(instructors),
+                "meeting_time": f"{rng.choice(MEETING_DAYS)} {_clock(start)}-{_clock(start + rng.choice([50, 75]))}",
+                "class_type": "LEC",
+                "campus": "EM",
+                "prerequisites": doc.get("prereqs"),
+                "requirement_designation": doc.get("requirement_designation"),
+            })
+    rmp_docs = [{"name": name, "rating": round(rng.uniform(1, 5), 1)} for name in instructors]
+
+    major_req_docs = []
+    for subject in subjects:
+        courses = [class_id for level in range(depth + 1) for class_id in levels[(subject, level)]]
+        required = rng.sample(courses, min(REQUIRED_PER_MAJOR, len(courses)))
+        # A couple of requirements offer an alternative, like "CS170 or MATH170".
+        for i in range(min(2, len(required))):
+            alternative = rng.choice(courses)
+            if alternative != required[i]:
+                required[i] = f"{required[i]} or {alternative}"
+        doc = {"major_name": f"Bachelor of Science in Synthetic {subject}", "required_classes": "; ".join(required)}
+        for i in range(ELECTIVES_PER_MAJOR):
+            if i % 2 == 0:
+                doc[f"elective{i + 1}"] = f"{subject}{(depth // 2 + 1) * 1000}*"
+            else:
+                doc[f"elective{i + 1}"] = "; ".join(rng.sample(courses, min(3, len(courses))))
+        major_req_docs.append(doc)
+
+    return CatalogSnapshot(
+        version=version or f"synthetic-{scale}x",
+        class_docs=class_docs,
+        class_detail_docs=class_detail_docs,
+        major_req_docs=major_req_docs,
+        rmp_docs=rmp_docs
+    )
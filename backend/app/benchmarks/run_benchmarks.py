@@ -0,0 +1,299 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from Functions.Catalog_Snapshot import install_catalog_snapshot, reload_catalog_snapshot
+from Functions.Get_Major_Req_byName import get_major_requirement_cache
+from Functions.Schedule_Solver import SearchBudget, SCHEDULE_MAX_NODES, SCHEDULE_TIME_LIMIT_MS, SCHEDULE_SOLVER
+import Functions.Generate_Semester_Schedule_byMajor as scheduler
+from benchmarks.catalog_fixtures import load_csv_catalog, generate_synthetic_catalog, synthetic_catalog_shape
+
+# Offline benchmarks of the schedulers: the catalog is installed as a pinned catalog
+# snapshot, so nothing here needs a running MongoDB. Usage (from backend/app):
+#
+#   python benchmarks/run_benchmarks.py --scales 10 100 --output report.json
+#   python benchmarks/run_benchmarks.py --baseline report.json   # exits 1 on a regression
+
+
+BENCHMARKED_FUNCTIONS = ["generate_full_schedule", "generate_future_schedule", "Generate_Schedule_withTime", "add_GER_course"]
+
+
+def install_catalog(snapshot):
+    """
+    Makes every scheduler read the given snapshot instead of MongoDB.
+    """
+    install_catalog_snapshot(snapshot)
+
+
+def uninstall_catalog():
+    reload_catalog_snapshot()
+
+
+def warm_catalog(snapshot):
+    """
+    Builds everything the snapshot computes on first use, so the function timings only
+    measure the schedulers.
+    """
+    snapshot.prereq_graph
+    snapshot.ger_buckets
+    snapshot.course_number_index
+    snapshot.professor_ratings
+    get_major_requirement_cache()
+
+
+@contextlib.contextmanager
+def count_search_nodes():
+    """
+    Counts the search nodes the schedulers expand (semester assignment and section
+    search) while the block runs.
+
+    :return: Dict whose "nodes" is updated as the searches finish.
+    """
+    counter = {"nodes": 0}
+    originals = {name: getattr(scheduler, name) for name in
+                 ("backtrack_assignment", "propagation_assignment", "optimize_sections", "first_fit_sections")}
+
+    def counted_solver(solve):
+        def run(sorted_classes, transitive_prereqs, num_semesters, min_credits, max_credits,
+                startingSemester="Fall", budget=None):
+            budget = budget or SearchBudget()
+            try:
+                return solve(sorted_classes, transitive_prereqs, num_semesters, min_credits, max_credits,
+                             startingSemester, budget)
+            finally:
+                counter["nodes"] += budget.nodes
+        return run
+
+    def counted_sections(search):
+        def run(*args, stats=None, **kwargs):
+            stats = {} if stats is None else stats
+            before = stats.get("nodes", 0)
+            try:
+                return search(*args, stats=stats, **kwargs)
+            finally:
+                counter["nodes"] += stats.get("nodes", 0) - before
+        return run
+
+    scheduler.backtrack_assignment = counted_solver(originals["backtrack_assignment"])
+    scheduler.propagation_assignment = counted_solver(originals["propagation_assignment"])
+    scheduler.optimize_sections = counted_sections(originals["optimize_sections"])
+    scheduler.first_fit_sections = counted_sections(originals["first_fit_sections"])
+    try:
+        yield counter
+    finally:
+        for name, function in originals.items():
+            setattr(scheduler, name, function)
+
+
+def build_plan(major_name):
+    # Same call as the /generate_schedule route (Schedule_Tasks.build_plan).
+    return scheduler.generate_full_schedule(major_name, 8, min_credits=0, max_credits=18, startingSemester="Fall",
+                                            solver=SCHEDULE_SOLVER, max_nodes=SCHEDULE_MAX_NODES,
+                                            time_limit_ms=SCHEDULE_TIME_LIMIT_MS, return_details=True)
+
+
+def benchmark_calls(major_names):
+    """
+    The calls to time, per function: (major name, setup) pairs where setup() runs untimed
+    and returns the call to time.
+    """
+    plans = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for major_name in major_names:
+            plans[major_name] = build_plan(major_name)
+
+    def ger_setup(major_name):
+        # add_GER_course fills the semesters it is given, so every call gets a fresh copy.
+        plan = plans[major_name]
+        if not plan:
+            return None
+        semesters = scheduler.convert_schedule_to_obj([list(semester) for semester in plan["schedule"]], startYear=2025, startsFall=True)
+        return lambda: scheduler.add_GER_course(semesters, isBulePlan=False, isEM=True)
+
+    return {
+        "generate_full_schedule": [(m, lambda m=m: lambda: build_plan(m)) for m in major_names],
+        "generate_future_schedule": [(m, lambda m=m: lambda: scheduler.generate_future_schedule(m, 8, takenClasses=[])) for m in major_names],
+        "Generate_Schedule_withTime": [(m, lambda m=m: lambda: scheduler.Generate_Schedule_withTime([], m, top_n=3)) for m in major_names],
+        "add_GER_course": [(m, lambda m=m: ger_setup(m)) for m in major_names],
+    }
+
+
+def run_pass(calls, trace_memory=False):
+    """
+    Runs every call once.
+
+    :return: (per-call seconds, search nodes, errors, peak traced KiB or None)
+    """
+    seconds = []
+    errors = []
+    peak = None
+    with count_search_nodes() as counter, open(os.devnull, "w") as devnull:
+        for major_name, setup in calls:
+            call = setup()
+            if call is None:
+                errors.append(f"{major_name}: no plan to start from")
+                continue
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(devnull):
+                    call()
+            except Exception as e:
+                errors.append(f"{major_name}: {type(e).__name__}: {e}")
+            seconds.append(time.perf_counter() - started)
+            if trace_memory:
+                peak = max(peak or 0, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+    return seconds, counter["nodes"], errors, None if peak is None else round(peak / 1024, 1)
+
+
+def benchmark_function(calls, repeats):
+    """
+    Times repeats passes over the calls, then runs one more pass under tracemalloc for
+    the memory peak (tracing slows the code down, so it is never timed).
+    """
+    per_call = []
+    pass_ms = []
+    nodes = None
+    errors = []
+    for _ in range(repeats):
+        seconds, nodes, errors, _ = run_pass(calls)
+        per_call.extend(seconds)
+        pass_ms.append(sum(seconds) * 1000)
+    _, _, _, peak_kb = run_pass(calls, trace_memory=True)
+    per_call_ms = sorted(s * 1000 for s in per_call) or [0.0]
+    return {
+        "calls": len(calls),
+        "pass_ms_median": round(statistics.median(pass_ms), 2) if pass_ms else None,
+        "pass_ms_min": round(min(pass_ms), 2) if pass_ms else None,
+        "call_ms_median": round(statistics.median(per_call_ms), 2),
+        "call_ms_p95": round(per_call_ms[min(len(per_call_ms) - 1, int(0.95 * len(per_call_ms)))], 2),
+        "call_ms_max": round(per_call_ms[-1], 2),
+        "nodes": nodes,
+        "peak_memory_kb": peak_kb,
+        "errors": errors,
+    }
+
+
+def benchmark_catalog(name, build, repeats, max_majors, functions=BENCHMARKED_FUNCTIONS):
+    """
+    Builds a catalog, installs it and benchmarks the schedulers on its first max_majors
+    majors (by name).
+
+    :param build: Returns a new CatalogSnapshot.
+    """
+    started = time.perf_counter()
+    snapshot = build()
+    build_ms = (time.perf_counter() - started) * 1000
+    try:
+        # Memory the catalog holds once warm, from a traced rebuild.
+        tracemalloc.start()
+        traced = build()
+        install_catalog(traced)
+        warm_catalog(traced)
+        catalog_kb = tracemalloc.get_traced_memory()[0] / 1024
+        tracemalloc.stop()
+        del traced
+
+        install_catalog(snapshot)
+        started = time.perf_counter()
+        warm_catalog(snapshot)
+        warmup_ms = (time.perf_counter() - started) * 1000
+
+        major_names = sorted(name for name in snapshot.major_reqs if name)[:max_majors]
+        calls = benchmark_calls(major_names)
+        results = {function: benchmark_function(calls[function], repeats) for function in functions}
+    finally:
+        uninstall_catalog()
+    return {
+        "name": name,
+        "version": snapshot.version,
+        "classes": len(snapshot.classes),
+        "sections": sum(len(sections) for sections in snapshot.class_details.values()),
+        "majors": len(snapshot.major_reqs),
+        "benchmarked_majors": major_names,
+        "build_ms": round(build_ms, 2),
+        "warmup_ms": round(warmup_ms, 2),
+        "memory_kb": round(catalog_kb, 1),
+        "functions": results,
+    }
+
+
+def compare_reports(report, baseline, tolerance=0.25):
+    """
+    Lists the slowdowns and search growth of report against baseline: a function whose
+    median pass time or node count grew by more than tolerance on the same catalog.
+
+    :return: List of human-readable regressions (empty if none).
+    """
+    regressions = []
+    baseline_catalogs = {catalog["name"]: catalog for catalog in baseline.get("catalogs", [])}
+    for catalog in report["catalogs"]:
+        previous = baseline_catalogs.get(catalog["name"])
+        if previous is None:
+            continue
+        for function, result in catalog["functions"].items():
+            before = previous["functions"].get(function)
+            if before is None:
+                continue
+            for metric in ("pass_ms_median", "nodes"):
+                old, new = before.get(metric), result.get(metric)
+                if old and new is not None and new > old * (1 + tolerance):
+                    regressions.append(f"{catalog['name']} {function} {metric}: {old} -> {new}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers offline and report JSON.")
+    parser.add_argument("--scales", type=float, nargs="*", default=[10, 100], help="synthetic catalog scales (default: 10 100)")
+    parser.add_argument("--skip-csv", action="store_true", help="do not benchmark the catalog in backend/app/Data")
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes per function (default: 3)")
+    parser.add_argument("--majors", type=int, default=5, help="majors benchmarked per catalog (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic catalogs")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier report to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed growth over the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+    scales = [int(scale) if float(scale).is_integer() else scale for scale in args.scales]
+
+    catalogs = []
+    if not args.skip_csv:
+        catalogs.append(("csv", load_csv_catalog))
+    for scale in scales:
+        catalogs.append((f"synthetic-{scale}x", lambda scale=scale: generate_synthetic_catalog(scale, seed=args.seed)))
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "seed": args.seed,
+        "synthetic_shapes": {f"{scale}x": synthetic_catalog_shape(scale) for scale in scales},
+        "catalogs": [benchmark_catalog(name, build, args.repeats, args.majors) for name, build in catalogs],
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from routes import users, courses, professors, courses_mongodb, schedules, majorReq
 from database import Base, engine
+from mongo_database import close_mongo_clients
+from mongo_indexes import bootstrap_indexes, MONGO_ENSURE_INDEXES
+from Functions.Result_Cache import schedule_cache
+from async_mongo import shutdown_executors
+from solver_pool import start_solver_pool, stop_solver_pool
+from Functions.Embedding_Service import embedding_service, EMBEDDING_PRELOAD
 from Functions.Generate_Semester_Schedule_byMajor import generate_full_schedule, convert_schedule_to_obj
 from Functions.Get_Class_byID import get_class_by_id
-from Functions.Get_Major_Req_byName import get_major_requirements_by_name
+from Functions.Get_Major_Req_byName import get_major_requirements_by_name, get_major_requirement_cache
 from fastapi.middleware.cors import CORSMiddleware
 
 
@@ -21,6 +27,38 @@ app.add_middleware(
 def read_root():
     return {"message": "Welcome to the API"}
 
+@app.on_event("startup")
+def startup_indexes():
+    # Create the MongoDB indexes the routes rely on (no-op when they exist)
+    if MONGO_ENSURE_INDEXES:
+        bootstrap_indexes()
+
+@app.on_event("startup")
+def startup_major_requirements():
+    # Compile every major's requirements once; lookups then run from memory
+    try:
+        get_major_requirement_cache()
+    except Exception as e:
+        print(f"Could not compile the major requirements: {e}")
+
+@app.on_event("startup")
+def startup_solver_pool():
+    # Spawn and warm up the schedule solver processes
+    start_solver_pool()
+    # The ranking model loads on the first /get_top_k; EMBEDDING_PRELOAD=1 starts loading
+    # it in the background at startup instead (startup does not wait for it)
+    if EMBEDDING_PRELOAD:
+        embedding_service.start_background_load()
+
+@app.on_event("shutdown")
+def shutdown_mongo():
+    # Release the pooled MongoDB connections
+    close_mongo_clients()
+    # Flush the on-disk plan cache, if any
+    schedule_cache.close()
+    stop_solver_pool()
+    shutdown_executors()
+
 # Create the database tables
 # Base.metadata.create_all(bind=engine)
 
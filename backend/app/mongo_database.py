@@ -0,0 +1,56 @@
+from pymongo import MongoClient
+import os
+import threading
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "my_database")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+
+# One MongoClient per URI for the whole process. MongoClient is thread-safe and
+# keeps its own connection pool, so every lookup reuses warm sockets instead of
+# opening (and closing) a new connection.
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_mongo_client(uri=None):
+    """
+    Returns the shared MongoClient for the given URI, creating it on first use.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :return: A pooled MongoClient. Do not close it; use close_mongo_clients() on shutdown.
+    """
+    uri = uri or MONGO_URI
+    client = _clients.get(uri)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(uri)
+            if client is None:
+                client = MongoClient(uri, maxPoolSize=MONGO_MAX_POOL_SIZE, minPoolSize=MONGO_MIN_POOL_SIZE)
+                _clients[uri] = client
+    return client
+
+
+def get_mongo_db(uri=None, db_name=None):
+    """
+    Returns a database handle backed by the shared client for the given URI.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    """
+    return get_mongo_client(uri)[db_name or MONGO_DB_NAME]
+
+
+def close_mongo_clients():
+    """
+    Closes every shared client. Called once when the API shuts down.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
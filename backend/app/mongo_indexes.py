@@ -0,0 +1,146 @@
+import os
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure, PyMongoError
+from mongo_database import get_mongo_db
+
+# Indexes behind every lookup the API runs. Created at startup (see ensure_indexes);
+# creating an index that already exists is a no-op, so this is safe on every start.
+REQUIRED_INDEXES = [
+    # get_class_by_id, get_classes_by_ids
+    {"collection": "Class", "keys": [("course_code", ASCENDING)], "name": "course_code_1"},
+    # wildcard electives (process_elective_item), prerequisite lookups by class_id
+    {"collection": "Class", "keys": [("class_id", ASCENDING)], "name": "class_id_1"},
+    # sections of a course (get_class_details_by_ids, Generate_Schedule_withTime)
+    {"collection": "Class_Detail", "keys": [("course_code", ASCENDING)], "name": "course_code_1"},
+    # get_major_requirements_by_name
+    {"collection": "Major_Req", "keys": [("major_name", ASCENDING)], "name": "major_name_1", "unique": True},
+    # login and every /users route: by email, then by username
+    {"collection": "Users", "keys": [("email", ASCENDING)], "name": "email_1", "unique": True},
+    {"collection": "Users", "keys": [("username", ASCENDING)], "name": "username_1", "unique": True},
+    # professor ratings
+    {"collection": "rmp_ratings", "keys": [("name", ASCENDING)], "name": "name_1"},
+]
+
+# One representative filter per query shape the API runs, checked with explain().
+QUERY_SHAPES = [
+    {"collection": "Class", "filter": {"course_code": "CS170"}},
+    {"collection": "Class", "filter": {"course_code": {"$in": ["CS170", "CS171"]}}},
+    {"collection": "Class", "filter": {"class_id": "CS170"}},
+    {"collection": "Class_Detail", "filter": {"course_code": {"$in": ["CS170", "CS171"]}}},
+    {"collection": "Major_Req", "filter": {"major_name": "Bachelor of Science in Computer Science"}},
+    {"collection": "Users", "filter": {"email": "user@emory.edu"}},
+    {"collection": "Users", "filter": {"username": "user"}},
+    {"collection": "rmp_ratings", "filter": {"name": "Professor"}},
+]
+
+# Server error code of a unique index build that hit duplicate keys
+DUPLICATE_KEY_ERROR = 11000
+
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() not in ("0", "false", "no")
+
+
+def _same_keys(keys, index):
+    return [(field, direction) for field, direction in index["key"]] == [(field, direction) for field, direction in keys]
+
+
+def ensure_indexes(db, specs=REQUIRED_INDEXES):
+    """
+    Creates every index in specs that does not exist yet. Existing indexes are matched by
+    key spec, not by name, so an index someone created by hand under another name counts.
+
+    A unique index that cannot be built because the collection already holds duplicates
+    is created without the unique constraint instead, and reported so the data can be
+    cleaned up. An existing non-unique index on the keys of a unique spec is kept as it
+    is and reported the same way.
+
+    :param db: A pymongo Database.
+    :param specs: Index specs: {"collection", "keys", "name", optional "unique"}.
+    :return: One report dict per spec: {"collection", "index", "status", "error"}, where
+             status is "exists", "exists_non_unique", "created", "created_non_unique" or
+             "failed", and index is the name of the index serving the spec.
+    """
+    report = []
+    existing = {}
+    for spec in specs:
+        collection = db[spec["collection"]]
+        if spec["collection"] not in existing:
+            existing[spec["collection"]] = collection.index_information()
+        entry = {"collection": spec["collection"], "index": spec["name"], "status": "exists", "error": None}
+        match = next((name for name, index in existing[spec["collection"]].items() if _same_keys(spec["keys"], index)), None)
+        if match is not None:
+            entry["index"] = match
+            if spec.get("unique") and not existing[spec["collection"]][match].get("unique"):
+                entry["status"] = "exists_non_unique"
+                entry["error"] = f"index {match} on the same keys is not unique"
+        else:
+            try:
+                collection.create_index(spec["keys"], name=spec["name"], unique=spec.get("unique", False))
+                entry["status"] = "created"
+            except OperationFailure as e:
+                entry["error"] = str(e)
+                entry["status"] = "failed"
+                if spec.get("unique") and e.code == DUPLICATE_KEY_ERROR:
+                    # The lookups still need an index.
+                    try:
+                        collection.create_index(spec["keys"], name=spec["name"])
+                        entry["status"] = "created_non_unique"
+                    except OperationFailure as e:
+                        entry["error"] = str(e)
+        report.append(entry)
+    return report
+
+
+def _has_collscan(plan):
+    # Plans nest their input stages (inputStage, inputStages, queryPlan, ...), so walk all of it.
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(value) for value in plan)
+    return False
+
+
+def find_collscans(db, shapes=QUERY_SHAPES):
+    """
+    Explains every query shape and returns the ones whose winning plan scans the whole
+    collection.
+
+    :param db: A pymongo Database.
+    :param shapes: Query shapes: {"collection", "filter"}.
+    :return: List of the shapes that run as a COLLSCAN.
+    """
+    collscans = []
+    for shape in shapes:
+        explanation = db[shape["collection"]].find(shape["filter"]).explain()
+        if _has_collscan(explanation.get("queryPlanner", {}).get("winningPlan")):
+            collscans.append(shape)
+    return collscans
+
+
+def bootstrap_indexes(uri=None, db_name=None):
+    """
+    Creates the required indexes and reports indexes that could not be created and query
+    shapes still running as a COLLSCAN. Called once when the API starts; Mongo errors
+    are reported, not raised, so the API still starts.
+
+    :param uri: MongoDB connection URI (default is MONGO_URI).
+    :param db_name: Name of the database (default is MONGO_DB_NAME).
+    :return: {"indexes": ensure_indexes report, "collscans": find_collscans result},
+             or None if Mongo could not be reached.
+    """
+    db = get_mongo_db(uri, db_name)
+    try:
+        indexes = ensure_indexes(db)
+        collscans = find_collscans(db)
+    except PyMongoError as e:
+        print(f"Could not create the MongoDB indexes: {e}")
+        return None
+    for entry in indexes:
+        if entry["status"] == "created":
+            print(f"Created index {entry['collection']}.{entry['index']}")
+        elif entry["status"] != "exists":
+            print(f"Index {entry['collection']}.{entry['index']}: {entry['status']} ({entry['error']})")
+    for shape in collscans:
+        print(f"Warning: query on {shape['collection']} {shape['filter']} runs as a COLLSCAN")
+    return {"indexes": indexes, "collscans": collscans}
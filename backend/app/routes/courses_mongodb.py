@@ -4,13 +4,14 @@ import schemas
 import crud
 import database
 from Functions.Get_Class_byID import get_class_by_id
+from async_mongo import run_io
 
 router = APIRouter()
 
 
 @router.get("/get_class_by_class_id")
-def get_Class(class_id: str):
-    class_obj = get_class_by_id(class_id)
+async def get_Class(class_id: str):
+    class_obj = await run_io(get_class_by_id, class_id)
     if class_obj:
         return class_obj.to_dict()
     else:
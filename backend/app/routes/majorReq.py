@@ -3,15 +3,23 @@ from sqlalchemy.orm import Session
 import schemas
 import crud
 import database
-from Functions.Get_Major_Req_byName import get_major_requirements_by_name
+from Functions.Get_Major_Req_byName import get_major_requirements_by_name, list_major_requirements
+from async_mongo import run_io
 
 router = APIRouter()
 
 
 @router.get("/get_major_requirement_by_major_name")
-def get_MajorReq(major_name: str):
-    majorReq = get_major_requirements_by_name(major_name)
+async def get_MajorReq(major_name: str):
+    majorReq = await run_io(get_major_requirements_by_name, major_name)
     if majorReq:
         return majorReq.to_dict()
     else:
         return {"Failed to get such major: " + major_name}
+
+
+@router.get("/majors")
+async def get_Majors():
+    # Every major's requirements, served from the compiled requirement cache
+    majorReqs = await run_io(list_major_requirements)
+    return [majorReq.to_dict() for majorReq in majorReqs]
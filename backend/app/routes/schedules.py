@@ -1,65 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 import schemas, crud, database
-from Functions.Generate_Semester_Schedule_byMajor import generate_full_schedule, convert_schedule_to_obj, add_GER_course, generate_future_schedule, Generate_Schedule_withTime
 from Functions.generate_personalized_schedule import get_top_k_courses
+from Functions.Embedding_Service import embedding_service
+from Functions.Schedule_Tasks import build_plan, is_cacheable_plan, build_detail_schedule, build_future_schedule
+from Functions.Result_Cache import schedule_cache, schedule_cache_key
+from async_mongo import run_io, run_solver
+from solver_pool import run_solver_task, solver_pool_stats
 
 router = APIRouter()
 
+async def get_cached_plan(major_name: str, startingSem: str, startingYear: int, with_GER: bool):
+    key = await run_io(schedule_cache_key, "plan_with_GER" if with_GER else "plan", major_name, startingSem, startingYear)
+    return await schedule_cache.get_or_compute(
+        key, lambda: run_solver_task(build_plan, major_name, startingSem, startingYear, with_GER), is_cacheable_plan
+    )
+
+
 @router.get("/get_semester_schedule_by_major_name")
-def get_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
+async def get_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
     # e.g. input major name: "Bachelor of Arts in Mathematics"
-    full_schedule = generate_full_schedule(major_name=major_name, num_semesters=8, min_credits=0, max_credits=18, startingSemester=startingSem)
-
-    # if there is a schedule
-    if full_schedule:
-        semester_schedules = convert_schedule_to_obj(full_schedule, startYear=startingYear, startsFall= True if startingSem == "Fall" else False)
-        outputDict = []
-        for sem in semester_schedules:
-            outputDict.append(sem.to_dict())
-        return outputDict
+    plan = await get_cached_plan(major_name, startingSem, startingYear, with_GER=False)
+    if plan:
+        return plan
     else:
         return {"Failed to generate a full schedule."}
     
     
 @router.get("/get_semester_schedule_withGER_by_major_name")
-def get_GER_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
+async def get_GER_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
     # e.g. input major name: "Bachelor of Arts in Mathematics"
-    full_schedule = generate_full_schedule(major_name=major_name, num_semesters=8, min_credits=0, max_credits=18, startingSemester=startingSem)
-
-    # if there is a schedule
-    if full_schedule:
-        semester_schedules = convert_schedule_to_obj(full_schedule, startYear=startingYear, startsFall= True if startingSem == "Fall" else False)
-        GER_schedule = add_GER_course(semester_schedules, isBulePlan=False, isEM=True)
-        outputDict = []
-        for sem in GER_schedule:
-            outputDict.append(sem.to_dict())
-        return outputDict
+    plan = await get_cached_plan(major_name, startingSem, startingYear, with_GER=True)
+    if plan:
+        return plan
     else:
         return {"Failed to generate a full schedule."} 
+
+
+@router.get("/schedule_cache_stats")
+async def get_schedule_cache_stats():
+    return schedule_cache.stats()
+
+
+@router.get("/solver_stats")
+async def get_solver_stats():
+    return solver_pool_stats()
+
+
+@router.get("/embedding_status")
+async def get_embedding_status():
+    # Readiness probe for /get_top_k: 503 while the ranking model is being preloaded (or failed to);
+    # without EMBEDDING_PRELOAD the model loads on the first /get_top_k, so "lazy" counts as ready
+    status = embedding_service.status()
+    if not status["ready"] and not status["lazy"]:
+        raise HTTPException(status_code=503, detail=status)
+    return status
     
 @router.get("/get_detail_semester_schedule")
-def get_Detail_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: str = None):
+async def get_Detail_Schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: str = None):
 
-    detial_schedule = Generate_Schedule_withTime(takenClasses= taken, major_name=major_name)[0]
-    future_classes = Generate_Schedule_withTime(takenClasses= taken, major_name=major_name)[1]
+    # One solve gives both the schedule and the remaining classes
+    detail = await run_solver_task(build_detail_schedule, taken, major_name) or {}
+    detial_schedule = detail.get("schedule")
+    future_classes = detail.get("remaining")
     if detial_schedule:
         return detial_schedule
     else:
         return {"Failed to generate a schedule."}
     
+@router.get("/get_detail_semester_schedule_options")
+async def get_Detail_Schedule_Options(major_name: str, taken: list[str] = Query(None), top_n: int = 5,
+                                      earliest: int = None, latest: int = None):
+    # earliest/latest: preferred time window in 24-hour HHMM, e.g. earliest=900&latest=1700
+    time_window = (earliest or 0, latest or 2400) if earliest or latest else None
+    result = await run_solver_task(build_detail_schedule, taken, major_name, top_n=top_n, time_window=time_window)
+    if result and result["alternatives"]:
+        return result["alternatives"]
+    else:
+        return {"Failed to generate a schedule."}
+
 @router.get("/generate_future_schedule")
-def generate_Future_schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: str = None):
-    future_schedule = generate_future_schedule(major_name=major_name, num_semesters=7, takenClasses=taken)
+async def generate_Future_schedule(major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: str = None):
+    future_schedule = await run_solver_task(build_future_schedule, major_name, 7, taken)
     if future_schedule:
         return future_schedule
     else:
         return {"Failed to generate a schedule."}
     
 @router.post("/get_top_k")
-def get_top_k(all_schedules: list[dict], preferences: dict, k: int = 5, undergraduate_only = True, collection_name="all_courses"):
+async def get_top_k(all_schedules: list[dict], preferences: dict, k: int = 5, undergraduate_only = True, collection_name="all_courses"):
     try:
-        topk = get_top_k_courses(all_schedules, preferences, k, undergraduate_only, collection_name)
+        topk = await run_solver(get_top_k_courses, all_schedules, preferences, k, undergraduate_only, collection_name)
         return topk
     except Exception as e:
         return {f"Failed to generate a schedule. Error: {str(e)}"}
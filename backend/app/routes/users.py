@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import schemas, crud, database
 from Functions.Create_User import generate_User, login
-from Functions.Generate_Semester_Schedule_byMajor import generate_full_schedule, convert_schedule_to_obj, add_GER_course, generate_future_schedule, Generate_Schedule_withTime
+from Functions.Schedule_Tasks import build_user_plan, build_detail_schedule
 from Models.User_Logins_Model import User_Logins
 from routes.schedules import get_GER_Schedule
-from pymongo import MongoClient
+from async_mongo import get_async_db, run_io
+from solver_pool import run_solver_task
 
 router = APIRouter()
 """
@@ -51,57 +52,52 @@ def login(email: str, input_pass: str, db: Session = Depends(database.get_db)):
 """
 
 @router.post("/create_user")
-def create_user(email: str, password: str, username: str):
-    return generate_User(email, password, username)
+async def create_user(email: str, password: str, username: str):
+    return await run_io(generate_User, email, password, username)
 
 @router.get("/Login")
-def User_login(account: str, password: str):
-    return login(account, password)
+async def User_login(account: str, password: str):
+    return await run_io(login, account, password)
 
 @router.post("/create_schedule")
-def create_schedule(account: str, major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
-    # Connect to MongoDB
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["my_database"]
+async def create_schedule(account: str, major_name: str, startingSem: str = "Fall" , startingYear: int = 0):
+    # Use the shared, pooled MongoDB client
+    db = get_async_db()
     
     # Access the collection that stores major requirements
     collection = db["Users"]
     
-    full_schedule = generate_full_schedule(major_name=major_name, num_semesters=8, min_credits=0, max_credits=18, startingSemester=startingSem)
+    result, outputDict = await run_solver_task(build_user_plan, major_name, startingSem, startingYear)
 
     # if there is a schedule
-    if full_schedule:
-        semester_schedules = convert_schedule_to_obj(full_schedule, startYear=startingYear, startsFall= True if startingSem == "Fall" else False)
-        GER_schedule = add_GER_course(semester_schedules, isBulePlan=False, isEM=True)
-        outputDict = []
-
-        for sem in GER_schedule:
-            outputDict.append(sem.to_dict())
-        user = collection.find_one({"email": account})
+    if outputDict is not None:
+        user = await collection.find_one({"email": account})
         if not user:
-            user = collection.find_one({"username": account})
+            user = await collection.find_one({"username": account})
             if not user:
                 return "User not exist"
 
-            collection.update_one({"username": account}, {"$set": {"schedule": outputDict}})
+            await collection.update_one({"username": account}, {"$set": {"schedule": outputDict}})
             return {"message": "Schedule updated"}
             
-        collection.update_one({"email": account}, {"$set": {"schedule": outputDict}})
+        await collection.update_one({"email": account}, {"$set": {"schedule": outputDict}})
         return {"message": "Schedule updated"}
+    elif result:
+        # Nothing is saved for a partial schedule; report what could not be placed.
+        return {"message": "Failed to generate a full schedule.", "unplaced": result["unplaced"], "stats": result["stats"]}
     else:
         return {"Failed to generate a full schedule."}
     
 @router.get("/get_current_schedule")
-def get_user_schedule(account: str):
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["my_database"]
+async def get_user_schedule(account: str):
+    db = get_async_db()
     
     # Access the collection that stores major requirements
     collection = db["Users"]
     
-    user = collection.find_one({"email": account})
+    user = await collection.find_one({"email": account})
     if not user:
-        user = collection.find_one({"username": account})
+        user = await collection.find_one({"username": account})
         if not user:
             return "User not exist"
         if "schedule" not in user:
@@ -117,17 +113,16 @@ def get_user_schedule(account: str):
         return {"no schedule found for": user['username']}
     
 @router.post("/generate detial schedule")
-def generate_detail_schedule(account: str, major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: list[str] = None):
+async def generate_detail_schedule(account: str, major_name: str, startingSem: str = "Fall" , startingYear: int = 0, taken: list[str] = None):
 
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["my_database"]
+    db = get_async_db()
     
     # Access the collection that stores major requirements
     collection = db["Users"]
     
-    user = collection.find_one({"email": account})
+    user = await collection.find_one({"email": account})
     if not user:
-        user = collection.find_one({"username": account})
+        user = await collection.find_one({"username": account})
         if not user:
             return "User not exist"
     if user['takenClasses']:
@@ -136,8 +131,10 @@ def generate_detail_schedule(account: str, major_name: str, startingSem: str = "
             taken.append(cls)
     id = user['_id']
 
-    detail_schedule = Generate_Schedule_withTime(takenClasses= taken, major_name=major_name)[0]
-    future_classes = Generate_Schedule_withTime(takenClasses= taken, major_name=major_name)[1]   
+    # One solve gives both the schedule and the remaining classes
+    detail = await run_solver_task(build_detail_schedule, taken, major_name) or {}
+    detail_schedule = detail.get("schedule")
+    future_classes = detail.get("remaining")
     if detail_schedule:
         # if not user:
         #     user = collection.find_one({"username": account})
@@ -153,8 +150,7 @@ def generate_detail_schedule(account: str, major_name: str, startingSem: str = "
             
         # return {"message": "Schedule updated"}.
 
-        detail_schedule = detail_schedule.to_dict()
-        collection.update_one({"_id": id}, {"$set": {
+        await collection.update_one({"_id": id}, {"$set": {
             "detail_Schedule": detail_schedule,
             "futureClasses": future_classes,
             "majorName": major_name,
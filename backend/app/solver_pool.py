@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
+from async_mongo import run_solver
+
+# Schedule solving is pure-Python CPU work that holds the GIL, so it runs in a pool of
+# worker processes (one per core by default) instead of the API process. Set
+# SOLVER_PROCESSES=0 to solve on the in-process solver threads instead.
+SOLVER_PROCESSES = int(os.getenv("SOLVER_PROCESSES", str(os.cpu_count() or 1)))
+# Requests beyond this many queued or running solves get HTTP 503 instead of waiting.
+SOLVER_QUEUE_LIMIT = int(os.getenv("SOLVER_QUEUE_LIMIT", str(max(SOLVER_PROCESSES, 1) * 4)))
+SOLVER_TIMEOUT = float(os.getenv("SOLVER_TIMEOUT", "30"))
+
+_pool = None
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def _init_worker():
+    # Load the catalog snapshot (and its prerequisite graph) once per worker, before the first request.
+    from Functions.Catalog_Snapshot import get_catalog_snapshot
+    try:
+        snapshot = get_catalog_snapshot()
+        if snapshot is not None:
+            snapshot.prereq_graph
+    except Exception as e:
+        # Not fatal: the snapshot is loaded again on the first request.
+        print(f"Solver worker {os.getpid()} could not preload the catalog: {e}")
+    # Import the solver modules up front as well.
+    import Functions.Schedule_Tasks
+
+
+def _ready():
+    return os.getpid()
+
+
+def _warmup_done(future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        print(f"Solver worker warmup failed: {error}")
+
+
+def start_solver_pool():
+    """
+    Starts the worker processes and submits one warmup per worker without waiting for
+    them, so the API serves requests right away even when loading the catalog is slow
+    (e.g., Mongo is unreachable). Solves submitted meanwhile queue behind the warmups.
+    Called once when the API starts.
+    """
+    global _pool
+    if SOLVER_PROCESSES <= 0 or _pool is not None:
+        return
+    # "spawn" so workers do not inherit the API's threads and open Mongo sockets.
+    _pool = ProcessPoolExecutor(
+        max_workers=SOLVER_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    )
+    for _ in range(SOLVER_PROCESSES):
+        _pool.submit(_ready).add_done_callback(_warmup_done)
+
+
+def stop_solver_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _release(_future=None):
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight -= 1
+
+
+async def run_solver_task(func, *args, timeout=SOLVER_TIMEOUT, **kwargs):
+    """
+    Runs a task function from Functions.Schedule_Tasks in the solver pool and returns its
+    (plain data) result.
+
+    Raises HTTP 503 when SOLVER_QUEUE_LIMIT solves are already queued or running, and
+    HTTP 504 when the result is not back within timeout seconds. A timed-out solve keeps
+    its slot until the worker actually finishes it, so a stuck major cannot overload the pool.
+    """
+    global _in_flight
+    with _in_flight_lock:
+        if _in_flight >= SOLVER_QUEUE_LIMIT:
+            raise HTTPException(status_code=503, detail="Schedule solver is busy, try again shortly.")
+        _in_flight += 1
+
+    try:
+        if _pool is None:
+            # No worker processes: solve on the in-process solver threads.
+            task = asyncio.ensure_future(run_solver(func, *args, **kwargs))
+        else:
+            task = asyncio.wrap_future(_pool.submit(func, *args, **kwargs))
+    except Exception:
+        _release()
+        raise
+    task.add_done_callback(_release)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Schedule generation timed out.")
+
+
+def solver_pool_stats():
+    return {
+        "processes": SOLVER_PROCESSES if _pool is not None else 0,
+        "in_flight": _in_flight,
+        "queue_limit": SOLVER_QUEUE_LIMIT,
+        "timeout": SOLVER_TIMEOUT
+    }